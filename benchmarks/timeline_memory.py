@@ -0,0 +1,104 @@
+"""Measure the resident memory of timeline events.
+
+Compares the compact TimelineEvent against the previous layout (plain
+instance dict, datetime timestamp, unshared strings) for a realistic mix
+of cameras, areas and event types.
+
+Run from the repository root in a Home Assistant development environment:
+
+    python benchmarks/timeline_memory.py [event_count]
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import gc
+import json
+import random
+import sys
+import tracemalloc
+import uuid
+
+from custom_components.oasira_b2b.timeline_event import TimelineEvent
+from custom_components.oasira_b2b.timeline_index import TimelineIndex
+
+CAMERAS = 12
+AREAS = 8
+EVENT_TYPES = ("motion", "person", "vehicle", "animal", "package", "doorbell")
+
+
+class LegacyTimelineEvent:
+    """The pre-slots layout, for comparison."""
+
+    def __init__(self, event_id, timestamp, event_type, camera_entity_id,
+                 camera_name, area_id=None, area_name=None, description=None):
+        self.event_id = event_id
+        self.timestamp = timestamp
+        self.event_type = event_type
+        self.camera_entity_id = camera_entity_id
+        self.camera_name = camera_name
+        self.area_id = area_id
+        self.area_name = area_name
+        self.description = description
+
+
+def _rows(count: int) -> list[tuple]:
+    """Build event fields the way they are loaded: decoded from JSON."""
+    rng = random.Random(42)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    records = []
+    for _ in range(count):
+        camera = rng.randrange(CAMERAS)
+        area = camera % AREAS
+        records.append(
+            [
+                str(uuid.uuid4())[:8],
+                (start + timedelta(seconds=rng.randrange(30 * 86400))).isoformat(),
+                rng.choice(EVENT_TYPES),
+                f"camera.cam_{camera}",
+                f"Camera {camera}",
+                f"area_{area}",
+                f"Area {area}",
+                None,
+            ]
+        )
+    return [
+        (event_id, datetime.fromisoformat(timestamp), *fields)
+        for event_id, timestamp, *fields in json.loads(json.dumps(records))
+    ]
+
+
+def _measure(label: str, build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    events = build()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    used = after - before
+    print(f"{label:<32} {used / 1024 / 1024:8.1f} MiB  {used / len(events):6.0f} B/event")
+    return used
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{count} events, {CAMERAS} cameras, {AREAS} areas\n")
+
+    legacy = _measure(
+        "legacy objects",
+        lambda: [LegacyTimelineEvent(*row) for row in _rows(count)],
+    )
+    compact = _measure(
+        "compact objects",
+        lambda: [TimelineEvent(*row) for row in _rows(count)],
+    )
+    _measure(
+        "compact objects + TimelineIndex",
+        lambda: TimelineIndex(TimelineEvent(*row) for row in _rows(count)),
+    )
+    print(f"\ncompact / legacy: {compact / legacy:.0%}")
+
+
+if __name__ == "__main__":
+    main()
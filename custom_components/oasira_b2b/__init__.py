@@ -21,8 +21,6 @@ import httpx
 
 from google.api_core.exceptions import GoogleAPIError
 from google import genai
-from google.auth import jwt
-from google.auth.crypt import rsa
 import voluptuous as vol
 
 from homeassistant.components.recorder import get_instance
@@ -65,12 +63,17 @@ from .alarm_common import (
     async_cancelalarm,
     async_confirmpendingalarm,
     async_getalarmstatus,
+    register_outbox_handlers,
 )
 from .area_manager import AreaManager
 from .auto_area import AutoArea
 
 from .oasira import OasiraAPIClient, OasiraAPIError
-from .auth_helper import ensure_valid_id_token, refresh_firebase_id_token, safe_api_call
+from .auth_helper import (
+    ensure_valid_id_token,
+    refresh_firebase_id_token,
+    safe_api_call,
+)
 
 from .const import (
     DOMAIN,
@@ -105,9 +108,18 @@ from .ai_template import (
     async_unload_templates as async_unload_ai_templates,
 )
 from .timeline_service import async_setup_services as async_setup_timeline_services
+from .timeline_event import async_apply_timeline_backend, async_unload_timeline_manager
+from .timeline_activity import TimelineActivity
+from .timeline_media import get_media_deriver
+from .timeline_retention import TimelineRetention
+from .timeline_websocket import async_register_timeline_websocket
 from .energy_advisor import async_setup_energy_advisor
 from .person_notifications import PersonNotificationManager, send_notification_to_person
 from .mobile_app_config import setup_mobile_app_config, generate_mobile_app_config_yaml
+from .fcm_fanout import async_fanout_fcm
+from .notification_scheduler import BROADCAST_RECIPIENT, get_notification_scheduler
+from .firebase_token import async_get_firebase_access_token
+from .outbox import OP_CREATE_ALERT, OP_CREATE_EVENT, OasiraOutbox, async_queue_write
 
 try:
     # Older versions (pre-2025)
@@ -130,13 +142,13 @@ LOCATION_SERVICE_SCHEMA = vol.Schema(
 _LOGGER = logging.getLogger(__name__)
 LEGACY_DOMAIN = "oasira"
 
-GOOGLE_OAUTH_URL = "https://oauth2.googleapis.com/token"
-FIREBASE_SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
 FCM_URL = "https://fcm.googleapis.com/v1/projects/oasira-oauth/messages:send"
 PUSH_TOKEN_STORAGE_KEY = "oasira_push_tokens"
 PUSH_TOKEN_STORAGE_VERSION = 1
 VIRTUAL_POWER_STORAGE_KEY = "oasira_virtual_power_profiles"
 VIRTUAL_POWER_STORAGE_VERSION = 1
+STARTUP_CACHE_STORAGE_KEY = "oasira_startup_cache"
+STARTUP_CACHE_STORAGE_VERSION = 1
 
 
 class HASSComponent:
@@ -236,20 +248,6 @@ class OasiraNotificationService(BaseNotificationService):
             _LOGGER.warning("No registered notification tokens")
             return
 
-        access_token, project_id = await self._get_firebase_access_token()
-        if not access_token or not project_id:
-            _LOGGER.error("Unable to get Firebase access token")
-            return
-
-        fcm_url = f"https://fcm.googleapis.com/v1/projects/{project_id}/messages:send"
-        _LOGGER.info("[Oasira] Using FCM project: %s", project_id)
-
-        session = async_get_clientsession(self.hass)
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
-
         image_url = None
         payload_data = None
         if data:
@@ -265,75 +263,58 @@ class OasiraNotificationService(BaseNotificationService):
                             image_url = resolved
                 payload_data[key_str] = value_str
 
-        for token in tokens:
-            payload = {
-                "message": {
-                    "token": token,
-                    "notification": {"title": title, "body": message},
+        # The message body is identical for every device; build it once
+        fcm_message: dict[str, Any] = {
+            "notification": {"title": title, "body": message},
+        }
+        if payload_data:
+            fcm_message["data"] = payload_data
+
+        if image_url:
+            # Enhanced image handling for better native notification support
+            fcm_message["notification"]["image"] = image_url
+            fcm_message["android"] = {
+                "notification": {
+                    "image": image_url,
+                    "icon": "ic_stat_ic_notification",
+                    "color": "#007bff",
                 }
             }
-            if payload_data:
-                payload["message"]["data"] = payload_data
-
-            if image_url:
-                # Enhanced image handling for better native notification support
-                payload["message"]["notification"]["image"] = image_url
-                payload["message"]["android"] = {
-                    "notification": {
-                        "image": image_url,
-                        "icon": "ic_stat_ic_notification",
-                        "color": "#007bff",
-                    }
-                }
-                payload["message"]["apns"] = {
-                    "payload": {
-                        "aps": {
-                            "alert": {"title": title, "body": message},
-                            "mutable-content": 1,
-                        },
-                        "image_url": image_url,
-                    }
+            fcm_message["apns"] = {
+                "payload": {
+                    "aps": {
+                        "alert": {"title": title, "body": message},
+                        "mutable-content": 1,
+                    },
+                    "image_url": image_url,
                 }
-                # Add webpush for web notifications
-                payload["message"]["webpush"] = {
-                    "notification": {
-                        "image": image_url,
-                        "icon": "/local/effortlesshome/user.png",
-                    }
+            }
+            # Add webpush for web notifications
+            fcm_message["webpush"] = {
+                "notification": {
+                    "image": image_url,
+                    "icon": "/local/effortlesshome/user.png",
                 }
+            }
 
-            try:
-                async with session.post(fcm_url, headers=headers, json=payload) as resp:
-                    if resp.status != 200:
-                        text = await resp.text()
-                        _LOGGER.error("FCM push failed: %s", text)
-                        # Check for UNREGISTERED token and remove it
-                        try:
-                            error_data = json.loads(text)
-                            if (
-                                error_data.get("error", {}).get("details") and
-                                any(
-                                    detail.get("errorCode") == "UNREGISTERED"
-                                    for detail in error_data["error"]["details"]
-                                    if detail.get("@type") == "type.googleapis.com/google.firebase.fcm.v1.FcmError"
-                                )
-                            ):
-                                _LOGGER.warning("Removing unregistered FCM token: %s", token[:20] + "...")
-                                domain_data = self.hass.data.get(DOMAIN, {})
-                                tokens_list = domain_data.get("notification_tokens", [])
-                                if token in tokens_list:
-                                    tokens_list.remove(token)
-                                    token_store = domain_data.get("token_store")
-                                    if token_store is not None:
-                                        await token_store.async_save(tokens_list)
-                        except json.JSONDecodeError:
-                            pass  # Not JSON, ignore
-                    else:
-                        _LOGGER.info(
-                            "FCM push successful for token: %s", token[:20] + "..."
-                        )
-            except Exception as exc:
-                _LOGGER.error("FCM push error: %s", exc)
+        report = await async_fanout_fcm(self.hass, tokens, fcm_message)
+        if report is None:
+            return
+
+        _LOGGER.info(
+            "FCM push delivered to %d/%d devices", len(report.sent), report.total
+        )
+
+        if report.unregistered:
+            domain_data = self.hass.data.get(DOMAIN, {})
+            tokens_list = domain_data.get("notification_tokens", [])
+            for token in report.unregistered:
+                _LOGGER.warning("Removing unregistered FCM token: %s", token[:20] + "...")
+                if token in tokens_list:
+                    tokens_list.remove(token)
+            token_store = domain_data.get("token_store")
+            if token_store is not None:
+                await token_store.async_save(tokens_list)
 
     async def _send_fcm_notification_old(
            self, message: str, title: str, data: dict
@@ -446,62 +427,7 @@ class OasiraNotificationService(BaseNotificationService):
                raise HomeAssistantError(f"Critical FCM Failure: {e}")
 
     async def _get_firebase_access_token(self) -> tuple[str | None, str | None]:
-        try:
-            id_token = self.hass.data.get(DOMAIN, {}).get("id_token")
-            if not id_token:
-                _LOGGER.error("Missing id_token for Firebase access")
-                return None, None
-
-            async with OasiraAPIClient(id_token=id_token) as client:
-                firebase_config = await client.get_firebase_config()
-
-            google_firebase_raw = (
-                firebase_config.get("Google_Firebase") if firebase_config else None
-            )
-            if not google_firebase_raw:
-                _LOGGER.error("Missing Google_Firebase config from Oasira")
-                return None, None
-
-            service_account_info = json.loads(google_firebase_raw)
-            private_key = service_account_info["private_key"]
-            client_email = service_account_info["client_email"]
-            project_id = service_account_info.get("project_id")
-            if not project_id:
-                _LOGGER.error("Missing project_id in Firebase service account")
-                return None, None
-
-            now = int(time.time())
-            payload = {
-                "iss": client_email,
-                "scope": FIREBASE_SCOPE,
-                "aud": GOOGLE_OAUTH_URL,
-                "iat": now,
-                "exp": now + 3600,
-            }
-
-            signer = rsa.RSASigner.from_string(private_key)
-            assertion = jwt.encode(signer, payload)
-
-            session = async_get_clientsession(self.hass)
-            async with session.post(
-                GOOGLE_OAUTH_URL,
-                data={
-                    "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                    "assertion": assertion,
-                },
-            ) as resp:
-                result = await resp.json()
-                if "access_token" not in result:
-                    _LOGGER.error("Firebase OAuth error: %s", result)
-                    return None, None
-
-                return result["access_token"], project_id
-        except OasiraAPIError as exc:
-            _LOGGER.error("Failed to fetch Firebase config: %s", exc)
-            return None, None
-        except Exception as exc:
-            _LOGGER.exception("Failed to refresh Firebase access token: %s", exc)
-            return None, None
+        return await async_get_firebase_access_token(self.hass)
 
 
     def _resolve_image_url(
@@ -543,6 +469,56 @@ class OasiraNotificationService(BaseNotificationService):
     #    return False
 
 
+def _customer_system_data(parsed_data: dict[str, Any]) -> dict[str, Any]:
+    """Map the customer/system payload onto hass.data keys."""
+    return {
+        "fullname": parsed_data["fullname"],
+        "phonenumber": parsed_data["phonenumber"],
+        "emailaddress": parsed_data["emailaddress"],
+        "ha_token": parsed_data["ha_token"],
+        "ha_url": parsed_data["ha_url"],
+        "ai_key": parsed_data["ai_key"],
+        "ai_model": parsed_data["ai_model"],
+        "email": parsed_data["emailaddress"],
+        "username": parsed_data["emailaddress"],
+        "DaysHistoryToKeep": parsed_data["DaysHistoryToKeep"],
+        "LowTemperatureWarning": parsed_data["LowTemperatureWarning"],
+        "HighTemperatureWarning": parsed_data["HighTemperatureWarning"],
+        "LowHumidityWarning": parsed_data["LowHumidityWarning"],
+        "HighHumidityWarning": parsed_data["HighHumidityWarning"],
+        "address_json": parsed_data["address_json"],
+        "systemphotolurl": parsed_data["systemphotolurl"],
+        "testmode": parsed_data["testmode"],
+        "additional_contacts_json": parsed_data["additional_contacts_json"],
+        "instructions_json": parsed_data["instructions_json"],
+        "plan": parsed_data["name"],
+    }
+
+
+async def _async_setup_mobile_app(hass: HomeAssistant, api_client: OasiraAPIClient) -> None:
+    """Fetch the Firebase config from Oasira for the mobile app services."""
+    try:
+        mobile_app_success = await setup_mobile_app_config(hass, api_client)
+        #mobile_app_success = await setup_mobile_app_integration(hass, api_client)
+        if mobile_app_success:
+            _LOGGER.info(
+                "✅ Firebase config retrieved from Oasira and stored for Oasira services. "
+                "Note: Home Assistant's mobile_app integration requires manual configuration.yaml setup. "
+                "Firebase configuration is managed internally by Oasira services."
+            )
+        else:
+            _LOGGER.info(
+                "Firebase config not available from Oasira. "
+                "This is optional and does not affect other features."
+            )
+    except Exception as mobile_exc:
+        _LOGGER.warning(
+            "Could not setup mobile app integration: %s",
+            mobile_exc,
+            exc_info=True,
+        )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up integration from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -552,18 +528,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass, PUSH_TOKEN_STORAGE_VERSION, PUSH_TOKEN_STORAGE_KEY
     )
     hass.data[DOMAIN]["token_store"] = token_store
-    stored_tokens = await token_store.async_load() or []
-    hass.data[DOMAIN]["notification_tokens"] = list(dict.fromkeys(stored_tokens))
 
     virtual_power_store = storage.Store(
         hass,
         VIRTUAL_POWER_STORAGE_VERSION,
         VIRTUAL_POWER_STORAGE_KEY,
     )
-    virtual_power_profiles = await virtual_power_store.async_load() or []
+    startup_store = storage.Store(
+        hass, STARTUP_CACHE_STORAGE_VERSION, STARTUP_CACHE_STORAGE_KEY
+    )
 
     person_notification_manager = PersonNotificationManager(hass)
-    await person_notification_manager.async_load()
+    outbox = OasiraOutbox(hass)
+
+    stored_tokens, virtual_power_profiles, startup_cache, _, _ = await asyncio.gather(
+        token_store.async_load(),
+        virtual_power_store.async_load(),
+        startup_store.async_load(),
+        person_notification_manager.async_load(),
+        outbox.async_load(),
+    )
+    hass.data[DOMAIN]["notification_tokens"] = list(dict.fromkeys(stored_tokens or []))
+    virtual_power_profiles = virtual_power_profiles or []
+    register_outbox_handlers(outbox)
 
     system_id = entry.data["system_id"]
     customer_id = entry.data["customer_id"]
@@ -575,12 +562,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not customer_id:
         raise HomeAssistantError("Customer ID is missing in configuration.")
 
+    # The agent connection check does not depend on the Oasira cloud calls
+    # below, so start it right away and collect the result later.
+    ai_client_task = hass.async_create_task(
+        get_ai_authenticated_client(
+            hass=hass,
+            timeout=entry.options.get(AI_CONF_TIMEOUT, AI_DEFAULT_TIMEOUT),
+        )
+    )
+
+    # One long-lived client per config entry on Home Assistant's shared
+    # session; it reads the id_token from hass.data so refreshed tokens are
+    # picked up automatically.
+    api_client = OasiraAPIClient(
+        system_id=system_id,
+        session=async_get_clientsession(hass),
+        id_token_getter=lambda: hass.data.get(DOMAIN, {}).get("id_token"),
+    )
+    await api_client.async_open()
+
     HASSComponent.set_hass(hass)
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].update(
         {
             "entry_id": entry.entry_id,
             "config_entry": entry,
+            "api_client": api_client,
             "token_store": hass.data[DOMAIN].get("token_store"),
             "notification_tokens": hass.data[DOMAIN].get("notification_tokens"),
             "virtual_power_store": virtual_power_store,
@@ -596,19 +603,68 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     id_token = hass.data[DOMAIN].get("id_token")
-    parsed_data = None
-    plan_features = None
-    async with OasiraAPIClient(system_id=system_id, id_token=id_token) as api_client:
-        async def _run_customer_system() -> Any:
-            _id_token = hass.data[DOMAIN].get("id_token")
-            if not _id_token:
-                raise OasiraAPIError("Missing id_token for customer/system lookup")
-            async with OasiraAPIClient(system_id=system_id, id_token=_id_token) as client:
-                return await client.get_customer_and_system()
 
+    async def _run_customer_system() -> Any:
+        if not hass.data[DOMAIN].get("id_token"):
+            raise OasiraAPIError("Missing id_token for customer/system lookup")
+        return await api_client.get_customer_and_system()
+
+    async def _fetch_plan_features() -> Any:
         try:
-            parsed_data = await safe_api_call(hass, _run_customer_system)
+            return await api_client.get_plan_features_by_system_id()
+        except Exception as pf_exc:
+            _LOGGER.warning("Failed to fetch plan features: %s", pf_exc)
+            return None
+
+    async def _fetch_cloud_state() -> tuple[dict[str, Any], Any]:
+        """Fetch customer/system data and plan features and persist them."""
+        fetched_data, fetched_features = await asyncio.gather(
+            safe_api_call(hass, _run_customer_system),
+            _fetch_plan_features(),
+        )
+        if fetched_data is None:
+            raise HomeAssistantError("Could not retrieve customer/system data.")
+        if fetched_features is None and startup_cache:
+            fetched_features = startup_cache.get("plan_features")
+        await startup_store.async_save(
+            {
+                "system_id": system_id,
+                "customer_system": fetched_data,
+                "plan_features": fetched_features,
+            }
+        )
+        return fetched_data, fetched_features
+
+    async def _async_refresh_cloud_state() -> None:
+        """Refresh the cached startup data from the cloud after setup."""
+        try:
+            fetched_data, fetched_features = await _fetch_cloud_state()
+        except OasiraAPIError as err:
+            if err.status == 401:
+                entry.async_start_reauth(hass)
+            _LOGGER.warning("Background customer/system refresh failed: %s", err)
+            return
+        except (HomeAssistantError, KeyError) as err:
+            _LOGGER.warning("Background customer/system refresh failed: %s", err)
+            return
+        hass.data[DOMAIN].update(_customer_system_data(fetched_data))
+        hass.data[DOMAIN]["plan_features"] = fetched_features
+        _LOGGER.debug("Refreshed customer/system data from Oasira")
+
+    cached_data = None
+    if startup_cache and startup_cache.get("system_id") == system_id:
+        cached_data = startup_cache.get("customer_system")
+
+    if cached_data:
+        # Finish setup from the last known payload and refresh in the background
+        parsed_data = cached_data
+        plan_features = startup_cache.get("plan_features")
+    else:
+        try:
+            parsed_data, plan_features = await _fetch_cloud_state()
         except OasiraAPIError as e:
+            ai_client_task.cancel()
+            await api_client.async_close()
             if "401" in str(e):
                 _LOGGER.warning("Customer/system lookup failed after token refresh: %s", e)
                 raise ConfigEntryAuthFailed(
@@ -616,73 +672,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 ) from e
             _LOGGER.error("Failed to fetch customer/system data: %s", e)
             raise
+        except HomeAssistantError:
+            ai_client_task.cancel()
+            await api_client.async_close()
+            raise
 
-        if parsed_data is None:
-            raise HomeAssistantError("Could not retrieve customer/system data.")
-
-        try:
-            plan_features = await api_client.get_plan_features_by_system_id()
-        except Exception as pf_exc:
-            _LOGGER.warning("Failed to fetch plan features: %s", pf_exc)
-            plan_features = None
-
-        # Setup mobile_app integration with Firebase config from Oasira
-        try:
-            mobile_app_success = await setup_mobile_app_config(hass, api_client)
-            #mobile_app_success = await setup_mobile_app_integration(hass, api_client)
-            if mobile_app_success:
-                _LOGGER.info(
-                    "✅ Firebase config retrieved from Oasira and stored for Oasira services. "
-                    "Note: Home Assistant's mobile_app integration requires manual configuration.yaml setup. "
-                    "Firebase configuration is managed internally by Oasira services."
-                )
-            else:
-                _LOGGER.info(
-                    "Firebase config not available from Oasira. "
-                    "This is optional and does not affect other features."
-                )
-        except Exception as mobile_exc:
-            _LOGGER.warning(
-                "Could not setup mobile app integration: %s",
-                mobile_exc,
-                exc_info=True,
-            )
+    # Firebase config is optional; fetch it without holding up setup
+    hass.async_create_background_task(
+        _async_setup_mobile_app(hass, api_client), "oasira_mobile_app_config"
+    )
 
     hass.data[DOMAIN] = {
         "entry_id": entry.entry_id,
         "config_entry": entry,
+        "api_client": api_client,
+        "outbox": outbox,
         "token_store": hass.data[DOMAIN]["token_store"],
         "notification_tokens": hass.data[DOMAIN]["notification_tokens"],
         "virtual_power_store": virtual_power_store,
         "virtual_power_profiles": virtual_power_profiles,
         "person_notification_manager": person_notification_manager,
-        "fullname": parsed_data["fullname"],
-        "phonenumber": parsed_data["phonenumber"],
-        "emailaddress": parsed_data["emailaddress"],
-        "ha_token": parsed_data["ha_token"],
-        "ha_url": parsed_data["ha_url"],
-        "ai_key": parsed_data["ai_key"],
-        "ai_model": parsed_data["ai_model"],
-        "email": parsed_data["emailaddress"],
-        "username": parsed_data["emailaddress"],
+        **_customer_system_data(parsed_data),
         "systemid": system_id,
         "customerid": customer_id,
         "id_token": id_token,
         "refresh_token": entry.data.get("refresh_token"),
-        "DaysHistoryToKeep": parsed_data["DaysHistoryToKeep"],
-        "LowTemperatureWarning": parsed_data["LowTemperatureWarning"],
-        "HighTemperatureWarning": parsed_data["HighTemperatureWarning"],
-        "LowHumidityWarning": parsed_data["LowHumidityWarning"],
-        "HighHumidityWarning": parsed_data["HighHumidityWarning"],
-        "address_json": parsed_data["address_json"],
-        "systemphotolurl": parsed_data["systemphotolurl"],
-        "testmode": parsed_data["testmode"],
-        "additional_contacts_json": parsed_data["additional_contacts_json"],
-        "instructions_json": parsed_data["instructions_json"],
-        "plan": parsed_data["name"],
         "plan_features": plan_features,
     }
 
+    entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
+
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
@@ -692,20 +711,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         model=NAME,
     )
 
-    # Initialize the OpenAI-compatible client before forwarding AI platforms.
+    # Collect the OpenAI-compatible client before forwarding AI platforms.
     try:
-        ai_client = await get_ai_authenticated_client(
-            hass=hass,
-            timeout=entry.options.get(AI_CONF_TIMEOUT, AI_DEFAULT_TIMEOUT),
-        )
+        ai_client = await ai_client_task
         entry.runtime_data = ai_client
         hass.data.setdefault(DOMAIN, {})["ai_runtime_client"] = ai_client
     except (httpx.ConnectError, httpx.TimeoutException, httpx.HTTPStatusError) as ai_err:
         _LOGGER.error("Failed to initialize the OpenAI-compatible AI client: %s", ai_err)
+        await api_client.async_close()
         raise ConfigEntryNotReady(
             f"Unable to connect to the Oasira agent at {AI_DEFAULT_CONF_BASE_URL}"
         ) from ai_err
 
+    if cached_data:
+        hass.async_create_background_task(
+            _async_refresh_cloud_state(), "oasira_refresh_customer_system"
+        )
+
     await hass.config_entries.async_forward_entry_setups(
         entry,
         [
@@ -775,6 +797,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     register_services(hass)
     await async_setup_ai_services(hass, {})
     await async_setup_timeline_services(hass)
+    async_register_timeline_websocket(hass)
+    timeline_retention = TimelineRetention(hass)
+    hass.data[DOMAIN]["timeline_retention"] = timeline_retention
+    await timeline_retention.async_start()
+    timeline_activity = TimelineActivity(hass)
+    hass.data[DOMAIN]["timeline_activity"] = timeline_activity
+    await timeline_activity.async_start()
+    hass.async_create_background_task(
+        get_media_deriver(hass).async_start(), "oasira_media_workers"
+    )
     await async_setup_energy_advisor(hass)
     await async_setup_ai_templates(hass)
 
@@ -851,6 +883,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.async_create_task(refresh_firebase_token())
     hass.bus.async_listen_once("homeassistant_started", schedule_refresh_task)
 
+    # Replay cloud writes queued while offline or before the last restart
+    if outbox.pending:
+        outbox.async_schedule_drain()
+
     return True
 
 
@@ -891,6 +927,11 @@ async def deploy_latest_config(hass: HomeAssistant):
     _LOGGER.info("[Oasira] Configuration deployment complete.")
 
 
+async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed integration options."""
+    await async_apply_timeline_backend(hass)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
 
@@ -930,6 +971,36 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     webhook.async_unregister(hass, "oasira_remove_push_token")
     webhook.async_unregister(hass, "oasira_location_update")
 
+    outbox = hass.data.get(DOMAIN, {}).pop("outbox", None)
+    if outbox is not None:
+        await outbox.async_shutdown()
+
+    timeline_retention = hass.data.get(DOMAIN, {}).pop("timeline_retention", None)
+    if timeline_retention is not None:
+        await timeline_retention.async_stop()
+
+    timeline_activity = hass.data.get(DOMAIN, {}).pop("timeline_activity", None)
+    if timeline_activity is not None:
+        await timeline_activity.async_stop()
+
+    await async_unload_timeline_manager(hass)
+
+    media_deriver = hass.data.get(DOMAIN, {}).pop("media_deriver", None)
+    if media_deriver is not None:
+        media_deriver.shutdown()
+
+    scheduler = hass.data.get(DOMAIN, {}).pop("notification_scheduler", None)
+    if scheduler is not None:
+        scheduler.async_shutdown()
+
+    token_manager = hass.data.get(DOMAIN, {}).pop("firebase_token_manager", None)
+    if token_manager is not None:
+        token_manager.async_shutdown()
+
+    api_client = hass.data.get(DOMAIN, {}).pop("api_client", None)
+    if api_client is not None:
+        await api_client.async_close()
+
     return True
 
 
@@ -1074,13 +1145,18 @@ async def async_setup_notification_platform(hass: HomeAssistant):
             title = call.data.get("title")
             data = call.data.get("data")
 
-            kwargs = {}
-            if title is not None:
-                kwargs[ATTR_TITLE] = title
-            if data is not None:
-                kwargs[ATTR_DATA] = data
+            async def _send(title: str, message: str, data: dict) -> None:
+                kwargs = {}
+                if title is not None:
+                    kwargs[ATTR_TITLE] = title
+                if data:
+                    kwargs[ATTR_DATA] = data
 
-            await service.async_send_message(message=message, **kwargs)
+                await service.async_send_message(message=message, **kwargs)
+
+            await get_notification_scheduler(hass).async_submit(
+                BROADCAST_RECIPIENT, _send, title, message, data
+            )
 
         # Register the notification service
         hass.services.async_register(
@@ -1277,38 +1353,18 @@ async def create_event(call: ServiceCall) -> None:
                 alarmid = alarmstate
                 _LOGGER.info("alarm id =%s", alarmid)
 
-                # Call the API to create event
-                systemid = hass.data[DOMAIN].get("systemid")
-                id_token = hass.data[DOMAIN].get("id_token")
-
                 event_data = {
                     "sensor_device_class": sensor_device_class,
                     "sensor_device_name": sensor_device_name,
                 }
 
-                _LOGGER.info("Calling create event API with payload: %s", event_data)
-
-                if not await ensure_valid_id_token(hass):
-                    _LOGGER.error("Cannot create event: invalid or expired id_token")
-                    return None
-
-                async def _run_create_event() -> Any:
-                    id_token = hass.data[DOMAIN].get("id_token")
-                    if not id_token:
-                        raise OasiraAPIError("Missing id_token for create_event")
-                    async with OasiraAPIClient(
-                        system_id=systemid,
-                        id_token=id_token,
-                    ) as api_client:
-                        return await api_client.create_event(alarmid, event_data)
-
-                try:
-                    result = await safe_api_call(hass, _run_create_event)
-                    _LOGGER.info("API response content: %s", result)
-                    return result
-                except OasiraAPIError as e:
-                    _LOGGER.error("Failed to create event: %s", e)
-                    return None
+                _LOGGER.info("Queueing create event with payload: %s", event_data)
+
+                return await async_queue_write(
+                    hass,
+                    OP_CREATE_EVENT,
+                    {"alarm_id": alarmid, "event_data": event_data},
+                )
             return None
         return None
     return None
@@ -1341,33 +1397,10 @@ async def create_alert(call: ServiceCall) -> None:
         "status": status,
     }
 
-    # Call the API to create alert
-    systemid = hass.data[DOMAIN].get("systemid")
-    id_token = hass.data[DOMAIN].get("id_token")
+    # Queue the alert; the outbox delivers it when the cloud is reachable
+    _LOGGER.info("Queueing create alert with payload: %s", alert_data)
 
-    _LOGGER.info("Calling alert API with payload: %s", alert_data)
-
-    if not await ensure_valid_id_token(hass):
-        _LOGGER.error("Cannot create alert: invalid or expired id_token")
-        return None
-
-    async def _run_create_alert() -> Any:
-        id_token = hass.data[DOMAIN].get("id_token")
-        if not id_token:
-            raise OasiraAPIError("Missing id_token for create_alert")
-        async with OasiraAPIClient(
-            system_id=systemid,
-            id_token=id_token,
-        ) as api_client:
-            return await api_client.create_alert(alert_data)
-
-    try:
-        result = await safe_api_call(hass, _run_create_alert)
-        _LOGGER.info("API response content: %s", result)
-        return result
-    except OasiraAPIError as e:
-        _LOGGER.error("Failed to create alert: %s", e)
-        return None
+    return await async_queue_write(hass, OP_CREATE_ALERT, {"alert_data": alert_data})
 
 
 # Keep old name for backward compatibility
@@ -1405,40 +1438,8 @@ async def confirm_pending_alarm(call: ServiceCall) -> None:
     hass = HASSComponent.get_hass()
     return await async_confirmpendingalarm(hass)
 
-def _clean_motion_files_sync(hass, age):
-    """Synchronous helper to delete old snapshots."""
-    snapshots_dir = "/media/snapshots"
-    if not os.path.exists(snapshots_dir):
-        _LOGGER.debug("Snapshots directory %s does not exist", snapshots_dir)
-        return
-
-    now = time.time()
-    seconds_old = int(age) * 86400
-    count = 0
-
-    try:
-        # Recursively walk through snapshots directory
-        for root, _, files in os.walk(snapshots_dir):
-            for name in files:
-                file_path = os.path.join(root, name)
-                try:
-                    file_mtime = os.path.getmtime(file_path)
-                    if now - file_mtime > seconds_old:
-                        os.remove(file_path)
-                        count += 1
-                except Exception as e:
-                    _LOGGER.error("Error deleting file %s: %s", file_path, e)
-
-        if count > 0:
-            _LOGGER.info("Successfully deleted %s old snapshots", count)
-        else:
-            _LOGGER.debug("No old snapshots found to delete")
-    except Exception as e:
-        _LOGGER.error("Error while cleaning snapshots: %s", e)
-
-
 async def clean_motion_files(call: ServiceCall) -> None:
-    """Delete snapshot files older than the specified number of days off the event loop."""
+    """Delete timeline media and camera snapshots older than the given days."""
     hass = call.hass
     age = call.data.get("age", 30)
 
@@ -1448,7 +1449,16 @@ async def clean_motion_files(call: ServiceCall) -> None:
         _LOGGER.error("Invalid age value %s, using default 30 days", age)
         age_int = 30
 
-    await hass.async_add_executor_job(_clean_motion_files_sync, hass, age_int)
+    timeline_retention = hass.data.get(DOMAIN, {}).get("timeline_retention")
+    if timeline_retention is None:
+        _LOGGER.warning("Timeline retention is not running")
+        return
+
+    deleted = await timeline_retention.async_run(age_int, include_snapshots=True)
+    if deleted:
+        _LOGGER.info("Successfully deleted %s old media files", deleted)
+    else:
+        _LOGGER.debug("No old media files found to delete")
 
 
 # Keep old name for backward compatibility
@@ -1814,12 +1824,17 @@ async def send_person_notification(call: ServiceCall) -> None:
         _LOGGER.error("Missing required parameters for send_person_notification")
         return
 
-    success = await send_notification_to_person(hass, email, title, message, data)
+    async def _send(title: str, message: str, data: dict) -> None:
+        success = await send_notification_to_person(hass, email, title, message, data)
 
-    if success:
-        _LOGGER.info("Successfully sent notification to %s", email)
-    else:
-        _LOGGER.error("Failed to send notification to %s", email)
+        if success:
+            _LOGGER.info("Successfully sent notification to %s", email)
+        else:
+            _LOGGER.error("Failed to send notification to %s", email)
+
+    await get_notification_scheduler(hass).async_submit(
+        email, _send, title, message, data
+    )
 
 
 
@@ -186,7 +186,7 @@ DEFAULT_CONF_FUNCTION_TOOLS = [
                     },
                     "pattern_types": {
                         "type": "array",
-                        "description": "Types of patterns to detect (e.g., light_schedule, motion_light, presence_automation, sensor_trigger)",
+                        "description": "Types of patterns to detect: light_schedule, motion_light, sensor_activity, presence_home or presence_away, or presence_automation and sensor_trigger for a whole kind. Empty for all",
                         "items": {"type": "string"},
                         "default": [],
                     },
@@ -3,28 +3,28 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Any, Dict, List, Optional, Tuple
-from collections import defaultdict, Counter
+from collections import Counter
 import re
 import httpx
 
 import voluptuous as vol
 
-from homeassistant.components import recorder
-from homeassistant.const import (
-    STATE_ON,
-    STATE_OFF,
-    STATE_HOME,
-    STATE_NOT_HOME,
-    ATTR_FRIENDLY_NAME,
-)
-from homeassistant.core import HomeAssistant, State
+from homeassistant.const import ATTR_FRIENDLY_NAME
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry as er
 from homeassistant.util import dt as dt_util
 
 from .base import Function
 from ..ai_exceptions import EntityNotExposed, EntityNotFound, InvalidFunction
+from ..history_loader import async_load_history
+from ..pattern_miner import (
+    LIGHT_DOMAINS,
+    PRESENCE_DOMAINS,
+    SENSOR_DOMAINS,
+    mine_patterns,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,12 +33,18 @@ MIN_PATTERN_OCCURRENCES = 3
 MIN_PATTERN_CONFIDENCE = 0.7
 DEFAULT_ANALYSIS_DAYS = 7
 DEFAULT_TIME_WINDOW_MINUTES = 30
+# Patterns sent to the Oasira agent; each one adds a line to the prompt
+MAX_PATTERNS_FOR_AI = 25
+# pattern_types the scan blueprint offered before patterns were mined
+# locally; either one selects every mined pattern
+LEGACY_PATTERN_TYPES = {"usage_patterns", "time_patterns"}
 
 # Entity type mappings for pattern analysis
 ENTITY_TYPE_LIGHTS = ["light", "switch"]
 ENTITY_TYPE_SENSORS = ["binary_sensor", "sensor"]
 ENTITY_TYPE_CLIMATE = ["climate", "cover"]
 ENTITY_TYPE_PERSON = ["person", "device_tracker"]
+MOTION_DEVICE_CLASSES = ["motion", "occupancy", "presence"]
 
 # Automation template types
 AUTOMATION_TYPES = {
@@ -105,7 +111,9 @@ class AutomationAnalysisFunction(Function):
             entity_types = config.get("entity_types", [])
             include_entities = config.get("include_entities", [])
             exclude_entities = config.get("exclude_entities", [])
-            pattern_types = config.get("pattern_types", [])
+            pattern_types = set(config.get("pattern_types", []))
+            if pattern_types & LEGACY_PATTERN_TYPES:
+                pattern_types = set()
             min_confidence = config.get("min_confidence", MIN_PATTERN_CONFIDENCE)
             time_window_minutes = config.get("time_window_minutes", DEFAULT_TIME_WINDOW_MINUTES)
             create_automations = config.get("create_automations", False)
@@ -133,13 +141,21 @@ class AutomationAnalysisFunction(Function):
 
             _LOGGER.info("Analyzing %d entities for patterns", len(entities_to_analyze))
 
-            # Recommendations are generated exclusively by the Oasira agent.
-            # Keep the response field for compatibility with existing consumers.
-            patterns = []
-            _LOGGER.info(
-                "Skipping local history analysis; sending %d entities to the Oasira agent",
-                len(entities_to_analyze),
-            )
+            # Mine usage patterns locally and send only the strongest ones to
+            # the Oasira agent; it falls back to the entity list without them
+            patterns = [
+                pattern
+                for pattern in await self._analyze_patterns(
+                    hass, entities_to_analyze, time_range_days, time_window_minutes
+                )
+                if pattern["confidence"] >= min_confidence
+                and (
+                    not pattern_types
+                    or pattern["pattern_type"] in pattern_types
+                    or pattern["automation_type"] in pattern_types
+                )
+            ][:MAX_PATTERNS_FOR_AI]
+            _LOGGER.info("Sending %d local patterns to the Oasira agent", len(patterns))
 
             _LOGGER.info("Enhancing recommendations with the Oasira agent")
             _LOGGER.info("Client object: %s, Type: %s", client, type(client))
@@ -244,9 +260,7 @@ class AutomationAnalysisFunction(Function):
         time_range_days: int,
         time_window_minutes: int,
     ) -> list[dict[str, Any]]:
-        """Analyze usage patterns from entity history."""
-        patterns = []
-        
+        """Mine usage patterns from entity history, best first."""
         end_time = dt_util.utcnow()
         start_time = end_time - timedelta(days=time_range_days)
 
@@ -254,518 +268,52 @@ class AutomationAnalysisFunction(Function):
         _LOGGER.info("Analyzing patterns for %d entities from %s to %s", 
                     len(entities), start_time.strftime("%Y-%m-%d"), end_time.strftime("%Y-%m-%d"))
 
+        # Only domains the miner reads; numeric sensors would only add rows
+        supported_types = LIGHT_DOMAINS | SENSOR_DOMAINS | PRESENCE_DOMAINS
+        entity_ids = []
+        names = {}
+        motion_entities = set()
         for entity in entities:
             entity_id = entity.get("entity_id", "")
             entity_type = entity_id.split(".")[0] if "." in entity_id else ""
-            entity_friendly_name = entity.get("name", entity.get("attributes", {}).get("friendly_name", entity_id))
-            
-            try:
-                # Get entity history
-                _LOGGER.debug("Getting history for entity: %s (type: %s)", entity_id, entity_type)
-                _LOGGER.debug("Time range: %s to %s", start_time.strftime("%Y-%m-%d %H:%M"), end_time.strftime("%Y-%m-%d %H:%M"))
-                
-                entity_history = await self._get_entity_history(
-                    hass, entity_id, start_time, end_time
-                )
-
-                if not entity_history:
-                    _LOGGER.debug("No history found for entity: %s", entity_id)
-                    continue
-
-                _LOGGER.debug("Found %d history entries for %s", len(entity_history), entity_id)
-                
-                # Debug: Log all history entries for this entity
-                _LOGGER.debug("ALL history entries for %s:", entity_id)
-                for i, state in enumerate(entity_history):
-                    _LOGGER.debug("  %d: %s -> %s at %s", i, state.entity_id, state.state, state.last_changed)
-                
-                # Debug: Check what states we're getting
-                states_found = set(state.state for state in entity_history)
-                _LOGGER.debug("States found for %s: %s", entity_id, states_found)
-
-                # Analyze patterns based on entity type
-                if entity_type in ENTITY_TYPE_LIGHTS:
-                    _LOGGER.debug("Analyzing light patterns for %s", entity_id)
-                    light_patterns = self._analyze_light_patterns(
-                        entity_history, time_window_minutes
-                    )
-                    _LOGGER.debug("Found %d light patterns for %s", len(light_patterns), entity_id)
-                    # Add entity info to each pattern
-                    for pattern in light_patterns:
-                        pattern["source_entity"] = entity_id
-                        pattern["source_entity_name"] = entity_friendly_name
-                    patterns.extend(light_patterns)
-                
-                elif entity_type in ENTITY_TYPE_SENSORS:
-                    _LOGGER.debug("Analyzing sensor patterns for %s", entity_id)
-                    sensor_patterns = self._analyze_sensor_patterns(
-                        entity_history, time_window_minutes
-                    )
-                    _LOGGER.debug("Found %d sensor patterns for %s", len(sensor_patterns), entity_id)
-                    for pattern in sensor_patterns:
-                        pattern["source_entity"] = entity_id
-                        pattern["source_entity_name"] = entity_friendly_name
-                    patterns.extend(sensor_patterns)
-                
-                elif entity_type in ENTITY_TYPE_PERSON:
-                    _LOGGER.debug("Analyzing presence patterns for %s", entity_id)
-                    presence_patterns = self._analyze_presence_patterns(
-                        entity_history, time_window_minutes
-                    )
-                    _LOGGER.debug("Found %d presence patterns for %s", len(presence_patterns), entity_id)
-                    for pattern in presence_patterns:
-                        pattern["source_entity"] = entity_id
-                        pattern["source_entity_name"] = entity_friendly_name
-                    patterns.extend(presence_patterns)
-                else:
-                    _LOGGER.debug("Entity type %s not supported for pattern analysis: %s", entity_type, entity_id)
-
-            except Exception as e:
-                _LOGGER.warning("Failed to analyze patterns for %s: %s", entity_id, e)
-
-        _LOGGER.info("Total patterns found: %d", len(patterns))
-        _LOGGER.info("=== PATTERN DETECTION PIPELINE COMPLETE ===")
-        return patterns
-
-    async def _get_entity_history(
-        self,
-        hass: HomeAssistant,
-        entity_id: str,
-        start_time: datetime,
-        end_time: datetime,
-    ) -> list[State]:
-        """Get entity state history from recorder."""
-        try:
-            # Use the same approach as native.py get_history function
-            from homeassistant.components.recorder import history as recorder_history
-            
-            _LOGGER.debug("Querying recorder for %s from %s to %s", entity_id, start_time, end_time)
-            
-            with recorder.util.session_scope(hass=hass, read_only=True) as session:
-                result = await recorder.get_instance(hass).async_add_executor_job(
-                    recorder_history.get_significant_states_with_session,
-                    hass,
-                    session,
-                    start_time,
-                    end_time,
-                    [entity_id],
-                    None,  # filters
-                    True,  # include_start_time_state
-                    False,  # significant_changes_only
-                    False,  # minimal_response
-                    False,  # no_attributes
-                )
-                
-            _LOGGER.debug("Recorder query completed for %s", entity_id)
-            
-            if result and entity_id in result:
-                history_entries = result[entity_id]
-                _LOGGER.debug("Recorder returned %d history entries for %s", len(history_entries), entity_id)
-                return history_entries
-            else:
-                _LOGGER.debug("Recorder returned no history for %s", entity_id)
-                return []
-
-        except Exception as e:
-            _LOGGER.debug("Failed to get history for %s: %s", entity_id, e)
+            if entity_type not in supported_types:
+                continue
+            entity_ids.append(entity_id)
+            names[entity_id] = entity.get("name", entity.get("attributes", {}).get("friendly_name", entity_id))
+            state = hass.states.get(entity_id)
+            if (
+                entity_type == "binary_sensor"
+                and state is not None
+                and state.attributes.get("device_class") in MOTION_DEVICE_CLASSES
+            ):
+                motion_entities.add(entity_id)
+
+        if not entity_ids:
             return []
 
-    def _analyze_light_patterns(
-        self, 
-        entity_history: list[State], 
-        time_window_minutes: int
-    ) -> list[dict[str, Any]]:
-        """Analyze lighting usage patterns."""
-        patterns = []
-        
-        if not entity_history:
-            _LOGGER.debug("No entity history provided for light pattern analysis")
-            return patterns
-
-        # Group state changes by day and time
-        daily_patterns = defaultdict(list)
-        
-        # Include both light and switch states
-        on_off_states = [STATE_ON, STATE_OFF]
-        state_changes = 0
-        
-        for state in entity_history:
-            if state.state in on_off_states:
-                state_changes += 1
-                # Extract time components
-                time_key = state.last_changed.strftime("%H:%M")
-                day_of_week = state.last_changed.weekday()  # 0=Monday, 6=Sunday
-                date_key = state.last_changed.strftime("%Y-%m-%d")
-                
-                daily_patterns[date_key].append({
-                    "time": time_key,
-                    "state": state.state,
-                    "day_of_week": day_of_week,
-                    "timestamp": state.last_changed
-                })
-
-        _LOGGER.debug("Found %d ON/OFF state changes across %d days", state_changes, len(daily_patterns))
-        
-        # Debug: Log daily patterns
-        for date, changes in list(daily_patterns.items())[:3]:  # Log first 3 days
-            _LOGGER.debug("Day %s: %d state changes", date, len(changes))
-            for change in changes[:5]:  # Log first 5 changes per day
-                _LOGGER.debug("  %s -> %s at %s", change["state"], change["time"], change["timestamp"])
-
-        # Analyze daily routines
-        weekday_patterns = []
-        weekend_patterns = []
-        
-        for date, changes in daily_patterns.items():
-            # Sort by time
-            changes.sort(key=lambda x: x["timestamp"])
-            
-            # Determine if weekday or weekend
-            is_weekend = changes[0]["day_of_week"] >= 5
-            
-            # Find ON/OFF cycles
-            cycles = self._extract_light_cycles(changes)
-            
-            _LOGGER.debug("Day %s (%s): %d cycles found", date, "weekend" if is_weekend else "weekday", len(cycles))
-            
-            if is_weekend:
-                weekend_patterns.extend(cycles)
-            else:
-                weekday_patterns.extend(cycles)
-
-        _LOGGER.debug("Total weekday cycles: %d, weekend cycles: %d", len(weekday_patterns), len(weekend_patterns))
-
-        # Generate patterns for weekdays
-        if weekday_patterns:
-            _LOGGER.debug("Generating weekday pattern from %d cycles", len(weekday_patterns))
-            weekday_pattern = self._generate_light_pattern(
-                weekday_patterns, "weekday", time_window_minutes
+        try:
+            # One batched, attribute-free history read for every entity
+            history_by_entity = await async_load_history(
+                hass, entity_ids, start_time, end_time
             )
-            if weekday_pattern:
-                _LOGGER.debug("Generated weekday pattern: %s", weekday_pattern.get("description", ""))
-                patterns.append(weekday_pattern)
-            else:
-                _LOGGER.debug("No weekday pattern generated (likely low confidence)")
-
-        # Generate patterns for weekends
-        if weekend_patterns:
-            _LOGGER.debug("Generating weekend pattern from %d cycles", len(weekend_patterns))
-            weekend_pattern = self._generate_light_pattern(
-                weekend_patterns, "weekend", time_window_minutes
+            patterns = await hass.async_add_executor_job(
+                mine_patterns,
+                history_by_entity,
+                motion_entities,
+                names,
+                start_time,
+                end_time,
+                time_window_minutes,
+                MIN_PATTERN_OCCURRENCES,
             )
-            if weekend_pattern:
-                _LOGGER.debug("Generated weekend pattern: %s", weekend_pattern.get("description", ""))
-                patterns.append(weekend_pattern)
-            else:
-                _LOGGER.debug("No weekend pattern generated (likely low confidence)")
-
-        _LOGGER.debug("Total light patterns found: %d", len(patterns))
-        return patterns
-
-    def _extract_light_cycles(self, changes: list[dict]) -> list[dict]:
-        """Extract ON/OFF cycles from state changes."""
-        cycles = []
-        current_cycle = None
-        
-        for change in changes:
-            if change["state"] == STATE_ON and (current_cycle is None or current_cycle["state"] == STATE_OFF):
-                if current_cycle:
-                    cycles.append(current_cycle)
-                
-                current_cycle = {
-                    "start_time": change["time"],
-                    "start_timestamp": change["timestamp"],
-                    "state": STATE_ON,
-                    "end_time": None,
-                    "end_timestamp": None
-                }
-            elif change["state"] == STATE_OFF and current_cycle and current_cycle["state"] == STATE_ON:
-                current_cycle["end_time"] = change["time"]
-                current_cycle["end_timestamp"] = change["timestamp"]
-                cycles.append(current_cycle)
-                current_cycle = None
-
-        # Handle case where light is still ON at end of period
-        if current_cycle and current_cycle["state"] == STATE_ON:
-            cycles.append(current_cycle)
-
-        return cycles
-
-    def _generate_light_pattern(
-        self, 
-        cycles: list[dict], 
-        day_type: str, 
-        time_window_minutes: int,
-        entity_id: str = None
-    ) -> Optional[dict[str, Any]]:
-        """Generate a light usage pattern from cycles."""
-        if not cycles:
-            return None
-
-        # Extract start and end times
-        start_times = [cycle["start_time"] for cycle in cycles if cycle.get("start_time")]
-        end_times = [cycle["end_time"] for cycle in cycles if cycle.get("end_time")]
-
-        if not start_times or not end_times:
-            return None
-
-        # Calculate most common times
-        start_time_pattern = self._find_time_pattern(start_times, time_window_minutes)
-        end_time_pattern = self._find_time_pattern(end_times, time_window_minutes)
-
-        if not start_time_pattern or not end_time_pattern:
-            return None
-
-        # Calculate confidence based on pattern consistency
-        confidence = self._calculate_pattern_confidence(cycles, start_time_pattern, end_time_pattern)
-
-        if confidence < MIN_PATTERN_CONFIDENCE:
-            return None
-
-        return {
-            "pattern_type": "light_schedule",
-            "entity_type": "light",
-            "description": f"Light turns on around {start_time_pattern} and off around {end_time_pattern} on {day_type}s",
-            "start_time": start_time_pattern,
-            "end_time": end_time_pattern,
-            "day_type": day_type,
-            "confidence": confidence,
-            "occurrences": len(cycles),
-            "automation_type": "light_schedule",
-        }
-
-    def _find_time_pattern(self, times: list[str], time_window_minutes: int) -> Optional[str]:
-        """Find the most common time pattern within a time window."""
-        if not times:
-            return None
-
-        # Convert times to minutes since midnight for easier calculation
-        time_minutes = []
-        for time_str in times:
-            try:
-                hour, minute = map(int, time_str.split(":"))
-                total_minutes = hour * 60 + minute
-                time_minutes.append(total_minutes)
-            except ValueError:
-                continue
-
-        if not time_minutes:
-            return None
-
-        # Find clusters of times within the window
-        clusters = []
-        for time in time_minutes:
-            cluster = [t for t in time_minutes if abs(t - time) <= time_window_minutes]
-            if len(cluster) >= MIN_PATTERN_OCCURRENCES:
-                clusters.append(cluster)
-
-        if not clusters:
-            return None
-
-        # Find the largest cluster
-        largest_cluster = max(clusters, key=len)
-        
-        # Calculate average time of the cluster
-        avg_minutes = sum(largest_cluster) / len(largest_cluster)
-        
-        # Convert back to time format
-        hour = int(avg_minutes // 60)
-        minute = int(avg_minutes % 60)
-        
-        return f"{hour:02d}:{minute:02d}"
-
-    def _calculate_pattern_confidence(self, cycles: list[dict], start_pattern: str, end_pattern: str) -> float:
-        """Calculate confidence score for a pattern."""
-        if not cycles:
-            return 0.0
-
-        start_hour, start_minute = map(int, start_pattern.split(":"))
-        end_hour, end_minute = map(int, end_pattern.split(":"))
-        
-        start_minutes = start_hour * 60 + start_minute
-        end_minutes = end_hour * 60 + end_minute
-
-        # Count cycles that match the pattern (within 30 minutes)
-        matching_cycles = 0
-        for cycle in cycles:
-            if not cycle.get("start_time") or not cycle.get("end_time"):
-                continue
-                
-            cycle_start = self._time_to_minutes(cycle["start_time"])
-            cycle_end = self._time_to_minutes(cycle["end_time"])
-            
-            if (abs(cycle_start - start_minutes) <= 30 and 
-                abs(cycle_end - end_minutes) <= 30):
-                matching_cycles += 1
-
-        return matching_cycles / len(cycles)
-
-    def _time_to_minutes(self, time_str: str) -> int:
-        """Convert time string to minutes since midnight."""
-        try:
-            hour, minute = map(int, time_str.split(":"))
-            return hour * 60 + minute
-        except ValueError:
-            return 0
-
-    def _analyze_sensor_patterns(
-        self, 
-        entity_history: list[State], 
-        time_window_minutes: int
-    ) -> list[dict[str, Any]]:
-        """Analyze sensor usage patterns."""
-        patterns = []
-        
-        if not entity_history:
-            _LOGGER.debug("No entity history provided for sensor pattern analysis")
-            return patterns
-
-        # Group by day
-        daily_patterns = defaultdict(list)
-        
-        for state in entity_history:
-            date_key = state.last_changed.strftime("%Y-%m-%d")
-            daily_patterns[date_key].append({
-                "time": state.last_changed.strftime("%H:%M"),
-                "state": state.state,
-                "timestamp": state.last_changed
-            })
-
-        _LOGGER.debug("Found %d days of sensor data", len(daily_patterns))
-        
-        # Debug: Log daily patterns
-        for date, changes in list(daily_patterns.items())[:3]:  # Log first 3 days
-            _LOGGER.debug("Day %s: %d state changes", date, len(changes))
-            for change in changes[:5]:  # Log first 5 changes per day
-                _LOGGER.debug("  %s -> %s at %s", change["state"], change["time"], change["timestamp"])
-
-        # Analyze patterns for each day
-        for date, changes in daily_patterns.items():
-            changes.sort(key=lambda x: x["timestamp"])
-            
-            # Look for recurring patterns
-            active_periods = self._find_active_periods(changes)
-            
-            _LOGGER.debug("Day %s: %d active periods found", date, len(active_periods))
-            
-            for period in active_periods:
-                pattern = {
-                    "pattern_type": "sensor_activity",
-                    "description": f"Sensor active from {period['start']} to {period['end']}",
-                    "start_time": period["start"],
-                    "end_time": period["end"],
-                    "confidence": 0.8,  # Default confidence for sensor patterns
-                    "occurrences": 1,
-                    "automation_type": "sensor_trigger"
-                }
-                patterns.append(pattern)
-
-        _LOGGER.debug("Total sensor patterns found: %d", len(patterns))
-        return patterns
-
-    def _find_active_periods(self, changes: list[dict]) -> list[dict]:
-        """Find periods when sensor was active."""
-        periods = []
-        current_period = None
-        
-        for change in changes:
-            if change["state"] == STATE_ON:
-                if current_period is None:
-                    current_period = {
-                        "start": change["time"],
-                        "end": change["time"]
-                    }
-                else:
-                    current_period["end"] = change["time"]
-            elif change["state"] == STATE_OFF and current_period:
-                periods.append(current_period)
-                current_period = None
-
-        if current_period:
-            periods.append(current_period)
-
-        return periods
-
-    def _analyze_presence_patterns(
-        self, 
-        entity_history: list[State], 
-        time_window_minutes: int
-    ) -> list[dict[str, Any]]:
-        """Analyze presence/movement patterns."""
-        patterns = []
-        
-        if not entity_history:
-            _LOGGER.debug("No entity history provided for presence pattern analysis")
-            return patterns
-
-        # Group by day
-        daily_patterns = defaultdict(list)
-        
-        for state in entity_history:
-            date_key = state.last_changed.strftime("%Y-%m-%d")
-            daily_patterns[date_key].append({
-                "time": state.last_changed.strftime("%H:%M"),
-                "state": state.state,
-                "timestamp": state.last_changed
-            })
-
-        _LOGGER.debug("Found %d days of presence data", len(daily_patterns))
-        
-        # Debug: Log daily patterns
-        for date, changes in list(daily_patterns.items())[:3]:  # Log first 3 days
-            _LOGGER.debug("Day %s: %d state changes", date, len(changes))
-            for change in changes[:5]:  # Log first 5 changes per day
-                _LOGGER.debug("  %s -> %s at %s", change["state"], change["time"], change["timestamp"])
-
-        # Analyze presence patterns
-        for date, changes in daily_patterns.items():
-            changes.sort(key=lambda x: x["timestamp"])
-            
-            # Look for home/away patterns
-            presence_periods = self._find_presence_periods(changes)
-            
-            _LOGGER.debug("Day %s: %d presence periods found", date, len(presence_periods))
-            
-            for period in presence_periods:
-                if period["state"] == STATE_HOME:
-                    pattern = {
-                        "pattern_type": "presence_home",
-                        "description": f"Person home from {period['start']} to {period['end']}",
-                        "start_time": period["start"],
-                        "end_time": period["end"],
-                        "confidence": 0.8,
-                        "occurrences": 1,
-                        "automation_type": "presence_automation"
-                    }
-                    patterns.append(pattern)
+        except Exception as e:
+            _LOGGER.warning("Failed to analyze usage patterns: %s", e)
+            return []
 
-        _LOGGER.debug("Total presence patterns found: %d", len(patterns))
+        _LOGGER.info("Total patterns found: %d", len(patterns))
+        _LOGGER.info("=== PATTERN DETECTION PIPELINE COMPLETE ===")
         return patterns
 
-    def _find_presence_periods(self, changes: list[dict]) -> list[dict]:
-        """Find periods of presence (home/away)."""
-        periods = []
-        current_period = None
-        
-        for change in changes:
-            if change["state"] in [STATE_HOME, STATE_NOT_HOME]:
-                if current_period is None or current_period["state"] != change["state"]:
-                    if current_period:
-                        periods.append(current_period)
-                    
-                    current_period = {
-                        "start": change["time"],
-                        "end": change["time"],
-                        "state": change["state"]
-                    }
-                else:
-                    current_period["end"] = change["time"]
-
-        if current_period:
-            periods.append(current_period)
-
-        return periods
-
     async def _enhance_with_ai(
         self,
         client: Any,
@@ -818,7 +366,7 @@ class AutomationAnalysisFunction(Function):
                 conf = p.get("confidence", 0)
                 ptype = p.get("pattern_type", "")
                 start = p.get("start_time", "")
-                end = p.get("end_time", "")
+                end = p.get("end_time") or ""
                 day = p.get("day_type", "daily")
                 patterns_text.append(f"- Entity: {source} | Type: {ptype} | Times: {start}-{end} ({day}) | {desc} | Confidence: {conf:.0%}")
         else:
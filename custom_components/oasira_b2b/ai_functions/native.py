@@ -12,7 +12,6 @@ import voluptuous as vol
 import yaml
 
 from homeassistant.components import automation, energy, recorder
-from homeassistant.components.recorder import history as recorder_history
 from homeassistant.config import AUTOMATION_CONFIG_PATH
 from homeassistant.const import SERVICE_RELOAD
 from homeassistant.core import HomeAssistant, State
@@ -22,6 +21,7 @@ import homeassistant.util.dt as dt_util
 
 from ..ai_const import EVENT_AUTOMATION_REGISTERED
 from ..ai_exceptions import CallServiceError, NativeNotFound
+from ..history_loader import async_get_significant_states
 from .base import Function
 
 _LOGGER = logging.getLogger(__name__)
@@ -198,20 +198,16 @@ class NativeFunction(Function):
 
         self.validate_entity_ids(hass, entity_ids, exposed_entities)
 
-        with recorder.util.session_scope(hass=hass, read_only=True) as session:
-            result = await recorder.get_instance(hass).async_add_executor_job(
-                recorder_history.get_significant_states_with_session,
-                hass,
-                session,
-                start_time,
-                end_time,
-                entity_ids,
-                None,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-                no_attributes,
-            )
+        result = await async_get_significant_states(
+            hass,
+            entity_ids,
+            start_time,
+            end_time,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
 
         return [[self.as_dict(item) for item in sublist] for sublist in result.values()]
 
@@ -2,6 +2,7 @@
 """Services for the Oasira AI Conversation component."""
 
 import base64
+from datetime import timedelta
 import json
 import logging
 import mimetypes
@@ -23,6 +24,7 @@ from typing import Any
 
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 # Move schema definition after both voluptuous and cv imports
 GET_NOTIFICATION_DEVICES_SCHEMA = vol.Schema({
@@ -35,6 +37,8 @@ from .ai_const import (
     DEFAULT_MODEL,
     DOMAIN,
 )
+from .timeline_event import get_timeline_manager
+from .timeline_rollups import GROUP_AREA, GROUP_EVENT_TYPE, INTERVAL_DAY
 
 ANALYZE_IMAGE_SCHEMA = vol.Schema(
     {
@@ -75,6 +79,9 @@ EVALUATE_TIMELINE_ACTIVITY_SCHEMA = vol.Schema(
             vol.Coerce(int), vol.Range(min=1, max=20)
         ),
         vol.Optional("focus_areas", default=[]): [cv.string],
+        vol.Optional("days", default=7): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=90)
+        ),
     }
 )
 
@@ -395,6 +402,7 @@ async def async_setup_services(hass: HomeAssistant, config: ConfigType) -> None:
             max_events = call.data["max_events"]
             suggestion_count = call.data["suggestion_count"]
             focus_areas = call.data["focus_areas"]
+            days = call.data.get("days", 7)
 
             timeline_state = hass.states.get(sensor_entity_id)
             if timeline_state is None:
@@ -403,28 +411,23 @@ async def async_setup_services(hass: HomeAssistant, config: ConfigType) -> None:
                 )
 
             timeline_attrs = dict(timeline_state.attributes)
-            recent_events = timeline_attrs.get("recent_events", [])
-            if not isinstance(recent_events, list):
-                recent_events = []
-
-            selected_events: list[dict[str, Any]] = []
-            for event in recent_events[:max_events]:
-                if not isinstance(event, dict):
-                    continue
 
-                selected_events.append(
-                    {
-                        "event_id": event.get("event_id"),
-                        "event_type": event.get("event_type"),
-                        "timestamp": event.get("timestamp"),
-                        "entity_id": event.get("entity_id"),
-                        "entity_name": event.get("entity_name"),
-                        "area_name": event.get("area_name"),
-                        "description": event.get("description"),
-                        "confidence": event.get("confidence"),
-                        "media_path": event.get("media_path"),
-                    }
-                )
+            # Read events from the timeline itself; the sensor attributes
+            # only carry the last few
+            manager = await get_timeline_manager(hass)
+            selected_events: list[dict[str, Any]] = [
+                {
+                    "event_id": event.event_id,
+                    "event_type": event.event_type,
+                    "timestamp": event.timestamp.isoformat(),
+                    "entity_id": event.camera_entity_id,
+                    "entity_name": event.camera_name,
+                    "area_name": event.area_name,
+                    "description": event.description,
+                    "media_path": event.media_path,
+                }
+                for event in manager.get_recent_events(limit=max_events)
+            ]
 
             if not selected_events and timeline_attrs.get("last_event_id"):
                 selected_events.append(
@@ -439,7 +442,19 @@ async def async_setup_services(hass: HomeAssistant, config: ConfigType) -> None:
                     }
                 )
 
-            if not selected_events:
+            # Precomputed counts describe the whole period in a few rows;
+            # the raw events above are only recent examples
+            period_end = dt_util.utcnow()
+            period_start = period_end - timedelta(days=days)
+            daily_activity = manager.rollups.query(
+                period_start,
+                period_end,
+                interval=INTERVAL_DAY,
+                group_by=(GROUP_AREA, GROUP_EVENT_TYPE),
+            )
+            hourly_profile = manager.rollups.hourly_profile(period_start, period_end)
+
+            if not selected_events and not daily_activity:
                 raise HomeAssistantError(
                     "No timeline events were available to evaluate"
                 )
@@ -451,7 +466,10 @@ async def async_setup_services(hass: HomeAssistant, config: ConfigType) -> None:
             focus_area_text = ", ".join(focus_areas) if focus_areas else "general home optimization"
             prompt = (
                 "You are a smart home optimization assistant. "
-                "Analyze the provided timeline activity events and identify patterns, inefficiencies, and opportunities. "
+                "Analyze the provided timeline activity and identify patterns, inefficiencies, and opportunities. "
+                "daily_activity holds event counts per day, area and event type; "
+                "hourly_profile holds event counts per local hour of day; "
+                "events are the most recent individual events. "
                 "Provide practical suggestions a homeowner can act on. "
                 "Prioritize safety, energy savings, reliability, and convenience. "
                 f"Focus areas: {focus_area_text}. "
@@ -471,6 +489,9 @@ async def async_setup_services(hass: HomeAssistant, config: ConfigType) -> None:
                 "sensor_state": timeline_state.state,
                 "total_events_today": timeline_attrs.get("total_events_today"),
                 "last_update": timeline_attrs.get("last_update"),
+                "period_days": days,
+                "daily_activity": daily_activity,
+                "hourly_profile": hourly_profile,
                 "events": selected_events,
             }
 
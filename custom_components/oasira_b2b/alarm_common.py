@@ -7,8 +7,16 @@ from typing import Any, Callable
 from homeassistant.core import HomeAssistant
 
 from . import const
-from .auth_helper import ensure_valid_id_token, safe_api_call
+from .auth_helper import ensure_valid_id_token, get_api_client, safe_api_call
 from .oasira import OasiraAPIClient, OasiraAPIError
+from .outbox import (
+    ALARM_CREATE_OPERATIONS,
+    OP_CREATE_MEDICAL_ALARM,
+    OP_CREATE_MONITORING_ALARM,
+    OP_CREATE_SECURITY_ALARM,
+    OasiraOutbox,
+    async_queue_write,
+)
 from .const import (
     ALARM_TYPE_MED_ALERT,
     ALARM_TYPE_MONITORING,
@@ -104,8 +112,11 @@ async def _refresh_id_token(hass: HomeAssistant) -> bool:
         _LOGGER.warning("No refresh token available - cannot refresh Firebase token")
         return False
 
+    shared = hass.data.get(DOMAIN, {}).get("api_client")
+    session = shared.session if shared is not None else None
+
     try:
-        async with OasiraAPIClient() as api_client:
+        async with OasiraAPIClient(session=session) as api_client:
             result = await api_client.firebase_refresh_token(refresh_token)
 
         new_id_token = result.get("idToken")
@@ -155,7 +166,7 @@ async def _call_oasira_api(
         if not id_token:
             raise OasiraAPIError("Missing id_token for Oasira API call")
 
-        async with OasiraAPIClient(system_id=system_id, id_token=id_token) as api_client:
+        async with get_api_client(hass, system_id) as api_client:
             return await api_call(api_client)
 
     return await safe_api_call(hass, _run)
@@ -259,8 +270,6 @@ async def async_createsecurityalarm(pendingAlarm):
         _LOGGER.info("No Active Security Plan (feature id 3 not present)")
         return
 
-    systemid = hass.data[DOMAIN].get("systemid")
-
     _LOGGER.info("System ID: %s", hass.data[DOMAIN].get("systemid"))
     _LOGGER.info("Email Address: %s", hass.data[DOMAIN].get("username"))
 
@@ -270,32 +279,9 @@ async def async_createsecurityalarm(pendingAlarm):
         "sensor_device_name": pendingAlarm.sensor_device_name or "unknown",
     }
 
-    _LOGGER.info("Calling create monitoring alarm API with payload: %s", alarm_data)
+    _LOGGER.info("Queueing create security alarm with payload: %s", alarm_data)
 
-    try:
-        result = await _call_oasira_api(
-            hass,
-            systemid,
-            lambda api_client: api_client.create_security_alarm(alarm_data),
-        )
-        if not result:
-            _LOGGER.error("Failed to create security alarm: no response")
-            return
-
-        _LOGGER.info("API response content: %s", result)
-
-        hass.data[DOMAIN]["alarm_id"] = result.get("AlarmID")
-        hass.data[DOMAIN]["alarmcreatemessage"] = result.get("Message")
-        hass.data[DOMAIN]["alarmownerid"] = result.get("OwnerID")
-        hass.data[DOMAIN]["alarmstatus"] = result.get("Status")
-        hass.data[DOMAIN]["alarmlasteventtype"] = "alarm.status.created"
-        hass.data[DOMAIN]["alarmtype"] = ALARM_TYPE_SECURITY
-
-        PendingAlarmComponent.set_pendingalarm(None)
-    except OasiraAPIError as e:
-        _LOGGER.error("Failed to create security alarm: %s", e)
-    except Exception as e:
-        _LOGGER.exception("Unexpected error creating security alarm: %s", e)
+    await async_queue_write(hass, OP_CREATE_SECURITY_ALARM, {"alarm_data": alarm_data})
 
 
 async def async_createmonitoringalarm(pendingAlarm):
@@ -331,7 +317,6 @@ async def async_createmonitoringalarm(pendingAlarm):
         _LOGGER.info("No Active Monitoring Plan (feature id 4 not present)")
         return
 
-    systemid = hass.data[DOMAIN].get("systemid")
     id_token = hass.data[DOMAIN].get("id_token")
 
     # Populate alarm_data with the actual triggering sensor
@@ -340,32 +325,11 @@ async def async_createmonitoringalarm(pendingAlarm):
         "sensor_device_name": pendingAlarm.sensor_device_name or "unknown",
     }
 
-    _LOGGER.info("Calling create medical alarm API with payload: %s", alarm_data)
+    _LOGGER.info("Queueing create monitoring alarm with payload: %s", alarm_data)
 
-    try:
-        result = await _call_oasira_api(
-            hass,
-            systemid,
-            lambda api_client: api_client.create_monitoring_alarm(alarm_data),
-        )
-        if not result:
-            _LOGGER.error("Failed to create monitoring alarm: no response")
-            return
-
-        _LOGGER.debug("API response content: %s", result)
-
-        hass.data[DOMAIN]["alarm_id"] = result["AlarmID"]
-        hass.data[DOMAIN]["alarmcreatemessage"] = result["Message"]
-        hass.data[DOMAIN]["alarmownerid"] = result["OwnerID"]
-        hass.data[DOMAIN]["alarmstatus"] = result["Status"]
-        hass.data[DOMAIN]["alarmlasteventtype"] = "alarm.status.created"
-        hass.data[DOMAIN]["alarmtype"] = ALARM_TYPE_MONITORING
-
-        PendingAlarmComponent.set_pendingalarm(None)
-    except OasiraAPIError as e:
-        _LOGGER.error("Failed to create monitoring alarm: %s", e)
-    except Exception as e:
-        _LOGGER.exception("Unexpected error creating monitoring alarm: %s", e)
+    await async_queue_write(
+        hass, OP_CREATE_MONITORING_ALARM, {"alarm_data": alarm_data}
+    )
 
 
 async def async_createmedicalalertalarm(pendingAlarm):
@@ -400,45 +364,77 @@ async def async_createmedicalalertalarm(pendingAlarm):
         _LOGGER.info("No Active Medical Alert Alarm Plan (feature id 5 not present)")
         return
 
-    systemid = hass.data[DOMAIN].get("systemid")
-
     alarm_data = {
         "sensor_device_class": "medical",
         "sensor_device_name": "medical alert",
     }
 
-    _LOGGER.info("Calling create medical alarm API with payload: %s", alarm_data)
+    _LOGGER.info("Queueing create medical alarm with payload: %s", alarm_data)
 
-    try:
-        result = await _call_oasira_api(
-            hass,
-            systemid,
-            lambda api_client: api_client.create_medical_alarm(alarm_data),
-        )
-        if not result:
-            _LOGGER.error("Failed to create medical alarm: no response")
+    await async_queue_write(hass, OP_CREATE_MEDICAL_ALARM, {"alarm_data": alarm_data})
+
+
+async def _async_handle_alarm_created(
+    hass: HomeAssistant, alarmtype: str, result: dict, cancelled: bool
+) -> None:
+    """Apply the cloud response of a delivered create-alarm write.
+
+    If the alarm was disarmed while the create was in flight, the alarm
+    the cloud just opened is cancelled instead.
+    """
+    _LOGGER.info("API response content: %s", result)
+
+    if cancelled:
+        alarmid = result.get("AlarmID")
+        _LOGGER.warning("Alarm %s was created after disarm; cancelling it", alarmid)
+        if not alarmid:
             return
+        try:
+            await _call_oasira_api(
+                hass,
+                hass.data[DOMAIN].get("systemid"),
+                lambda api_client: api_client.cancel_alarm(alarmid),
+            )
+        except OasiraAPIError as e:
+            _LOGGER.error("Failed to cancel alarm %s: %s", alarmid, e)
+        return
 
-        _LOGGER.debug("API response content: %s", result)
+    hass.data[DOMAIN]["alarm_id"] = result.get("AlarmID")
+    hass.data[DOMAIN]["alarmcreatemessage"] = result.get("Message")
+    hass.data[DOMAIN]["alarmownerid"] = result.get("OwnerID")
+    hass.data[DOMAIN]["alarmstatus"] = result.get("Status")
+    hass.data[DOMAIN]["alarmlasteventtype"] = "alarm.status.created"
+    hass.data[DOMAIN]["alarmtype"] = alarmtype
 
-        hass.data[DOMAIN]["alarm_id"] = result["AlarmID"]
-        hass.data[DOMAIN]["alarmcreatemessage"] = result["Message"]
-        hass.data[DOMAIN]["alarmownerid"] = result["OwnerID"]
-        hass.data[DOMAIN]["alarmstatus"] = result["Status"]
-        hass.data[DOMAIN]["alarmlasteventtype"] = "alarm.status.created"
-        hass.data[DOMAIN]["alarmtype"] = ALARM_TYPE_MED_ALERT
+    PendingAlarmComponent.set_pendingalarm(None)
 
-        PendingAlarmComponent.set_pendingalarm(None)
-    except OasiraAPIError as e:
-        _LOGGER.error("Failed to create medical alarm: %s", e)
-    except Exception as e:
-        _LOGGER.exception("Unexpected error creating medical alarm: %s", e)
+
+def register_outbox_handlers(outbox: OasiraOutbox) -> None:
+    """Register alarm result handlers so replayed alarms update local state."""
+    for operation, alarmtype in (
+        (OP_CREATE_SECURITY_ALARM, ALARM_TYPE_SECURITY),
+        (OP_CREATE_MONITORING_ALARM, ALARM_TYPE_MONITORING),
+        (OP_CREATE_MEDICAL_ALARM, ALARM_TYPE_MED_ALERT),
+    ):
+
+        async def _handler(
+            hass, payload, result, cancelled, alarmtype=alarmtype
+        ) -> None:
+            await _async_handle_alarm_created(hass, alarmtype, result, cancelled)
+
+        outbox.register_result_handler(operation, _handler)
 
 
 async def async_cancelalarm(hass: HomeAssistant):
     """Call the API to create a medical alarm."""
     _LOGGER.debug("in cancel alarm")
 
+    # Creates still queued are dropped; one already in flight is cancelled
+    # in the cloud by its result handler once it lands
+    outbox = hass.data[DOMAIN].get("outbox")
+    if outbox is not None:
+        await outbox.async_discard(*ALARM_CREATE_OPERATIONS)
+
     alarmstate = hass.data[DOMAIN]["alarm_id"]
 
     if alarmstate is not None and alarmstate != "":
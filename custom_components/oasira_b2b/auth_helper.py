@@ -48,6 +48,31 @@ def _is_firebase_token_error(err: Exception) -> bool:
     return False
 
 
+def get_api_client(hass, system_id: str | None = None) -> OasiraAPIClient:
+    """Return an API client backed by the config entry's pooled session.
+
+    The shared client is created in ``async_setup_entry`` and reads its
+    id_token from ``hass.data[DOMAIN]`` on every request, so it always uses the
+    latest refreshed token. Entering it with ``async with`` does not close the
+    pool. If no shared client exists yet (e.g. during config flow) a regular
+    short-lived client is returned instead.
+    """
+    data = hass.data.get(DOMAIN, {}) if hass else {}
+    shared: OasiraAPIClient | None = data.get("api_client")
+
+    if shared is None or shared.session is None:
+        return OasiraAPIClient(system_id=system_id, id_token=data.get("id_token"))
+
+    if system_id is None or system_id == shared.system_id:
+        return shared
+
+    return OasiraAPIClient(
+        system_id=system_id,
+        session=shared.session,
+        id_token_getter=lambda: hass.data.get(DOMAIN, {}).get("id_token"),
+    )
+
+
 async def _refresh_id_token(hass) -> bool:
     """Refresh the Firebase ID token."""
     refresh_token = hass.data.get(DOMAIN, {}).get("refresh_token")
@@ -55,8 +80,11 @@ async def _refresh_id_token(hass) -> bool:
         _LOGGER.warning("No refresh token available - cannot refresh Firebase token")
         return False
 
+    shared = hass.data.get(DOMAIN, {}).get("api_client")
+    session = shared.session if shared is not None else None
+
     try:
-        async with OasiraAPIClient() as api_client:
+        async with OasiraAPIClient(session=session) as api_client:
             result = await api_client.firebase_refresh_token(refresh_token)
 
         new_id_token = result.get("idToken")
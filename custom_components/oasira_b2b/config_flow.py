@@ -5,10 +5,17 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .oasira import OasiraAPIClient, OasiraAPIError
-from .const import DOMAIN, NAME
+from .const import (
+    CONF_TIMELINE_BACKEND,
+    DOMAIN,
+    NAME,
+    TIMELINE_BACKEND_LOG,
+    TIMELINE_BACKEND_SQLITE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +33,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 2
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return OptionsFlow()
+
     def __init__(self):
         """Initialize the config flow."""
         self._firebase_uid = None
@@ -356,3 +371,28 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+
+class OptionsFlow(config_entries.OptionsFlow):
+    """Handle Oasira options."""
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        """Select the timeline storage backend."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        backend = self.config_entry.options.get(
+            CONF_TIMELINE_BACKEND, TIMELINE_BACKEND_LOG
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_TIMELINE_BACKEND, default=backend): vol.In(
+                        {
+                            TIMELINE_BACKEND_LOG: "Daily log files",
+                            TIMELINE_BACKEND_SQLITE: "SQLite database",
+                        }
+                    ),
+                }
+            ),
+        )
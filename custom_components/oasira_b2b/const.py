@@ -519,3 +519,7 @@ CONF_EMAIL = "email"
 CONF_TRACKING_ENABLED = "tracking_enabled"
 CONF_NOTIFICATIONS_ENABLED = "notifications_enabled"
 WEBHOOK_UPDATE_PUSH_TOKEN = "Oasira_push_token"
+
+CONF_TIMELINE_BACKEND = "timeline_backend"
+TIMELINE_BACKEND_LOG = "log"
+TIMELINE_BACKEND_SQLITE = "sqlite"
@@ -3,6 +3,8 @@ import logging
 from homeassistant.helpers import entity_registry as er_module, area_registry, event
 from homeassistant.util import dt as dt_util
 
+from .history_loader import async_load_history
+
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = datetime.timedelta(hours=24)
@@ -35,7 +37,19 @@ async def async_setup_energy_advisor(hass):
                 if "motion" in entity_id or "presence" in entity_id:
                     areas[entry.area_id]["motion"].append(entity_id)
 
-        from homeassistant.components.recorder import history
+        # One chunked, attribute-free read for every light and motion sensor
+        history_by_entity = await async_load_history(
+            hass,
+            [
+                entity_id
+                for devices in areas.values()
+                for entity_id in devices["lights"] + devices["motion"]
+            ],
+            start_time,
+            end_time,
+        )
+        start_ts = start_time.timestamp()
+        end_ts = end_time.timestamp()
         suggestions = []
 
         for area_id, devices in areas.items():
@@ -44,17 +58,17 @@ async def async_setup_energy_advisor(hass):
 
             # Calculate light-on durations
             for light in devices["lights"]:
-                states = await history.get_significant_states(start_time, end_time, entity_ids=[light], hass=hass)
-                for st in states.get(light, []):
-                    if st.state == "on" and st.last_changed and st.last_updated:
-                        total_on_time += (st.last_changed - st.last_updated).total_seconds()
+                if light in history_by_entity:
+                    total_on_time += history_by_entity[light].time_in_states(
+                        {"on"}, start_ts, end_ts
+                    )
 
             # Calculate idle motion durations
             for motion in devices["motion"]:
-                states = await history.get_significant_states(start_time, end_time, entity_ids=[motion], hass=hass)
-                for st in states.get(motion, []):
-                    if st.state == "off" and st.last_changed and st.last_updated:
-                        total_idle_time += (st.last_changed - st.last_updated).total_seconds()
+                if motion in history_by_entity:
+                    total_idle_time += history_by_entity[motion].time_in_states(
+                        {"off"}, start_ts, end_ts
+                    )
 
             # Only suggest if lights were on > 30 mins and >90% of that time idle
             if total_on_time > 1800 and total_idle_time / (total_on_time + 1) > 0.9:
@@ -0,0 +1,131 @@
+"""Concurrent Firebase Cloud Messaging fan-out."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import json
+import logging
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .firebase_token import get_firebase_token_manager
+
+_LOGGER = logging.getLogger(__name__)
+
+FCM_SEND_URL = "https://fcm.googleapis.com/v1/projects/{project_id}/messages:send"
+FCM_ERROR_TYPE = "type.googleapis.com/google.firebase.fcm.v1.FcmError"
+
+# Maximum number of FCM requests in flight for one notification
+DEFAULT_FCM_CONCURRENCY = 8
+FCM_REQUEST_TIMEOUT = 10
+
+
+@dataclass
+class FcmDeliveryReport:
+    """Result of sending one notification to a set of device tokens."""
+
+    sent: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    unregistered: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        """Return the number of tokens attempted."""
+        return len(self.sent) + len(self.failed)
+
+    @property
+    def all_sent(self) -> bool:
+        """Return True if every device accepted the message."""
+        return not self.failed and bool(self.sent)
+
+
+def _is_unregistered(error_text: str) -> bool:
+    """Return True if an FCM error body says the token is no longer valid."""
+    try:
+        error_data = json.loads(error_text)
+    except json.JSONDecodeError:
+        return False
+    details = error_data.get("error", {}).get("details") or []
+    return any(
+        detail.get("errorCode") == "UNREGISTERED"
+        for detail in details
+        if detail.get("@type") == FCM_ERROR_TYPE
+    )
+
+
+async def async_fanout_fcm(
+    hass: HomeAssistant,
+    tokens: list[str],
+    message: dict[str, Any],
+    concurrency: int = DEFAULT_FCM_CONCURRENCY,
+) -> FcmDeliveryReport | None:
+    """Send one FCM message to all tokens concurrently.
+
+    Args:
+        hass: Home Assistant instance
+        tokens: Device registration tokens
+        message: FCM ``message`` body without the ``token`` field; it is
+            built once and shared by every request
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        Delivery report, or None if no access token could be obtained
+    """
+    report = FcmDeliveryReport()
+    tokens = list(dict.fromkeys(t for t in tokens if t and t.strip()))
+    if not tokens:
+        return report
+
+    token_manager = get_firebase_token_manager(hass)
+    access_token, project_id = await token_manager.async_get_token()
+    if not access_token or not project_id:
+        _LOGGER.error("Unable to get Firebase access token")
+        return None
+
+    fcm_url = FCM_SEND_URL.format(project_id=project_id)
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+    }
+    session = async_get_clientsession(hass)
+    timeout = aiohttp.ClientTimeout(total=FCM_REQUEST_TIMEOUT)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _send(token: str) -> None:
+        payload = {"message": {**message, "token": token}}
+        async with semaphore:
+            try:
+                async with session.post(
+                    fcm_url, headers=headers, json=payload, timeout=timeout
+                ) as resp:
+                    if resp.status in (200, 201):
+                        report.sent.append(token)
+                        return
+                    text = await resp.text()
+                    status = resp.status
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                _LOGGER.error("FCM push error for %s...: %s", token[:20], exc)
+                report.failed[token] = str(exc)
+                return
+
+        _LOGGER.error("FCM push failed for %s...: %s", token[:20], text)
+        report.failed[token] = text
+        if status == 401:
+            token_manager.invalidate()
+        elif _is_unregistered(text):
+            report.unregistered.append(token)
+
+    await asyncio.gather(*(_send(token) for token in tokens))
+
+    _LOGGER.debug(
+        "FCM fan-out complete: %d/%d delivered, %d unregistered",
+        len(report.sent),
+        report.total,
+        len(report.unregistered),
+    )
+    return report
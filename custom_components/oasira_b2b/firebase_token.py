@@ -0,0 +1,195 @@
+"""Shared Firebase Cloud Messaging OAuth access token manager."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+
+from google.auth import jwt
+from google.auth.crypt import rsa
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+
+from .auth_helper import ensure_valid_id_token, get_api_client, safe_api_call
+from .const import DOMAIN, FIREBASE_SCOPE
+from .oasira import OasiraAPIError
+
+_LOGGER = logging.getLogger(__name__)
+
+GOOGLE_OAUTH_URL = "https://oauth2.googleapis.com/token"
+
+# Lifetime requested for the signed assertion / access token
+TOKEN_LIFETIME = 3600
+# Refresh this many seconds before the access token expires
+TOKEN_REFRESH_MARGIN = 300
+
+
+def _sign_assertion(private_key: str, client_email: str) -> str:
+    """Build and RSA-sign the service account JWT assertion."""
+    now = int(time.time())
+    payload = {
+        "iss": client_email,
+        "scope": FIREBASE_SCOPE,
+        "aud": GOOGLE_OAUTH_URL,
+        "iat": now,
+        "exp": now + TOKEN_LIFETIME,
+    }
+    signer = rsa.RSASigner.from_string(private_key)
+    assertion = jwt.encode(signer, payload)
+    return assertion.decode() if isinstance(assertion, bytes) else assertion
+
+
+class FirebaseAccessTokenManager:
+    """Cache the FCM OAuth access token and project id.
+
+    The token is fetched once and reused until shortly before it expires,
+    when it is refreshed in the background. Concurrent callers during a
+    refresh share the same request.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self._access_token: str | None = None
+        self._project_id: str | None = None
+        self._expires_at = 0.0
+        self._service_account: dict[str, Any] | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._unsub_refresh: CALLBACK_TYPE | None = None
+
+    def _token_valid(self) -> bool:
+        return (
+            self._access_token is not None
+            and time.monotonic() < self._expires_at - TOKEN_REFRESH_MARGIN
+        )
+
+    async def async_get_token(self) -> tuple[str | None, str | None]:
+        """Return (access_token, project_id), refreshing only when needed."""
+        if self._token_valid():
+            return self._access_token, self._project_id
+
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = self.hass.async_create_task(self._async_refresh())
+
+        try:
+            return await asyncio.shield(self._refresh_task)
+        except OasiraAPIError as exc:
+            _LOGGER.error("Failed to fetch Firebase config: %s", exc)
+        except Exception as exc:
+            _LOGGER.exception("Failed to refresh Firebase access token: %s", exc)
+        return None, None
+
+    def invalidate(self) -> None:
+        """Drop the cached token, e.g. after FCM rejected it."""
+        self._access_token = None
+        self._expires_at = 0.0
+
+    def async_shutdown(self) -> None:
+        """Cancel the scheduled proactive refresh."""
+        if self._unsub_refresh is not None:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    async def _async_get_service_account(self) -> dict[str, Any] | None:
+        if self._service_account is not None:
+            return self._service_account
+
+        if not await ensure_valid_id_token(self.hass):
+            _LOGGER.error("Missing or invalid id_token for Firebase access")
+            return None
+
+        async def _fetch_config() -> dict[str, Any]:
+            if not self.hass.data.get(DOMAIN, {}).get("id_token"):
+                raise OasiraAPIError("Missing id_token for Firebase access")
+            async with get_api_client(self.hass) as client:
+                return await client.get_firebase_config()
+
+        firebase_config = await safe_api_call(self.hass, _fetch_config)
+        google_firebase_raw = (
+            firebase_config.get("Google_Firebase") if firebase_config else None
+        )
+        if not google_firebase_raw:
+            _LOGGER.error("Missing Google_Firebase config from Oasira")
+            return None
+
+        service_account = json.loads(google_firebase_raw)
+        if not service_account.get("project_id"):
+            _LOGGER.error("Missing project_id in Firebase service account")
+            return None
+
+        self._service_account = service_account
+        return service_account
+
+    async def _async_refresh(self) -> tuple[str | None, str | None]:
+        service_account = await self._async_get_service_account()
+        if service_account is None:
+            return None, None
+
+        # RSA signing is CPU bound; keep it off the event loop
+        assertion = await self.hass.async_add_executor_job(
+            _sign_assertion,
+            service_account["private_key"],
+            service_account["client_email"],
+        )
+
+        session = async_get_clientsession(self.hass)
+        async with session.post(
+            GOOGLE_OAUTH_URL,
+            data={
+                "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
+                "assertion": assertion,
+            },
+        ) as resp:
+            result = await resp.json()
+
+        if "access_token" not in result:
+            _LOGGER.error("Firebase OAuth error: %s", result)
+            # The service account may have been rotated; refetch it next time
+            self._service_account = None
+            return None, None
+
+        expires_in = int(result.get("expires_in", TOKEN_LIFETIME))
+        self._access_token = result["access_token"]
+        self._project_id = service_account["project_id"]
+        self._expires_at = time.monotonic() + expires_in
+        self._schedule_refresh(expires_in)
+        _LOGGER.debug("Firebase access token refreshed, valid for %ss", expires_in)
+        return self._access_token, self._project_id
+
+    def _schedule_refresh(self, expires_in: int) -> None:
+        """Refresh ahead of the send-path margin so senders never wait."""
+        self.async_shutdown()
+        delay = max(expires_in - 2 * TOKEN_REFRESH_MARGIN, 60)
+
+        async def _refresh_soon(_now: Any) -> None:
+            self._unsub_refresh = None
+            if self._refresh_task is None or self._refresh_task.done():
+                self._refresh_task = self.hass.async_create_task(self._async_refresh())
+            try:
+                await self._refresh_task
+            except Exception as exc:
+                _LOGGER.warning("Proactive Firebase token refresh failed: %s", exc)
+
+        self._unsub_refresh = async_call_later(self.hass, delay, _refresh_soon)
+
+
+def get_firebase_token_manager(hass: HomeAssistant) -> FirebaseAccessTokenManager:
+    """Return the shared access token manager, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    manager = domain_data.get("firebase_token_manager")
+    if manager is None:
+        manager = FirebaseAccessTokenManager(hass)
+        domain_data["firebase_token_manager"] = manager
+    return manager
+
+
+async def async_get_firebase_access_token(
+    hass: HomeAssistant,
+) -> tuple[str | None, str | None]:
+    """Return a cached (access_token, project_id) pair for FCM sends."""
+    return await get_firebase_token_manager(hass).async_get_token()
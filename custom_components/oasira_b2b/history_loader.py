@@ -0,0 +1,251 @@
+"""Chunked recorder history reads shared by the analysis features."""
+
+from __future__ import annotations
+
+from array import array
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Collection, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+from typing import Any, TypeVar
+
+from homeassistant.const import (
+    COMPRESSED_STATE_LAST_CHANGED,
+    COMPRESSED_STATE_LAST_UPDATED,
+    COMPRESSED_STATE_STATE,
+)
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Longer windows are read as several queries of this length
+HISTORY_CHUNK = timedelta(days=1)
+# Chunks read at the same time; the recorder executor is shared with writes
+HISTORY_PARALLEL_CHUNKS = 3
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class StateHistory:
+    """State changes of one entity as parallel timestamp and state arrays."""
+
+    entity_id: str
+    # POSIX seconds of each change, ascending
+    timestamps: array = field(default_factory=lambda: array("d"))
+    states: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __iter__(self) -> Iterator[tuple[float, str]]:
+        return zip(self.timestamps, self.states)
+
+    def extend(self, other: StateHistory) -> None:
+        """Append the changes of a later window."""
+        self.timestamps.extend(other.timestamps)
+        self.states.extend(other.states)
+
+    def time_in_states(self, states: Collection[str], start: float, end: float) -> float:
+        """Return the seconds spent in any of states between start and end."""
+        total = 0.0
+        for index, (ts, state) in enumerate(self):
+            if state not in states:
+                continue
+            until = (
+                self.timestamps[index + 1] if index + 1 < len(self.timestamps) else end
+            )
+            total += max(0.0, min(until, end) - max(ts, start))
+        return total
+
+
+def _windows(
+    start_time: datetime, end_time: datetime, chunk: timedelta
+) -> list[tuple[datetime, datetime]]:
+    windows = []
+    window_start = start_time
+    while window_start < end_time:
+        window_end = min(window_start + chunk, end_time)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+async def _async_read_windows(
+    hass: HomeAssistant,
+    read: Callable[[datetime, datetime, bool], _T],
+    start_time: datetime,
+    end_time: datetime,
+    chunk: timedelta,
+    parallel: int,
+) -> AsyncIterator[tuple[datetime, datetime, _T]]:
+    """Run read for each window in the recorder executor, oldest first.
+
+    Up to parallel windows are in flight at once. Only the first window is
+    asked for the state at its start, so rows are never repeated.
+    """
+    from homeassistant.components import recorder
+
+    instance = recorder.get_instance(hass)
+    pending: deque[tuple[datetime, datetime, asyncio.Future[_T]]] = deque()
+    try:
+        for index, (window_start, window_end) in enumerate(
+            _windows(start_time, end_time, chunk)
+        ):
+            pending.append(
+                (
+                    window_start,
+                    window_end,
+                    instance.async_add_executor_job(
+                        read, window_start, window_end, index == 0
+                    ),
+                )
+            )
+            if len(pending) >= parallel:
+                window_start, window_end, future = pending.popleft()
+                yield window_start, window_end, await future
+        while pending:
+            window_start, window_end, future = pending.popleft()
+            yield window_start, window_end, await future
+    finally:
+        for _start, _end, future in pending:
+            future.cancel()
+
+
+def _read_state_changes(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime,
+    end_time: datetime,
+    include_start_time_state: bool,
+) -> dict[str, StateHistory]:
+    """Read one window as compact state changes without attributes."""
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import history as recorder_history
+
+    with recorder.util.session_scope(hass=hass, read_only=True) as session:
+        rows_by_entity = recorder_history.get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            None,  # filters
+            include_start_time_state,
+            True,  # significant_changes_only
+            True,  # minimal_response
+            True,  # no_attributes
+            True,  # compressed_state_format
+        )
+
+    # Share one string object per distinct state across all entities
+    vocabulary: dict[str, str] = {}
+    result: dict[str, StateHistory] = {}
+    for entity_id, rows in rows_by_entity.items():
+        history = StateHistory(entity_id)
+        for row in rows:
+            state = row[COMPRESSED_STATE_STATE]
+            history.timestamps.append(
+                row.get(COMPRESSED_STATE_LAST_CHANGED, row[COMPRESSED_STATE_LAST_UPDATED])
+            )
+            history.states.append(vocabulary.setdefault(state, state))
+        result[entity_id] = history
+    return result
+
+
+async def async_stream_history(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime,
+    end_time: datetime,
+    chunk: timedelta = HISTORY_CHUNK,
+    parallel: int = HISTORY_PARALLEL_CHUNKS,
+) -> AsyncIterator[tuple[datetime, datetime, dict[str, StateHistory]]]:
+    """Yield the state changes of entities window by window, oldest first.
+
+    Only states are read: no attributes and no attribute-only updates.
+    The first window also holds each entity's state at start_time.
+    """
+    if not entity_ids:
+        return
+
+    def _read(
+        window_start: datetime, window_end: datetime, include_start_time_state: bool
+    ) -> dict[str, StateHistory]:
+        return _read_state_changes(
+            hass, entity_ids, window_start, window_end, include_start_time_state
+        )
+
+    async for window in _async_read_windows(
+        hass, _read, start_time, end_time, chunk, parallel
+    ):
+        yield window
+
+
+async def async_load_history(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime,
+    end_time: datetime,
+    chunk: timedelta = HISTORY_CHUNK,
+    parallel: int = HISTORY_PARALLEL_CHUNKS,
+) -> dict[str, StateHistory]:
+    """Return the state changes of entities over a whole period."""
+    result: dict[str, StateHistory] = {}
+    async for _start, _end, window in async_stream_history(
+        hass, entity_ids, start_time, end_time, chunk, parallel
+    ):
+        for entity_id, history in window.items():
+            if entity_id in result:
+                result[entity_id].extend(history)
+            else:
+                result[entity_id] = history
+    return result
+
+
+async def async_get_significant_states(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime,
+    end_time: datetime,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = True,
+    no_attributes: bool = True,
+    chunk: timedelta = HISTORY_CHUNK,
+    parallel: int = HISTORY_PARALLEL_CHUNKS,
+) -> dict[str, list[Any]]:
+    """Return recorder rows like get_significant_states, read in chunks.
+
+    For callers that need State objects or attributes; the session is
+    opened inside the recorder executor.
+    """
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import history as recorder_history
+
+    def _read(
+        window_start: datetime, window_end: datetime, first: bool
+    ) -> dict[str, list[Any]]:
+        with recorder.util.session_scope(hass=hass, read_only=True) as session:
+            return recorder_history.get_significant_states_with_session(
+                hass,
+                session,
+                window_start,
+                window_end,
+                entity_ids,
+                None,  # filters
+                include_start_time_state and first,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+
+    result: dict[str, list[Any]] = {}
+    async for _start, _end, window in _async_read_windows(
+        hass, _read, start_time, end_time, chunk, parallel
+    ):
+        for entity_id, rows in window.items():
+            result.setdefault(entity_id, []).extend(rows)
+    return result
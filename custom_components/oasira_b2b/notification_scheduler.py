@@ -0,0 +1,263 @@
+"""Priority-aware coalescing and rate limiting for push notifications."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import json
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_ALARM = 0
+PRIORITY_MEDICAL = 1
+PRIORITY_MOTION = 2
+PRIORITY_INFO = 3
+
+# Values accepted in a notification's data["priority"]; "high" is what the
+# alarm blueprints already pass for FCM delivery priority. Notifications
+# without one are treated as alarms, since most blueprints predate it.
+PRIORITY_NAMES = {
+    "alarm": PRIORITY_ALARM,
+    "critical": PRIORITY_ALARM,
+    "high": PRIORITY_ALARM,
+    "medical": PRIORITY_MEDICAL,
+    "motion": PRIORITY_MOTION,
+    "info": PRIORITY_INFO,
+    "normal": PRIORITY_INFO,
+    "low": PRIORITY_INFO,
+}
+
+# Identical notifications to one recipient within this window are dropped
+NOTIFICATION_DEDUPE_WINDOW = 30
+# Deferred notifications are collected this long before a digest is sent
+NOTIFICATION_DIGEST_WINDOW = 15
+# At most NOTIFICATION_RATE_LIMIT pushes per recipient per NOTIFICATION_RATE_PERIOD
+NOTIFICATION_RATE_LIMIT = 4
+NOTIFICATION_RATE_PERIOD = 60
+DIGEST_MAX_LINES = 10
+
+BROADCAST_RECIPIENT = "*"
+
+NotificationSender = Callable[[str, str, dict[str, Any]], Awaitable[Any]]
+
+
+def resolve_priority(data: dict[str, Any] | None, default: int = PRIORITY_ALARM) -> int:
+    """Return the scheduling priority named in a notification's data."""
+    if not data:
+        return default
+    value = data.get("priority")
+    if isinstance(value, int) and PRIORITY_ALARM <= value <= PRIORITY_INFO:
+        return value
+    return PRIORITY_NAMES.get(str(value).lower(), default) if value else default
+
+
+@dataclass
+class _PendingNotification:
+    title: str
+    message: str
+    data: dict[str, Any]
+    priority: int
+    created: float
+
+
+@dataclass
+class _RecipientState:
+    sender: NotificationSender
+    sent_at: deque[float] = field(default_factory=deque)
+    recent: dict[str, float] = field(default_factory=dict)
+    pending: list[_PendingNotification] = field(default_factory=list)
+    unsub_flush: CALLBACK_TYPE | None = None
+
+
+class NotificationScheduler:
+    """Collapse, batch and rate limit pushes per recipient.
+
+    Alarm and medical notifications, and any without a priority, are always
+    sent immediately. Motion and info notifications are sent immediately
+    while the recipient is under its rate limit; beyond that they are held
+    and delivered as one digest. Exact duplicates within the dedupe window
+    are dropped for every priority except alarm.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        dedupe_window: float = NOTIFICATION_DEDUPE_WINDOW,
+        digest_window: float = NOTIFICATION_DIGEST_WINDOW,
+        rate_limit: int = NOTIFICATION_RATE_LIMIT,
+        rate_period: float = NOTIFICATION_RATE_PERIOD,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._dedupe_window = dedupe_window
+        self._digest_window = digest_window
+        self._rate_limit = max(1, rate_limit)
+        self._rate_period = rate_period
+        self._recipients: dict[str, _RecipientState] = {}
+        self.sent = 0
+        self.suppressed = 0
+        self.digested = 0
+
+    async def async_submit(
+        self,
+        recipient: str,
+        sender: NotificationSender,
+        title: str,
+        message: str,
+        data: dict[str, Any] | None = None,
+        priority: int | None = None,
+    ) -> bool:
+        """Send or defer a notification.
+
+        Args:
+            recipient: Key the limits apply to, e.g. a person's email
+            sender: Coroutine function called with (title, message, data)
+            title: Notification title
+            message: Notification body
+            data: Extra notification data
+            priority: One of the PRIORITY_* constants; read from
+                data["priority"] when omitted, defaulting to PRIORITY_ALARM
+
+        Returns:
+            False if the notification was dropped as a duplicate
+        """
+        data = dict(data or {})
+        if priority is None:
+            priority = resolve_priority(data)
+
+        now = time.monotonic()
+        state = self._recipients.get(recipient)
+        if state is None:
+            state = self._recipients[recipient] = _RecipientState(sender)
+        state.sender = sender
+        self._prune(state, now)
+
+        key = json.dumps([title, message, data], sort_keys=True, default=str)
+        if priority != PRIORITY_ALARM and key in state.recent:
+            self.suppressed += 1
+            _LOGGER.debug("Dropping duplicate notification to %s: %s", recipient, title)
+            return False
+        state.recent[key] = now
+
+        if priority <= PRIORITY_MEDICAL or (
+            not state.pending and len(state.sent_at) < self._rate_limit
+        ):
+            await self._async_send(state, now, title, message, data)
+            return True
+
+        state.pending.append(
+            _PendingNotification(title, message, data, priority, now)
+        )
+        self._schedule_flush(recipient, state, now)
+        return True
+
+    def async_shutdown(self) -> None:
+        """Cancel pending digests."""
+        for recipient, state in self._recipients.items():
+            if state.unsub_flush is not None:
+                state.unsub_flush()
+                state.unsub_flush = None
+            if state.pending:
+                _LOGGER.debug(
+                    "Discarding %d deferred notifications to %s",
+                    len(state.pending),
+                    recipient,
+                )
+        self._recipients.clear()
+
+    def _prune(self, state: _RecipientState, now: float) -> None:
+        while state.sent_at and now - state.sent_at[0] >= self._rate_period:
+            state.sent_at.popleft()
+        if state.recent:
+            state.recent = {
+                key: seen
+                for key, seen in state.recent.items()
+                if now - seen < self._dedupe_window
+            }
+
+    def _schedule_flush(
+        self, recipient: str, state: _RecipientState, now: float
+    ) -> None:
+        if state.unsub_flush is not None:
+            return
+
+        delay = self._digest_window
+        if len(state.sent_at) >= self._rate_limit:
+            delay = max(delay, state.sent_at[0] + self._rate_period - now)
+
+        async def _flush(_now: Any) -> None:
+            state.unsub_flush = None
+            await self._async_flush(recipient, state)
+
+        state.unsub_flush = async_call_later(self.hass, delay, _flush)
+
+    async def _async_flush(self, recipient: str, state: _RecipientState) -> None:
+        now = time.monotonic()
+        self._prune(state, now)
+        if not state.pending:
+            return
+        if len(state.sent_at) >= self._rate_limit:
+            self._schedule_flush(recipient, state, now)
+            return
+
+        pending, state.pending = state.pending, []
+        if len(pending) == 1:
+            item = pending[0]
+            await self._async_send(state, now, item.title, item.message, item.data)
+            return
+
+        self.digested += len(pending)
+        title, message, data = _build_digest(pending)
+        _LOGGER.debug("Sending digest of %d notifications to %s", len(pending), recipient)
+        await self._async_send(state, now, title, message, data)
+
+    async def _async_send(
+        self,
+        state: _RecipientState,
+        now: float,
+        title: str,
+        message: str,
+        data: dict[str, Any],
+    ) -> None:
+        state.sent_at.append(now)
+        self.sent += 1
+        try:
+            await state.sender(title, message, data)
+        except Exception:
+            _LOGGER.exception("Error sending notification %s", title)
+
+
+def _build_digest(
+    pending: list[_PendingNotification],
+) -> tuple[str, str, dict[str, Any]]:
+    """Combine deferred notifications, most important and oldest first."""
+    ordered = sorted(pending, key=lambda item: (item.priority, item.created))
+    lines = [
+        f"{item.title}: {item.message}" if item.title else item.message
+        for item in ordered[:DIGEST_MAX_LINES]
+    ]
+    if len(ordered) > DIGEST_MAX_LINES:
+        lines.append(f"...and {len(ordered) - DIGEST_MAX_LINES} more")
+
+    data = dict(ordered[0].data)
+    data["digest_count"] = len(ordered)
+    return f"{len(ordered)} new notifications", "\n".join(lines), data
+
+
+def get_notification_scheduler(hass: HomeAssistant) -> NotificationScheduler:
+    """Return the shared scheduler, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    scheduler = domain_data.get("notification_scheduler")
+    if scheduler is None:
+        scheduler = NotificationScheduler(hass)
+        domain_data["notification_scheduler"] = scheduler
+    return scheduler
@@ -1,12 +1,13 @@
 """Oasira API Client for Home Assistant integrations."""
 
-from .api_client import OasiraAPIClient, OasiraAPIError
+from .api_client import OasiraAPIClient, OasiraAPIError, OasiraCircuitOpenError
 from .const import CUSTOMER_API, SECURITY_API, FIREBASE_AUTH_URL, FIREBASE_TOKEN_URL
 
 __version__ = "0.2.16"
 __all__ = [
     "OasiraAPIClient",
     "OasiraAPIError",
+    "OasiraCircuitOpenError",
     "CUSTOMER_API",
     "SECURITY_API",
     "FIREBASE_AUTH_URL",
@@ -3,19 +3,74 @@
 from __future__ import annotations
 
 import aiohttp
+import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from urllib.parse import urlparse
 
 from ..const import CUSTOMER_API, SECURITY_API, FIREBASE_AUTH_URL, FIREBASE_TOKEN_URL
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_RECOVERY_TIMEOUT,
+    BREAKER_RECOVERY_TIMEOUT,
+    CACHE_POLICIES,
+    CACHE_RESOURCE_CONFIG,
+    CACHE_RESOURCE_PLANS,
+    CACHE_RESOURCE_SYSTEM,
+    CACHE_RESOURCE_USERS,
+    NON_IDEMPOTENT_ENDPOINTS,
+    REQUEST_TIMEOUT,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RETRY_ATTEMPTS,
+    RETRY_ATTEMPTS_BY_ENDPOINT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+from .resilience import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from .response_cache import ResponseCache
 
 _LOGGER = logging.getLogger(__name__)
 
+# Connection pool settings for long-lived (per config entry) clients
+POOL_CONNECTION_LIMIT = 20
+POOL_KEEPALIVE_TIMEOUT = 60
+POOL_DNS_CACHE_TTL = 300
+
 
 class OasiraAPIError(Exception):
     """Base exception for Oasira API errors."""
 
-    pass
+    def __init__(
+        self,
+        message: str = "",
+        status: Optional[int] = None,
+        retryable: bool = False,
+        unsent: bool = False,
+    ):
+        """Initialize the error.
+
+        Args:
+            message: Error message
+            status: HTTP status code, if a response was received
+            retryable: True for transient failures (5xx, 429, timeouts, network)
+            unsent: True if the request never reached the server
+        """
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.unsent = unsent
+
+
+class OasiraCircuitOpenError(OasiraAPIError):
+    """Raised without a network call while an endpoint's breaker is open."""
 
 
 class OasiraAPIClient:
@@ -26,6 +81,8 @@ class OasiraAPIClient:
         system_id: Optional[str] = None,
         id_token: Optional[str] = None,
         session: Optional[aiohttp.ClientSession] = None,
+        id_token_getter: Optional[Callable[[], Optional[str]]] = None,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
     ):
         """Initialize the API client.
         
@@ -33,12 +90,84 @@ class OasiraAPIClient:
             system_id: System ID for authentication
             id_token: Firebase ID token for authentication
             session: Optional aiohttp session to reuse
+            id_token_getter: Optional callable returning the current ID token.
+                When set, it takes precedence over ``id_token`` so a long-lived
+                client always uses the latest refreshed token.
+            retry_policies: Optional endpoint -> RetryPolicy overrides
         """
         self.system_id = system_id
-        self.id_token = id_token
+        self._id_token = id_token
+        self._id_token_getter = id_token_getter
         self._firebase_config_cache: Optional[Dict[str, Any]] = None
         self._session = session
         self._owned_session = False
+        self._persistent = False
+        self._response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES)
+        self._revalidations: Dict[Hashable, asyncio.Task] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._default_retry_policy = RetryPolicy(
+            RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+        )
+        self._retry_policies: Dict[str, RetryPolicy] = {
+            endpoint: RetryPolicy(attempts, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+            for endpoint, attempts in RETRY_ATTEMPTS_BY_ENDPOINT.items()
+        }
+        if retry_policies:
+            self._retry_policies.update(retry_policies)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @property
+    def id_token(self) -> Optional[str]:
+        """Return the ID token used for authenticated requests."""
+        if self._id_token_getter is not None:
+            return self._id_token_getter()
+        return self._id_token
+
+    @id_token.setter
+    def id_token(self, value: Optional[str]) -> None:
+        """Set a static ID token."""
+        self._id_token = value
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        """Return the underlying aiohttp session, if any."""
+        return self._session
+
+    @property
+    def is_persistent(self) -> bool:
+        """Return True if this client keeps its session open across calls."""
+        return self._persistent
+
+    async def async_open(self) -> "OasiraAPIClient":
+        """Make the client long-lived.
+
+        Uses the session passed in, if any; otherwise opens one of its own
+        backed by a keep-alive connection pool. A persistent client can be
+        used with ``async with`` any number of times; an owned session is
+        only closed by ``async_close``.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=POOL_CONNECTION_LIMIT,
+                keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=POOL_DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owned_session = True
+        self._persistent = True
+        return self
+
+    async def async_close(self) -> None:
+        """Close the session if it is owned by this client."""
+        for task in self._revalidations.values():
+            task.cancel()
+        self._revalidations.clear()
+        self._response_cache.clear()
+        self._persistent = False
+        if self._owned_session and self._session:
+            await self._session.close()
+        self._session = None
+        self._owned_session = False
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -49,9 +178,12 @@ class OasiraAPIClient:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
+        if self._persistent:
+            return
         if self._owned_session and self._session:
             await self._session.close()
             self._session = None
+            self._owned_session = False
 
     def _get_common_headers(self) -> Dict[str, str]:
         """Get common headers for API requests."""
@@ -65,6 +197,15 @@ class OasiraAPIClient:
             headers["Authorization"] = f"Bearer {self.id_token}"
         return headers
 
+    @staticmethod
+    def _with_idempotency_key(
+        headers: Dict[str, str], idempotency_key: Optional[str]
+    ) -> Dict[str, str]:
+        """Return headers with an Idempotency-Key added when one is given."""
+        if idempotency_key:
+            return {**headers, "Idempotency-Key": idempotency_key}
+        return headers
+
     def _find_config_value(self, payload: Any, candidate_keys: List[str]) -> Optional[str]:
         """Find a string value for any candidate key in nested config payload."""
         lower_keys = {k.lower() for k in candidate_keys}
@@ -125,6 +266,7 @@ class OasiraAPIClient:
         url: str,
         headers: Dict[str, str],
         data: Optional[Dict[str, Any]] = None,
+        coalesce: bool = False,
     ) -> Dict[str, Any]:
         """Make an API request and return parsed JSON response.
         
@@ -133,6 +275,9 @@ class OasiraAPIClient:
             url: Full URL to request
             headers: Request headers
             data: Optional JSON data to send
+            coalesce: Share one in-flight request between identical callers.
+                Only set this for read-only endpoints; writes such as
+                create_event must never be merged.
             
         Returns:
             Parsed JSON response
@@ -140,12 +285,145 @@ class OasiraAPIClient:
         Raises:
             OasiraAPIError: If the request fails
         """
+        if not coalesce:
+            return await self._send_request(method, url, headers, data)
+
+        key = (
+            method,
+            url,
+            json.dumps(data, sort_keys=True) if data else "",
+            headers.get("Authorization"),
+            headers.get("eh_system_id"),
+        )
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._send_request(method, url, headers, data)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            _LOGGER.debug("Joining in-flight API request: %s %s", method, url)
+
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _endpoint_name(url: str) -> str:
+        """Return the endpoint name (first URL path segment) for url."""
+        return urlparse(url).path.strip("/").split("/", 1)[0]
+
+    @staticmethod
+    def _breaker_key(url: str) -> str:
+        """Return host and endpoint name; several hosts share endpoint names."""
+        parsed = urlparse(url)
+        return f"{parsed.netloc}/{parsed.path.strip('/').split('/', 1)[0]}"
+
+    def _get_breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit breaker for endpoint, creating it if needed."""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                endpoint,
+                failure_threshold=BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=BREAKER_RECOVERY_TIMEOUT,
+                max_recovery_timeout=BREAKER_MAX_RECOVERY_TIMEOUT,
+            )
+            self._breakers[endpoint] = breaker
+        return breaker
+
+    def breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """Return a diagnostic snapshot of every endpoint's circuit breaker."""
+        return {name: breaker.as_dict() for name, breaker in self._breakers.items()}
+
+    @property
+    def cloud_health(self) -> str:
+        """Return the worst breaker state across endpoints."""
+        states = {breaker.state for breaker in self._breakers.values()}
+        for state in (BREAKER_OPEN, BREAKER_HALF_OPEN):
+            if state in states:
+                return state
+        return BREAKER_CLOSED
+
+    async def _send_request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Send an API request with retries and a per-endpoint circuit breaker.
+
+        Transient failures are retried with exponential backoff and jitter.
+        Client errors (4xx) are raised at once and do not trip the breaker.
+        Non-idempotent endpoints are only retried when the request was
+        certainly not processed; the outbox replays the rest.
+        """
+        endpoint = self._endpoint_name(url)
+        breaker = self._get_breaker(self._breaker_key(url))
+        policy = self._retry_policies.get(endpoint, self._default_retry_policy)
+
+        attempt = 1
+        while True:
+            if not breaker.allow_request():
+                raise OasiraCircuitOpenError(
+                    f"Circuit open for {breaker.name}; last error: {breaker.last_error}",
+                    retryable=True,
+                )
+
+            try:
+                response = await self._send_once(method, url, headers, data)
+            except OasiraAPIError as err:
+                if not err.retryable:
+                    breaker.record_success()
+                    raise
+                breaker.record_failure(str(err))
+                if attempt >= policy.attempts:
+                    raise
+                if (
+                    endpoint in NON_IDEMPOTENT_ENDPOINTS
+                    and not err.unsent
+                    and err.status != 503
+                ):
+                    raise
+                delay = policy.backoff(attempt)
+                _LOGGER.warning(
+                    "Retrying %s %s in %.1fs (attempt %s/%s): %s",
+                    method,
+                    endpoint,
+                    delay,
+                    attempt + 1,
+                    policy.attempts,
+                    err,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                breaker.release_probe()
+                raise
+
+            breaker.record_success()
+            return response
+
+    async def _send_once(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Send a single API request and return parsed JSON response."""
         if self._session is None:
             raise OasiraAPIError("Session not initialized. Use async context manager.")
 
         try:
             async with self._session.request(
-                method, url, headers=headers, json=data or {}
+                method,
+                url,
+                headers=headers,
+                json=data or {},
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
             ) as response:
                 _LOGGER.debug("API request: %s %s", method, url)
                 _LOGGER.debug("API request headers: %s", headers)
@@ -161,7 +439,9 @@ class OasiraAPIClient:
                         content,
                     )
                     raise OasiraAPIError(
-                        f"API request failed with status {response.status}: {content}"
+                        f"API request failed with status {response.status}: {content}",
+                        status=response.status,
+                        retryable=response.status >= 500 or response.status == 429,
                     )
 
                 if not content:
@@ -174,9 +454,98 @@ class OasiraAPIClient:
                     _LOGGER.error("Failed to parse JSON response from %s: %s", url, content[:200])
                     raise OasiraAPIError(f"Invalid JSON response: {e}") from e
 
+        except asyncio.TimeoutError as e:
+            _LOGGER.error("Timeout during API request: %s %s", method, url)
+            raise OasiraAPIError(f"Timeout: {method} {url}", retryable=True) from e
+        except aiohttp.ClientConnectorError as e:
+            _LOGGER.error("Could not connect for API request: %s", e)
+            raise OasiraAPIError(
+                f"Network error: {e}", retryable=True, unsent=True
+            ) from e
         except aiohttp.ClientError as e:
             _LOGGER.error("Network error during API request: %s", e)
-            raise OasiraAPIError(f"Network error: {e}") from e
+            raise OasiraAPIError(f"Network error: {e}", retryable=True) from e
+
+    async def _cached_request(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Make a read-only API request through the response cache.
+
+        Fresh entries are returned directly. Once an entry passes its TTL it
+        is still served for the endpoint's stale window while a background
+        request refreshes it, so a slow cloud never blocks the caller.
+
+        Args:
+            endpoint: Key into CACHE_POLICIES
+            method: HTTP method
+            url: Full URL to request
+            headers: Request headers
+            data: Optional JSON data to send
+
+        Returns:
+            Parsed JSON response
+        """
+        ttl, stale_ttl, resource = CACHE_POLICIES[endpoint]
+        key = (
+            method,
+            url,
+            self.system_id,
+            json.dumps(data, sort_keys=True) if data else "",
+        )
+
+        now = time.monotonic()
+        entry = self._response_cache.get(key, now)
+        if entry is not None:
+            if not entry.is_fresh(now):
+                self._schedule_revalidation(key, endpoint, method, url, headers, data)
+            return entry.copy_value()
+
+        response = await self._make_request(method, url, headers, data, coalesce=True)
+        self._response_cache.set(key, response, ttl, stale_ttl, resource)
+        return response
+
+    def _schedule_revalidation(
+        self,
+        key: Hashable,
+        endpoint: str,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[Dict[str, Any]],
+    ) -> None:
+        """Refresh a stale cache entry in the background."""
+        if key in self._revalidations:
+            return
+
+        ttl, stale_ttl, resource = CACHE_POLICIES[endpoint]
+
+        async def _revalidate() -> None:
+            try:
+                response = await self._make_request(
+                    method, url, headers, data, coalesce=True
+                )
+            except OasiraAPIError as err:
+                _LOGGER.debug("Background refresh of %s failed: %s", endpoint, err)
+            else:
+                self._response_cache.set(key, response, ttl, stale_ttl, resource)
+            finally:
+                self._revalidations.pop(key, None)
+
+        self._revalidations[key] = asyncio.get_running_loop().create_task(
+            _revalidate()
+        )
+
+    def invalidate_cache(self, *resources: str) -> None:
+        """Drop cached reads for resources, or everything if none given."""
+        if resources:
+            self._response_cache.invalidate(*resources)
+        else:
+            self._response_cache.clear()
 
     # ==================== Customer API Methods ====================
 
@@ -212,7 +581,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        response = await self._make_request("GET", url, headers)
+        response = await self._cached_request(
+            "get_system_plans_by_system_id", "GET", url, headers
+        )
         return response.get("results", [])
 
     async def get_systems_by_customer_id(self, customer_id: str) -> List[Dict[str, Any]]:
@@ -349,7 +720,9 @@ class OasiraAPIClient:
             "eh_system_id": self.system_id,
         }
 
-        response = await self._make_request("POST", url, headers)
+        response = await self._cached_request(
+            "get_system_users", "POST", url, headers
+        )
         
         if "results" not in response:
             raise OasiraAPIError("No results in system users response")
@@ -415,7 +788,9 @@ class OasiraAPIClient:
         headers = {
             **self._get_common_headers(),
         }
-        return await self._make_request("POST", url, headers, user_data)
+        response = await self._make_request("POST", url, headers, user_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_USERS)
+        return response
 
     async def update_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing user.
@@ -430,7 +805,9 @@ class OasiraAPIClient:
         headers = {
             **self._get_common_headers(),
         }
-        return await self._make_request("POST", url, headers, user_data)
+        response = await self._make_request("POST", url, headers, user_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_USERS)
+        return response
 
     async def activate_user(self, email: str) -> Dict[str, Any]:
         """Activate a user account.
@@ -443,7 +820,9 @@ class OasiraAPIClient:
         """
         url = f"{CUSTOMER_API}activateuser/{email}"
         headers = self._get_common_headers()
-        return await self._make_request("GET", url, headers)
+        response = await self._make_request("GET", url, headers)
+        self._response_cache.invalidate(CACHE_RESOURCE_USERS)
+        return response
 
     async def deactivate_user(self, email: str) -> Dict[str, Any]:
         """Deactivate a user account.
@@ -459,7 +838,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
         }
         data = {"email_address": email}
-        return await self._make_request("GET", url, headers, data)
+        response = await self._make_request("GET", url, headers, data)
+        self._response_cache.invalidate(CACHE_RESOURCE_USERS)
+        return response
 
     # --- User Roles and Permissions ---
 
@@ -598,7 +979,9 @@ class OasiraAPIClient:
         headers = {
             **self._get_common_headers(),
         }
-        response = await self._make_request("GET", url, headers)
+        response = await self._cached_request(
+            "get_available_plans", "GET", url, headers
+        )
         return response.get("results", [])
 
     async def get_plan_features_by_system_id(self) -> Dict[str, Any]:
@@ -612,7 +995,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        response = await self._make_request("GET", url, headers)
+        response = await self._cached_request(
+            "get_plan_features_by_system_id", "GET", url, headers
+        )
         return response.get("results", [{}])[0]
 
     async def update_system_plans(self, plans_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -629,7 +1014,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        return await self._make_request("GET", url, headers, plans_data)
+        response = await self._make_request("GET", url, headers, plans_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_PLANS)
+        return response
 
     async def add_system_plans(self, plans_data: Dict[str, Any]) -> Dict[str, Any]:
         """Add system subscription plans.
@@ -645,7 +1032,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        return await self._make_request("GET", url, headers, plans_data)
+        response = await self._make_request("GET", url, headers, plans_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_PLANS)
+        return response
 
     # --- Customer Management ---
 
@@ -677,7 +1066,9 @@ class OasiraAPIClient:
         headers = {
             **self._get_common_headers(),
         }
-        return await self._make_request("GET", url, headers, customer_data)
+        response = await self._make_request("GET", url, headers, customer_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_SYSTEM)
+        return response
 
     async def update_customer_security(self, security_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update customer security settings.
@@ -692,7 +1083,9 @@ class OasiraAPIClient:
         headers = {
             **self._get_common_headers(),
         }
-        return await self._make_request("POST", url, headers, security_data)
+        response = await self._make_request("POST", url, headers, security_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_SYSTEM)
+        return response
 
     # --- System Management ---
 
@@ -709,7 +1102,9 @@ class OasiraAPIClient:
         headers = {
             **self._get_common_headers(),
         }
-        return await self._make_request("GET", url, headers, system_data)
+        response = await self._make_request("GET", url, headers, system_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_SYSTEM)
+        return response
 
     async def update_system(self, system_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update system configuration.
@@ -725,7 +1120,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        return await self._make_request("GET", url, headers, system_data)
+        response = await self._make_request("GET", url, headers, system_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_SYSTEM)
+        return response
 
     async def update_system_customer_edit(self, system_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update system configuration (customer editable fields only).
@@ -741,7 +1138,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        return await self._make_request("GET", url, headers, system_data)
+        response = await self._make_request("GET", url, headers, system_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_SYSTEM)
+        return response
 
     async def update_system_dashboard_config(self, dashboard_data: Dict[str, Any]) -> Dict[str, Any]:
         """Update system dashboard configuration.
@@ -757,7 +1156,9 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        return await self._make_request("POST", url, headers, dashboard_data)
+        response = await self._make_request("POST", url, headers, dashboard_data)
+        self._response_cache.invalidate(CACHE_RESOURCE_SYSTEM)
+        return response
 
     async def add_trial_customer_system(self, trial_data: Dict[str, Any]) -> Dict[str, Any]:
         """Add a trial customer and system.
@@ -791,9 +1192,12 @@ class OasiraAPIClient:
         if "Authorization" not in headers:
             headers["Authorization"] = "Bearer bootstrap"
 
-        response = await self._make_request("GET", url, headers)
+        response = await self._cached_request(
+            "get_firebase_config", "GET", url, headers
+        )
         
         if "results" not in response or not response["results"]:
+            self._response_cache.invalidate(CACHE_RESOURCE_CONFIG)
             raise OasiraAPIError("No results in Firebase config response")
 
         self._firebase_config_cache = response["results"][0]
@@ -932,12 +1336,15 @@ class OasiraAPIClient:
         response = await self._make_request("GET", url, headers)
         return response.get("results", [])
 
-    async def update_alarm_location(self, alarm_id: str, location_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def update_alarm_location(
+        self, alarm_id: str, location_data: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Update alarm location with GPS coordinates.
         
         Args:
             alarm_id: ID of the alarm
             location_data: Location data (coordinates: {lat, lng, accuracy})
+            idempotency_key: Optional key so replayed writes are not applied twice
             
         Returns:
             API response
@@ -947,7 +1354,12 @@ class OasiraAPIClient:
             **self._get_common_headers(),
             "eh_system_id": self.system_id,
         }
-        return await self._make_request("GET", url, headers, location_data)
+        return await self._make_request(
+            "GET",
+            url,
+            self._with_idempotency_key(headers, idempotency_key),
+            location_data,
+        )
 
     async def get_system_users_by_system_id(self) -> List[Dict[str, Any]]:
         """Get all system users by system ID (duplicate for compatibility).
@@ -961,7 +1373,9 @@ class OasiraAPIClient:
             "eh_system_id": self.system_id,
         }
 
-        response = await self._make_request("GET", url, headers)
+        response = await self._cached_request(
+            "get_system_users_by_system_id", "GET", url, headers
+        )
         
         if "results" not in response:
             raise OasiraAPIError("No results in system users response")
@@ -980,9 +1394,12 @@ class OasiraAPIClient:
             "eh_system_id": self.system_id,
         }
 
-        response = await self._make_request("POST", url, headers)
+        response = await self._cached_request(
+            "get_customer_and_system", "POST", url, headers
+        )
         
         if "results" not in response or not response["results"]:
+            self._response_cache.invalidate(CACHE_RESOURCE_SYSTEM)
             raise OasiraAPIError("No results in customer/system response")
             
         return response["results"][0]
@@ -1139,12 +1556,15 @@ class OasiraAPIClient:
 
     # ==================== Utility Methods ====================
 
-    async def create_event(self, alarm_id: str, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_event(
+        self, alarm_id: str, event_data: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a security event.
         
         Args:
             alarm_id: ID of the alarm
             event_data: Event data (sensor_device_class, sensor_device_name, etc.)
+            idempotency_key: Optional key so replayed writes are not applied twice
             
         Returns:
             API response
@@ -1156,13 +1576,21 @@ class OasiraAPIClient:
         }
 
         _LOGGER.info("Creating event for alarm %s with data: %s", alarm_id, event_data)
-        return await self._make_request("POST", url, headers, event_data)
+        return await self._make_request(
+            "POST",
+            url,
+            self._with_idempotency_key(headers, idempotency_key),
+            event_data,
+        )
 
-    async def create_alert(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_alert(
+        self, alert_data: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a security alert.
         
         Args:
             alert_data: Alert data (alert_type, alert_description, status)
+            idempotency_key: Optional key so replayed writes are not applied twice
             
         Returns:
             API response
@@ -1174,7 +1602,12 @@ class OasiraAPIClient:
         }
 
         _LOGGER.info("Creating alert with data: %s", alert_data)
-        return await self._make_request("POST", url, headers, alert_data)
+        return await self._make_request(
+            "POST",
+            url,
+            self._with_idempotency_key(headers, idempotency_key),
+            alert_data,
+        )
 
     async def cancel_alarm(self, alarm_id: str) -> Dict[str, Any]:
         """Cancel an active alarm.
@@ -1210,7 +1643,7 @@ class OasiraAPIClient:
         }
 
         _LOGGER.debug("Getting alarm status for system %s", self.system_id)
-        return await self._make_request("POST", url, headers)
+        return await self._make_request("POST", url, headers, coalesce=True)
 
     async def confirm_pending_alarm(self) -> Dict[str, Any]:
         """Confirm a pending alarm.
@@ -1227,11 +1660,14 @@ class OasiraAPIClient:
         _LOGGER.info("Confirming pending alarm for system %s", self.system_id)
         return await self._make_request("POST", url, headers)
 
-    async def create_security_alarm(self, alarm_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_security_alarm(
+        self, alarm_data: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a security alarm.
         
         Args:
             alarm_data: Alarm data (sensor_device_class, sensor_device_name, etc.)
+            idempotency_key: Optional key so replayed writes are not applied twice
             
         Returns:
             API response with AlarmID, Status, Message, OwnerID
@@ -1243,13 +1679,21 @@ class OasiraAPIClient:
         }
 
         _LOGGER.info("Creating security alarm with data: %s", alarm_data)
-        return await self._make_request("POST", url, headers, alarm_data)
+        return await self._make_request(
+            "POST",
+            url,
+            self._with_idempotency_key(headers, idempotency_key),
+            alarm_data,
+        )
 
-    async def create_monitoring_alarm(self, alarm_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_monitoring_alarm(
+        self, alarm_data: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a monitoring alarm.
         
         Args:
             alarm_data: Alarm data (sensor_device_class, sensor_device_name, etc.)
+            idempotency_key: Optional key so replayed writes are not applied twice
             
         Returns:
             API response with AlarmID, Status, Message, OwnerID
@@ -1261,13 +1705,21 @@ class OasiraAPIClient:
         }
 
         _LOGGER.info("Creating monitoring alarm with data: %s", alarm_data)
-        return await self._make_request("POST", url, headers, alarm_data)
+        return await self._make_request(
+            "POST",
+            url,
+            self._with_idempotency_key(headers, idempotency_key),
+            alarm_data,
+        )
 
-    async def create_medical_alarm(self, alarm_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_medical_alarm(
+        self, alarm_data: Dict[str, Any], idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Create a medical alert alarm.
         
         Args:
             alarm_data: Alarm data (sensor_device_class, sensor_device_name, etc.)
+            idempotency_key: Optional key so replayed writes are not applied twice
             
         Returns:
             API response with AlarmID, Status, Message, OwnerID
@@ -1279,7 +1731,12 @@ class OasiraAPIClient:
         }
 
         _LOGGER.info("Creating medical alarm with data: %s", alarm_data)
-        return await self._make_request("POST", url, headers, alarm_data)
+        return await self._make_request(
+            "POST",
+            url,
+            self._with_idempotency_key(headers, idempotency_key),
+            alarm_data,
+        )
 
     # ==================== Firebase Authentication ====================
 
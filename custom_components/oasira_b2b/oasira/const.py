@@ -8,3 +8,56 @@ CUSTOMER_API = "https://cust.effortlesshome.co/"
 FIREBASE_AUTH_URL = "https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword"
 FIREBASE_TOKEN_URL = "https://securetoken.googleapis.com/v1/token"
 FIREBASE_USER_INFO_URL = "https://identitytoolkit.googleapis.com/v1/accounts:lookup"
+
+# Response cache
+RESPONSE_CACHE_MAX_ENTRIES = 128
+
+# Cache resources, used to invalidate reads when a write changes them
+CACHE_RESOURCE_CONFIG = "config"
+CACHE_RESOURCE_PLANS = "plans"
+CACHE_RESOURCE_SYSTEM = "system"
+CACHE_RESOURCE_USERS = "users"
+
+# Read endpoint -> (ttl seconds, stale-while-revalidate seconds, resource)
+CACHE_POLICIES = {
+    "get_firebase_config": (3600, 86400, CACHE_RESOURCE_CONFIG),
+    "get_available_plans": (3600, 86400, CACHE_RESOURCE_PLANS),
+    "get_plan_features_by_system_id": (900, 86400, CACHE_RESOURCE_PLANS),
+    "get_system_plans_by_system_id": (900, 86400, CACHE_RESOURCE_PLANS),
+    "get_customer_and_system": (300, 3600, CACHE_RESOURCE_SYSTEM),
+    "get_system_users": (120, 900, CACHE_RESOURCE_USERS),
+    "get_system_users_by_system_id": (120, 900, CACHE_RESOURCE_USERS),
+}
+
+# Request timeout (seconds) for a single attempt
+REQUEST_TIMEOUT = 15
+
+# Retry with exponential backoff and jitter (5xx, 429, timeouts, network errors)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+# Endpoint -> attempts override. Endpoint names are the first URL path segment.
+RETRY_ATTEMPTS_BY_ENDPOINT = {
+    "createsecurityalarm": 5,
+    "createmonitoringalarm": 5,
+    "createmedicalalarm": 5,
+    "createevent": 4,
+    "getalarmstatus": 2,
+}
+
+# Endpoints that must not run twice. After a timeout or a dropped connection
+# the request may already have been processed, so these are only retried when
+# it never reached the server (connection refused) or was refused with a 503.
+NON_IDEMPOTENT_ENDPOINTS = frozenset(
+    {
+        "createsecurityalarm",
+        "createmonitoringalarm",
+        "createmedicalalarm",
+    }
+)
+
+# Circuit breaker
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RECOVERY_TIMEOUT = 30.0
+BREAKER_MAX_RECOVERY_TIMEOUT = 300.0
@@ -0,0 +1,128 @@
+"""Retry and circuit breaker helpers for the Oasira API client."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import random
+import time
+from typing import Any, Dict, Optional
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry settings for an endpoint."""
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before retry number attempt (1-based).
+
+        Uses exponential backoff with full jitter so retries from many
+        callers do not hit the cloud in lockstep.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    After failure_threshold consecutive failures the breaker opens and calls
+    fail fast. Once recovery_timeout has passed a single probe is let through
+    (half-open); success closes the breaker, failure opens it again with a
+    doubled timeout, capped at max_recovery_timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        max_recovery_timeout: float = 300.0,
+    ) -> None:
+        """Initialize the breaker."""
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._base_recovery_timeout = recovery_timeout
+        self._max_recovery_timeout = max_recovery_timeout
+        self._recovery_timeout = recovery_timeout
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.last_failure: Optional[float] = None
+        self.last_success: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Return the breaker state, moving open to half-open when due."""
+        if (
+            self._state == BREAKER_OPEN
+            and time.monotonic() - self._opened_at >= self._recovery_timeout
+        ):
+            self._state = BREAKER_HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == BREAKER_CLOSED:
+            return True
+        if state == BREAKER_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self._state = BREAKER_CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+        self._recovery_timeout = self._base_recovery_timeout
+        self.last_success = time.time()
+
+    def record_failure(self, error: str) -> None:
+        """Record a failed request."""
+        self._failures += 1
+        self.last_error = error
+        self.last_failure = time.time()
+
+        if self._state == BREAKER_HALF_OPEN:
+            self._recovery_timeout = min(
+                self._recovery_timeout * 2, self._max_recovery_timeout
+            )
+            self._open()
+        elif self._failures >= self._failure_threshold:
+            self._open()
+
+    def release_probe(self) -> None:
+        """Let another probe through after one ended without an outcome.
+
+        Used when a request is cancelled or fails outside the API, so a
+        half-open breaker is not left waiting for a result forever.
+        """
+        self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self._state = BREAKER_OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a diagnostic snapshot of the breaker."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "recovery_timeout": self._recovery_timeout,
+            "last_error": self.last_error,
+            "last_failure": self.last_failure,
+            "last_success": self.last_success,
+        }
@@ -0,0 +1,121 @@
+"""Bounded TTL response cache for read-only Oasira API endpoints."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import copy
+from dataclasses import dataclass
+import time
+from typing import Any, Hashable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A cached API response.
+
+    The value is owned by the cache; use copy_value() to hand it out.
+    """
+
+    value: Any
+    resource: str
+    expires_at: float
+    stale_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        """Return True if the entry is within its TTL."""
+        return now < self.expires_at
+
+    def is_usable(self, now: float) -> bool:
+        """Return True if the entry may still be served while revalidating."""
+        return now < self.stale_until
+
+    def copy_value(self) -> Any:
+        """Return a deep copy of the response the caller may mutate."""
+        return copy.deepcopy(self.value)
+
+
+class ResponseCache:
+    """LRU cache of API responses with per-entry TTL and stale window.
+
+    Entries are tagged with a resource name so write calls can invalidate
+    every cached read that depends on the resource they change.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept before evicting the
+                least recently used one
+        """
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, now: Optional[float] = None) -> Optional[CacheEntry]:
+        """Return the entry for key if it can still be served."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if now is None:
+            now = time.monotonic()
+        if not entry.is_usable(now):
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        stale_ttl: float,
+        resource: str,
+        now: Optional[float] = None,
+    ) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key
+            value: Parsed API response, copied so later changes by the
+                caller don't leak into the cache
+            ttl: Seconds the response is considered fresh
+            stale_ttl: Extra seconds a stale response may be served while a
+                background refresh runs
+            resource: Resource tag used for invalidation
+            now: Optional monotonic timestamp
+        """
+        if now is None:
+            now = time.monotonic()
+        self._entries[key] = CacheEntry(
+            value=copy.deepcopy(value),
+            resource=resource,
+            expires_at=now + ttl,
+            stale_until=now + ttl + stale_ttl,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *resources: str) -> int:
+        """Drop every entry tagged with one of resources.
+
+        Returns:
+            Number of entries removed
+        """
+        stale_keys = [
+            key for key, entry in self._entries.items() if entry.resource in resources
+        ]
+        for key in stale_keys:
+            del self._entries[key]
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
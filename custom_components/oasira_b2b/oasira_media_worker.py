@@ -0,0 +1,61 @@
+"""Image decoding for timeline previews, run in media worker processes.
+
+Worker processes import this file as a top-level module, so it must not
+import Home Assistant or anything from the integration package.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+
+from PIL import Image, features
+
+# Longest edge in pixels
+THUMBNAIL_SIZE = 160
+PREVIEW_SIZE = 640
+THUMBNAIL_QUALITY = 70
+PREVIEW_QUALITY = 80
+
+
+def warm_up() -> None:
+    """Return once the worker has started and Pillow is loaded."""
+    features.check("webp")
+
+
+def derive_images(source: str, out_dir: str) -> dict[str, str]:
+    """Write a thumbnail and a preview of source; return their file names.
+
+    Outputs are named after the content hash of the source, so a source
+    already derived is only hashed, not decoded.
+    """
+    with open(source, "rb") as file_handle:
+        data = file_handle.read()
+    digest = hashlib.sha256(data).hexdigest()[:24]
+    extension = "webp" if features.check("webp") else "jpg"
+    names = {
+        "thumbnail": f"{digest}_thumb.{extension}",
+        "preview": f"{digest}_preview.{extension}",
+    }
+    if all(os.path.exists(os.path.join(out_dir, name)) for name in names.values()):
+        return names
+
+    os.makedirs(out_dir, exist_ok=True)
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale directly
+        image.draft("RGB", (PREVIEW_SIZE, PREVIEW_SIZE))
+        image = image.convert("RGB")
+        for kind, size, quality in (
+            ("preview", PREVIEW_SIZE, PREVIEW_QUALITY),
+            ("thumbnail", THUMBNAIL_SIZE, THUMBNAIL_QUALITY),
+        ):
+            image.thumbnail((size, size))
+            path = os.path.join(out_dir, names[kind])
+            image.save(
+                f"{path}.tmp",
+                format="WEBP" if extension == "webp" else "JPEG",
+                quality=quality,
+            )
+            os.replace(f"{path}.tmp", path)
+    return names
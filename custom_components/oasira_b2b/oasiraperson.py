@@ -4,26 +4,18 @@ import json
 import logging
 from typing import Optional, List, Dict, Any
 import aiohttp
-import time
-from google.auth import jwt
-from google.auth.crypt import rsa
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import async_get as async_get_dev_reg
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 
-from .oasira import OasiraAPIClient, OasiraAPIError
-from .auth_helper import ensure_valid_id_token, safe_api_call
+from .firebase_token import async_get_firebase_access_token
 from .const import DOMAIN, NAME
 from .oasiranotificationdevice import oasiranotificationdevice
 
 _LOGGER = logging.getLogger(__name__)
 
-
-GOOGLE_OAUTH_URL = "https://oauth2.googleapis.com/token"
-FIREBASE_SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
-
 FCM_URL = "https://fcm.googleapis.com/v1/projects/oasira-oauth/messages:send"
 
 
@@ -340,69 +332,9 @@ class OasiraPerson(SensorEntity, RestoreEntity):
         )
 
     async def async_get_firebase_access_token(self) -> str:
-        """Generate a Firebase access token using service account JSON (async + HA safe)."""
-
-        try:
-            if not await ensure_valid_id_token(self.hass):
-                _LOGGER.error("Missing or invalid id_token for Firebase access")
-                return None
-
-            async def _fetch_config() -> dict[str, Any]:
-                id_token = self.hass.data[DOMAIN].get("id_token") if self.hass else None
-                if not id_token:
-                    raise OasiraAPIError("Missing id_token for Firebase access")
-                async with OasiraAPIClient(id_token=id_token) as client:
-                    return await client.get_firebase_config()
-
-            firebase_config = await safe_api_call(self.hass, _fetch_config)
-
-            google_firebase_raw = firebase_config.get("Google_Firebase")
-            if not google_firebase_raw:
-                _LOGGER.error("Missing Google_Firebase in response")
-                return None
-
-            service_account_info = json.loads(google_firebase_raw)
-
-            private_key = service_account_info["private_key"]
-            client_email = service_account_info["client_email"]
-
-            # ---- Build JWT ----
-            now = int(time.time())
-            payload = {
-                "iss": client_email,
-                "scope": FIREBASE_SCOPE,
-                "aud": GOOGLE_OAUTH_URL,
-                "iat": now,
-                "exp": now + 3600,
-            }
-
-            signer = rsa.RSASigner.from_string(private_key)
-            assertion = jwt.encode(signer, payload)
-
-            # ---- Exchange JWT for OAuth access token ----
-            form = {
-                "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                "assertion": assertion,
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(GOOGLE_OAUTH_URL, data=form) as resp:
-                    result = await resp.json()
-
-                    if "access_token" not in result:
-                        _LOGGER.error("Firebase OAuth error: %s", result)
-                        return None
-
-                    return result["access_token"]
-
-        except OasiraAPIError as e:
-            _LOGGER.error("Failed to fetch Firebase config: %s", e)
-            return None
-        except Exception as e:
-            _LOGGER.exception("Failed to refresh Firebase access token: %s", e)
-            return None
-
-
+        """Return the shared, cached Firebase access token."""
+        access_token, _ = await async_get_firebase_access_token(self.hass)
+        return access_token
 
     async def async_send_notification(self, message: str, title: str = None, data: dict = None):
         """Send push notifications to all registered devices."""
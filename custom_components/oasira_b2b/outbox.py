@@ -0,0 +1,280 @@
+"""Durable outbox for Oasira cloud writes (alarms, events, alerts, locations)."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+from typing import Any
+import uuid
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import storage
+
+from .auth_helper import ensure_valid_id_token, get_api_client, safe_api_call
+from .const import DOMAIN
+from .oasira import OasiraAPIClient, OasiraAPIError
+
+_LOGGER = logging.getLogger(__name__)
+
+OUTBOX_STORAGE_KEY = "oasira_outbox"
+OUTBOX_STORAGE_VERSION = 1
+
+# Backoff between replay attempts while the cloud is unreachable
+OUTBOX_RETRY_BASE_DELAY = 5
+OUTBOX_RETRY_MAX_DELAY = 300
+
+# Alarm creates older than this are dropped unsent; the incident is over
+# and a late alarm would only dispatch a response to a cleared home
+ALARM_CREATE_MAX_AGE = 300
+
+OP_CREATE_EVENT = "create_event"
+OP_CREATE_ALERT = "create_alert"
+OP_UPDATE_ALARM_LOCATION = "update_alarm_location"
+OP_CREATE_SECURITY_ALARM = "create_security_alarm"
+OP_CREATE_MONITORING_ALARM = "create_monitoring_alarm"
+OP_CREATE_MEDICAL_ALARM = "create_medical_alarm"
+
+ALARM_CREATE_OPERATIONS = (
+    OP_CREATE_SECURITY_ALARM,
+    OP_CREATE_MONITORING_ALARM,
+    OP_CREATE_MEDICAL_ALARM,
+)
+
+# operation -> coroutine sending the write; payload is the stored JSON dict
+_OPERATIONS: dict[
+    str, Callable[[OasiraAPIClient, dict[str, Any], str], Awaitable[Any]]
+] = {
+    OP_CREATE_EVENT: lambda client, payload, key: client.create_event(
+        payload["alarm_id"], payload["event_data"], idempotency_key=key
+    ),
+    OP_CREATE_ALERT: lambda client, payload, key: client.create_alert(
+        payload["alert_data"], idempotency_key=key
+    ),
+    OP_UPDATE_ALARM_LOCATION: lambda client, payload, key: client.update_alarm_location(
+        payload["alarm_id"], payload["location_data"], idempotency_key=key
+    ),
+    OP_CREATE_SECURITY_ALARM: lambda client, payload, key: client.create_security_alarm(
+        payload["alarm_data"], idempotency_key=key
+    ),
+    OP_CREATE_MONITORING_ALARM: lambda client, payload, key: client.create_monitoring_alarm(
+        payload["alarm_data"], idempotency_key=key
+    ),
+    OP_CREATE_MEDICAL_ALARM: lambda client, payload, key: client.create_medical_alarm(
+        payload["alarm_data"], idempotency_key=key
+    ),
+}
+
+# Called with the payload, the API result and whether the write was
+# discarded while it was being sent
+ResultHandler = Callable[
+    [HomeAssistant, dict[str, Any], Any, bool], Awaitable[None]
+]
+
+
+class OasiraOutbox:
+    """Ordered, persisted queue of Oasira cloud writes.
+
+    Writes are stored before they are sent, so nothing is lost if the WAN
+    link or Home Assistant goes down. Entries are replayed strictly in order
+    with their original idempotency key; a transient failure pauses the
+    queue and retries with backoff, a permanent (4xx) failure drops only
+    the offending entry. Alarm creates that could not be sent within
+    ALARM_CREATE_MAX_AGE are dropped rather than raised late.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the outbox."""
+        self.hass = hass
+        self._store = storage.Store(hass, OUTBOX_STORAGE_VERSION, OUTBOX_STORAGE_KEY)
+        self._entries: list[dict[str, Any]] = []
+        self._handlers: dict[str, ResultHandler] = {}
+        self._lock = asyncio.Lock()
+        self._drain_task: asyncio.Task | None = None
+        self._sending: dict[str, Any] | None = None
+        self._retry_handle: asyncio.TimerHandle | None = None
+        self._failures = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued writes."""
+        return len(self._entries)
+
+    async def async_load(self) -> None:
+        """Load queued writes left over from a previous run."""
+        self._entries = await self._store.async_load() or []
+        if self._entries:
+            _LOGGER.info("Loaded %d queued Oasira writes", len(self._entries))
+        if self._drop_expired():
+            await self._store.async_save(self._entries)
+
+    def register_result_handler(self, operation: str, handler: ResultHandler) -> None:
+        """Register a coroutine called with the API result of a delivered write."""
+        self._handlers[operation] = handler
+
+    async def async_enqueue(self, operation: str, payload: dict[str, Any]) -> str:
+        """Persist a write and schedule delivery; returns without waiting on the network."""
+        if operation not in _OPERATIONS:
+            raise ValueError(f"Unknown outbox operation: {operation}")
+
+        entry = {
+            "id": uuid.uuid4().hex,
+            "operation": operation,
+            "payload": payload,
+            "created": time.time(),
+            "attempts": 0,
+        }
+        self._entries.append(entry)
+        await self._store.async_save(self._entries)
+        self.async_schedule_drain()
+        return entry["id"]
+
+    async def async_discard(self, *operations: str) -> int:
+        """Drop queued writes of the given operations (e.g. a cancelled alarm).
+
+        A write that is already being sent cannot be recalled; it is marked
+        cancelled so its result handler can undo it once it lands.
+        """
+        if self._sending is not None and self._sending["operation"] in operations:
+            self._sending["cancelled"] = True
+        kept = [e for e in self._entries if e["operation"] not in operations]
+        removed = len(self._entries) - len(kept)
+        if removed:
+            self._entries = kept
+            await self._store.async_save(self._entries)
+        return removed
+
+    def async_schedule_drain(self, delay: float = 0) -> None:
+        """Start delivering queued writes, optionally after delay seconds."""
+        if self._retry_handle is not None:
+            self._retry_handle.cancel()
+            self._retry_handle = None
+
+        if delay:
+            self._retry_handle = self.hass.loop.call_later(
+                delay, self.async_schedule_drain
+            )
+            return
+
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = self.hass.async_create_background_task(
+                self._async_drain(), "oasira_outbox_drain"
+            )
+
+    async def async_shutdown(self) -> None:
+        """Stop delivery; queued writes stay on disk for the next start."""
+        if self._retry_handle is not None:
+            self._retry_handle.cancel()
+            self._retry_handle = None
+        if self._drain_task is not None and not self._drain_task.done():
+            self._drain_task.cancel()
+        self._drain_task = None
+
+    async def _async_drain(self) -> None:
+        """Deliver queued writes in order until empty or the cloud fails."""
+        async with self._lock:
+            while self._entries:
+                if self._drop_expired():
+                    await self._store.async_save(self._entries)
+                    continue
+                entry = self._entries[0]
+                self._sending = entry
+                try:
+                    result = await self._async_send(entry)
+                except OasiraAPIError as err:
+                    if err.retryable or err.status == 401:
+                        self._schedule_retry(entry, err)
+                        return
+                    _LOGGER.error(
+                        "Dropping queued %s after permanent failure: %s",
+                        entry["operation"],
+                        err,
+                    )
+                    result = None
+                else:
+                    self._failures = 0
+                finally:
+                    self._sending = None
+
+                self._entries = [e for e in self._entries if e is not entry]
+                await self._store.async_save(self._entries)
+
+                if result is not None:
+                    await self._async_handle_result(entry, result)
+
+    async def _async_send(self, entry: dict[str, Any]) -> Any:
+        """Send one queued write with token refresh handling."""
+        if not await ensure_valid_id_token(self.hass):
+            raise OasiraAPIError("Unable to obtain a valid id_token", status=401)
+
+        send = _OPERATIONS[entry["operation"]]
+        system_id = self.hass.data.get(DOMAIN, {}).get("systemid")
+
+        async def _run() -> Any:
+            async with get_api_client(self.hass, system_id) as api_client:
+                return await send(api_client, entry["payload"], entry["id"])
+
+        entry["attempts"] += 1
+        return await safe_api_call(self.hass, _run)
+
+    def _drop_expired(self) -> bool:
+        """Drop alarm creates too old to send; return True if any were."""
+        cutoff = time.time() - ALARM_CREATE_MAX_AGE
+        kept = []
+        for entry in self._entries:
+            if (
+                entry["operation"] in ALARM_CREATE_OPERATIONS
+                and entry["created"] < cutoff
+            ):
+                _LOGGER.warning(
+                    "Dropping %s queued %ds ago; too old to raise",
+                    entry["operation"],
+                    time.time() - entry["created"],
+                )
+            else:
+                kept.append(entry)
+        if len(kept) == len(self._entries):
+            return False
+        self._entries = kept
+        return True
+
+    def _schedule_retry(self, entry: dict[str, Any], err: OasiraAPIError) -> None:
+        self._failures += 1
+        delay = min(
+            OUTBOX_RETRY_MAX_DELAY,
+            OUTBOX_RETRY_BASE_DELAY * 2 ** (self._failures - 1),
+        )
+        _LOGGER.warning(
+            "Oasira cloud unavailable, %d queued writes; retrying %s in %ss: %s",
+            len(self._entries),
+            entry["operation"],
+            delay,
+            err,
+        )
+        self.async_schedule_drain(delay)
+
+    async def _async_handle_result(self, entry: dict[str, Any], result: Any) -> None:
+        handler = self._handlers.get(entry["operation"])
+        if handler is None:
+            _LOGGER.debug("Delivered queued %s: %s", entry["operation"], result)
+            return
+        try:
+            await handler(
+                self.hass, entry["payload"], result, entry.get("cancelled", False)
+            )
+        except Exception:
+            _LOGGER.exception(
+                "Error handling result of queued %s", entry["operation"]
+            )
+
+
+async def async_queue_write(
+    hass: HomeAssistant, operation: str, payload: dict[str, Any]
+) -> str | None:
+    """Queue a cloud write through the config entry's outbox."""
+    outbox: OasiraOutbox | None = hass.data.get(DOMAIN, {}).get("outbox")
+    if outbox is None:
+        _LOGGER.error("Oasira outbox not set up; cannot queue %s", operation)
+        return None
+    return await outbox.async_enqueue(operation, payload)
@@ -0,0 +1,446 @@
+"""Local usage pattern mining for automation recommendations."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import datetime
+import logging
+from typing import Any, Optional
+
+import numpy as np
+
+from homeassistant.util import dt as dt_util
+
+from .history_loader import StateHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+DAY = 86400
+MINUTES_PER_DAY = 1440
+# Resolution of the time-of-day histograms
+BIN_MINUTES = 5
+BINS = MINUTES_PER_DAY // BIN_MINUTES
+# Routines looked for per entity and day type, e.g. morning and evening
+MAX_ROUTINES = 2
+# A light turning on this soon after motion started counts as following it
+MOTION_LAG = 120
+# Motion must explain light events this many times more often than chance
+MIN_MOTION_LIFT = 2.0
+# Share of motion-triggered light events the reported hours must cover
+MOTION_HOURS_COVERAGE = 0.8
+
+LIGHT_DOMAINS = {"light", "switch"}
+SENSOR_DOMAINS = {"binary_sensor"}
+PRESENCE_DOMAINS = {"person", "device_tracker"}
+IGNORED_STATES = ("unavailable", "unknown")
+
+
+def _clock(history: StateHistory) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return UTC seconds, local-clock seconds and states of usable rows."""
+    utc = np.frombuffer(history.timestamps, dtype=float)
+    states = np.asarray(history.states)
+    keep = ~np.isin(states, IGNORED_STATES)
+    utc = utc[keep]
+    # One UTC offset per day; only changes in the hours around a DST switch
+    # land in the wrong bin
+    days, inverse = np.unique((utc // DAY).astype(np.int64), return_inverse=True)
+    offsets = np.array(
+        [
+            dt_util.as_local(dt_util.utc_from_timestamp(day * DAY + DAY / 2))
+            .utcoffset()
+            .total_seconds()
+            for day in days.tolist()
+        ]
+    )
+    return utc, utc + offsets[inverse].reshape(utc.shape), states[keep]
+
+
+def _edges(states: np.ndarray, active_state: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return the row indexes where an entity became active and inactive.
+
+    The first row is the state carried in from before the period and is
+    never an edge.
+    """
+    active = states == active_state
+    rises = np.flatnonzero(active[1:] & ~active[:-1]) + 1
+    falls = np.flatnonzero(~active[1:] & active[:-1]) + 1
+    return rises, falls
+
+
+def _is_weekend(local: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday
+    return ((local // DAY).astype(np.int64) + 3) % 7 >= 5
+
+
+def _circular_window_sum(counts: np.ndarray, half: int) -> np.ndarray:
+    """Sum counts over [i - half, i + half] around the clock."""
+    if half <= 0:
+        return counts.copy()
+    padded = np.concatenate((counts[-half:], counts, counts[:half]))
+    return np.convolve(padded, np.ones(2 * half + 1), "valid")
+
+
+def _circular_mean(minutes: np.ndarray) -> float:
+    """Return the mean time of day, treating 23:55 and 00:05 as close."""
+    angles = minutes * (2 * np.pi / MINUTES_PER_DAY)
+    mean = np.angle(np.exp(1j * angles).mean())
+    return float(mean * MINUTES_PER_DAY / (2 * np.pi)) % MINUTES_PER_DAY
+
+
+def _circular_distance(minutes: np.ndarray, reference: float) -> np.ndarray:
+    half_day = MINUTES_PER_DAY / 2
+    return np.abs((minutes - reference + half_day) % MINUTES_PER_DAY - half_day)
+
+
+def _hhmm(minutes: float) -> str:
+    minutes = int(round(minutes)) % MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _find_routines(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    days_observed: int,
+    window_minutes: int,
+    min_occurrences: int,
+) -> list[dict[str, Any]]:
+    """Find recurring times of day at which something starts.
+
+    starts and ends are sorted local-clock seconds. The smoothed circular
+    histogram of start times is searched for its peak; starts within the
+    window of the peak form a routine, are removed, and the search repeats.
+    A routine ends at the circular mean of the first end after each start.
+    """
+    routines: list[dict[str, Any]] = []
+    if not len(starts) or not days_observed:
+        return routines
+
+    minutes = (starts % DAY) / 60
+    day_of = (starts // DAY).astype(np.int64)
+    bins = (minutes // BIN_MINUTES).astype(np.int64)
+    half = min(window_minutes // BIN_MINUTES, BINS // 2)
+    remaining = np.ones(len(starts), dtype=bool)
+
+    for _ in range(MAX_ROUTINES):
+        # Count each day once per bin so one busy day cannot make a routine
+        day_bins = np.unique(day_of[remaining] * BINS + bins[remaining]) % BINS
+        counts = np.bincount(day_bins, minlength=BINS).astype(float)
+        smoothed = _circular_window_sum(counts, half)
+        if not smoothed.any():
+            break
+        peak = (int(np.argmax(smoothed)) + 0.5) * BIN_MINUTES
+        # The first best bin can sit at the edge of a plateau; re-centre on
+        # the starts around it
+        near = remaining & (_circular_distance(minutes, peak) <= window_minutes)
+        peak = _circular_mean(minutes[near])
+        near = remaining & (_circular_distance(minutes, peak) <= window_minutes)
+        days = np.unique(day_of[near]).size
+        if days < min_occurrences:
+            break
+        remaining &= ~near
+
+        end = None
+        following = np.searchsorted(ends, starts[near], side="right")
+        following = following[following < len(ends)]
+        if len(following):
+            end = _circular_mean((ends[following] % DAY) / 60)
+
+        routines.append(
+            {
+                "start": peak,
+                "end": end,
+                "days": days,
+                "days_observed": days_observed,
+            }
+        )
+    return routines
+
+
+def _split_routines(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    days_observed: dict[str, int],
+    window_minutes: int,
+    min_occurrences: int,
+) -> list[dict[str, Any]]:
+    """Find routines on weekdays and weekends; merge ones that match."""
+    found: dict[str, list[dict[str, Any]]] = {}
+    for day_type, weekend in (("weekday", False), ("weekend", True)):
+        mask = _is_weekend(starts) == weekend
+        found[day_type] = _find_routines(
+            starts[mask],
+            ends,
+            days_observed[day_type],
+            window_minutes,
+            min_occurrences,
+        )
+
+    routines = []
+    weekend_routines = list(found["weekend"])
+    for weekday in found["weekday"]:
+        match = next(
+            (
+                weekend
+                for weekend in weekend_routines
+                if _circular_distance(np.array(weekend["start"]), weekday["start"])
+                <= window_minutes
+            ),
+            None,
+        )
+        if match is None:
+            routines.append({**weekday, "day_type": "weekday"})
+            continue
+        weekend_routines.remove(match)
+        # Weighted by days so the merged time leans towards the busier side
+        weights = [weekday["days"], match["days"]]
+        merged = {
+            "start": _circular_mean(
+                np.repeat([weekday["start"], match["start"]], weights)
+            ),
+            "end": None,
+            "days": sum(weights),
+            "days_observed": weekday["days_observed"] + match["days_observed"],
+            "day_type": "daily",
+        }
+        if weekday["end"] is not None and match["end"] is not None:
+            merged["end"] = _circular_mean(
+                np.repeat([weekday["end"], match["end"]], weights)
+            )
+        routines.append(merged)
+    routines.extend({**weekend, "day_type": "weekend"} for weekend in weekend_routines)
+
+    for routine in routines:
+        routine["confidence"] = round(
+            min(1.0, routine["days"] / routine["days_observed"]), 2
+        )
+    return routines
+
+
+def _days_observed(first: float, end: float) -> dict[str, int]:
+    """Count weekdays and weekend days in [first, end) in local-clock time."""
+    days = np.arange(int(first // DAY), int(np.ceil(end / DAY)))
+    weekend = int(np.count_nonzero((days + 3) % 7 >= 5))
+    return {"weekday": len(days) - weekend, "weekend": weekend}
+
+
+def _day_phrase(day_type: str) -> str:
+    return "every day" if day_type == "daily" else f"on {day_type}s"
+
+
+def _active_hours(local: np.ndarray) -> tuple[str, str]:
+    """Return the shortest span of hours holding most of the given times."""
+    counts = np.bincount(((local % DAY) // 3600).astype(np.int64), minlength=24)
+    needed = MOTION_HOURS_COVERAGE * counts.sum()
+    doubled = np.concatenate((counts, counts))
+    sums = np.concatenate(([0], np.cumsum(doubled)))
+    for length in range(1, 25):
+        window = sums[length : length + 24] - sums[:24]
+        if window.max() >= needed:
+            first = int(np.argmax(window))
+            return _hhmm(first * 60), _hhmm(((first + length) % 24) * 60)
+    return "00:00", "00:00"
+
+
+def _motion_light_patterns(
+    motions: dict[str, tuple[np.ndarray, np.ndarray]],
+    lights: dict[str, tuple[np.ndarray, np.ndarray]],
+    names: dict[str, str],
+    start: float,
+    end: float,
+    min_occurrences: int,
+) -> list[dict[str, Any]]:
+    """Pair each light with the motion sensor that best predicts it.
+
+    Builds a motion x light matrix of light turn-ons that happened while
+    the sensor saw motion or within MOTION_LAG of it starting, and compares
+    each share with how much of the time that sensor covers anyway.
+    """
+    motion_ids = list(motions)
+    light_ids = [
+        entity_id for entity_id, (rises, _local) in lights.items() if len(rises)
+    ]
+    if not motion_ids or not light_ids:
+        return []
+
+    hits = np.zeros((len(motion_ids), len(light_ids)), dtype=np.int64)
+    matched: dict[tuple[int, int], np.ndarray] = {}
+    coverage = np.zeros(len(motion_ids))
+    for row, motion_id in enumerate(motion_ids):
+        rises, falls = motions[motion_id]
+        if not len(rises):
+            continue
+        # Time from each rise until the sensor cleared, at least MOTION_LAG
+        next_fall = np.searchsorted(falls, rises, side="right")
+        until = np.full(len(rises), np.inf)
+        has_fall = next_fall < len(falls)
+        until[has_fall] = falls[next_fall[has_fall]]
+        until = np.maximum(until, rises + MOTION_LAG)
+        covered = np.minimum(until, end) - rises
+        coverage[row] = min(1.0, covered.sum() / (end - start))
+
+        for column, light_id in enumerate(light_ids):
+            light_rises, _local = lights[light_id]
+            last = np.searchsorted(rises, light_rises, side="right") - 1
+            valid = last >= 0
+            hit = np.zeros(len(light_rises), dtype=bool)
+            hit[valid] = light_rises[valid] <= until[last[valid]]
+            hits[row, column] = np.count_nonzero(hit)
+            matched[(row, column)] = hit
+
+    light_counts = np.array([len(lights[light_id][0]) for light_id in light_ids])
+    share = hits / light_counts
+    lift = np.divide(
+        share, coverage[:, None], out=np.zeros_like(share), where=coverage[:, None] > 0
+    )
+    share[(hits < min_occurrences) | (lift < MIN_MOTION_LIFT)] = 0
+
+    patterns = []
+    for column, light_id in enumerate(light_ids):
+        row = int(np.argmax(share[:, column]))
+        if not share[row, column]:
+            continue
+        motion_id = motion_ids[row]
+        _rises, light_local = lights[light_id]
+        first_hour, last_hour = _active_hours(light_local[matched[(row, column)]])
+        light_name = names.get(light_id, light_id)
+        motion_name = names.get(motion_id, motion_id)
+        patterns.append(
+            {
+                "pattern_type": "motion_light",
+                "entity_type": light_id.split(".", 1)[0],
+                "source_entity": light_id,
+                "source_entity_name": light_name,
+                "trigger_entity": motion_id,
+                "trigger_entity_name": motion_name,
+                "description": (
+                    f"{light_name} turned on with motion on {motion_id} "
+                    f"{hits[row, column]} of {light_counts[column]} times, "
+                    f"mostly between {first_hour} and {last_hour}"
+                ),
+                "start_time": first_hour,
+                "end_time": last_hour,
+                "day_type": "daily",
+                "confidence": round(float(share[row, column]), 2),
+                "occurrences": int(hits[row, column]),
+                "lift": round(float(lift[row, column]), 1),
+                "automation_type": "motion_light",
+            }
+        )
+    return patterns
+
+
+def mine_patterns(
+    history_by_entity: dict[str, StateHistory],
+    motion_entities: Collection[str],
+    names: dict[str, str],
+    start_time: datetime,
+    end_time: datetime,
+    window_minutes: int,
+    min_occurrences: int,
+) -> list[dict[str, Any]]:
+    """Return usage patterns found in state history, best first.
+
+    Lights and switches give on/off routines, people give arrival and
+    departure routines, other binary sensors give activity routines, and
+    motion sensors are matched with the lights that follow them. Runs in
+    an executor.
+    """
+    start = start_time.timestamp()
+    end = end_time.timestamp()
+    patterns: list[dict[str, Any]] = []
+    motions: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    lights: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    for entity_id, history in history_by_entity.items():
+        if len(history) < 2:
+            continue
+        domain = entity_id.split(".", 1)[0]
+        name = names.get(entity_id, entity_id)
+        utc, local, states = _clock(history)
+        if len(states) < 2:
+            continue
+        days_observed = _days_observed(
+            max(utc[0], start) + (local[0] - utc[0]), end + (local[-1] - utc[-1])
+        )
+
+        if domain in PRESENCE_DOMAINS:
+            arrivals, departures = _edges(states, "home")
+            for routine in _split_routines(
+                local[arrivals], local[departures], days_observed, window_minutes, min_occurrences
+            ):
+                patterns.append(
+                    _routine_pattern(
+                        routine, entity_id, name, "presence_home", "presence_automation",
+                        "{name} usually arrives home around {start}{until} {days}",
+                    )
+                )
+            for routine in _split_routines(
+                local[departures], local[arrivals], days_observed, window_minutes, min_occurrences
+            ):
+                patterns.append(
+                    _routine_pattern(
+                        routine, entity_id, name, "presence_away", "presence_automation",
+                        "{name} usually leaves home around {start}{until} {days}",
+                    )
+                )
+            continue
+
+        rises, falls = _edges(states, "on")
+        if entity_id in motion_entities:
+            motions[entity_id] = (utc[rises], utc[falls])
+            continue
+        if domain in LIGHT_DOMAINS:
+            lights[entity_id] = (utc[rises], local[rises])
+            pattern_type, automation_type = "light_schedule", "light_schedule"
+            template = "{name} turns on around {start}{until} {days}"
+        elif domain in SENSOR_DOMAINS:
+            pattern_type, automation_type = "sensor_activity", "sensor_trigger"
+            template = "{name} becomes active around {start}{until} {days}"
+        else:
+            continue
+        for routine in _split_routines(
+            local[rises], local[falls], days_observed, window_minutes, min_occurrences
+        ):
+            patterns.append(
+                _routine_pattern(
+                    routine, entity_id, name, pattern_type, automation_type, template
+                )
+            )
+
+    patterns.extend(
+        _motion_light_patterns(motions, lights, names, start, end, min_occurrences)
+    )
+    patterns.sort(key=lambda p: (p["confidence"], p["occurrences"]), reverse=True)
+    return patterns
+
+
+def _routine_pattern(
+    routine: dict[str, Any],
+    entity_id: str,
+    name: str,
+    pattern_type: str,
+    automation_type: str,
+    template: str,
+) -> dict[str, Any]:
+    """Describe a routine in the pattern format the AI prompt expects."""
+    start = _hhmm(routine["start"])
+    end: Optional[str] = None if routine["end"] is None else _hhmm(routine["end"])
+    return {
+        "pattern_type": pattern_type,
+        "entity_type": entity_id.split(".", 1)[0],
+        "source_entity": entity_id,
+        "source_entity_name": name,
+        "description": template.format(
+            name=name,
+            start=start,
+            until=f" until around {end}" if end else "",
+            days=_day_phrase(routine["day_type"]),
+        )
+        + f" ({routine['days']} of {routine['days_observed']} days)",
+        "start_time": start,
+        "end_time": end,
+        "day_type": routine["day_type"],
+        "confidence": routine["confidence"],
+        "occurrences": routine["days"],
+        "automation_type": automation_type,
+    }
@@ -4,10 +4,6 @@ import json
 import logging
 import math
 from typing import Optional, List, Dict, Any
-import aiohttp
-import time
-from google.auth import jwt
-from google.auth.crypt import rsa
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import async_get as async_get_dev_reg
@@ -15,17 +11,12 @@ from homeassistant.components.sensor import SensorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.event import async_track_state_change_event
 
-from .oasira import OasiraAPIClient, OasiraAPIError
 from .const import DOMAIN, NAME, ATTR_LATITUDE, ATTR_LONGITUDE
 from .notificationdevice import Oasiranotificationdevice
-from .auth_helper import ensure_valid_id_token, safe_api_call
+from .firebase_token import async_get_firebase_access_token
 
 _LOGGER = logging.getLogger(__name__)
 
-
-GOOGLE_OAUTH_URL = "https://oauth2.googleapis.com/token"
-FIREBASE_SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
-
 FCM_URL = "https://fcm.googleapis.com/v1/projects/oasira-oauth/messages:send"
 
 
@@ -394,67 +385,9 @@ class eh_person(SensorEntity, RestoreEntity):
         await self.async_setup_geofencing()
 
     async def async_get_firebase_access_token(self) -> str:
-        """Generate a Firebase access token using service account JSON (async + HA safe)."""
-
-        try:
-            if not await ensure_valid_id_token(self.hass):
-                _LOGGER.error("Missing or invalid id_token for Firebase access")
-                return None
-
-            async def _fetch_config() -> dict[str, Any]:
-                id_token = self.hass.data[DOMAIN].get("id_token") if self.hass else None
-                if not id_token:
-                    raise OasiraAPIError("Missing id_token for Firebase access")
-                async with OasiraAPIClient(id_token=id_token) as client:
-                    return await client.get_firebase_config()
-
-            firebase_config = await safe_api_call(self.hass, _fetch_config)
-
-            google_firebase_raw = firebase_config.get("Google_Firebase")
-            if not google_firebase_raw:
-                _LOGGER.error("Missing Google_Firebase in response")
-                return None
-
-            service_account_info = json.loads(google_firebase_raw)
-
-            private_key = service_account_info["private_key"]
-            client_email = service_account_info["client_email"]
-
-            # ---- Build JWT ----
-            now = int(time.time())
-            payload = {
-                "iss": client_email,
-                "scope": FIREBASE_SCOPE,
-                "aud": GOOGLE_OAUTH_URL,
-                "iat": now,
-                "exp": now + 3600,
-            }
-
-            signer = rsa.RSASigner.from_string(private_key)
-            assertion = jwt.encode(signer, payload)
-
-            # ---- Exchange JWT for OAuth access token ----
-            form = {
-                "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                "assertion": assertion,
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(GOOGLE_OAUTH_URL, data=form) as resp:
-                    result = await resp.json()
-
-                    if "access_token" not in result:
-                        _LOGGER.error("Firebase OAuth error: %s", result)
-                        return None
-
-                    return result["access_token"]
-
-        except OasiraAPIError as e:
-            _LOGGER.error("Failed to fetch Firebase config: %s", e)
-            return None
-        except Exception as e:
-            _LOGGER.exception("Failed to refresh Firebase access token: %s", e)
-            return None
+        """Return the shared, cached Firebase access token."""
+        access_token, _ = await async_get_firebase_access_token(self.hass)
+        return access_token
 
     def __repr__(self):
         return f"<eh_person email={self._email!r} devices={len(self._notification_devices)}>"
@@ -6,13 +6,11 @@ import json
 import logging
 from typing import Any
 
-from google.auth import jwt
-from google.auth.crypt import rsa
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import storage
 
-from .auth_helper import ensure_valid_id_token, safe_api_call
 from .const import DOMAIN
+from .fcm_fanout import async_fanout_fcm
 from .oasiranotificationdevice import oasiranotificationdevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -213,142 +211,37 @@ async def send_notification_to_person(
     tokens = [dev.DeviceToken for dev in valid_devices]
     _LOGGER.debug("Sending notification to %s on %d devices", person_email, len(tokens))
 
-    domain_data = hass.data.get(DOMAIN, {})
+    fcm_message: dict[str, Any] = {
+        "notification": {
+            "title": title,
+            "body": message,
+        },
+    }
+    if data:
+        fcm_message["data"] = {str(k): str(v) for k, v in data.items()}
 
     try:
-        access_token, project_id = await _get_firebase_access_token(hass, domain_data)
-        if not access_token or not project_id:
-            _LOGGER.error("Unable to get Firebase access token for person notification")
-            return False
-
-        fcm_url = f"https://fcm.googleapis.com/v1/projects/{project_id}/messages:send"
-
-        from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-        session = async_get_clientsession(hass)
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
-
-        failed_count = 0
-        for token in tokens:
-            payload = {
-                "message": {
-                    "token": token,
-                    "notification": {
-                        "title": title,
-                        "body": message,
-                    },
-                }
-            }
-
-            if data:
-                payload["message"]["data"] = {
-                    str(k): str(v) for k, v in data.items()
-                }
-
-            try:
-                async with session.post(
-                    fcm_url, headers=headers, json=payload, timeout=10
-                ) as resp:
-                    if resp.status not in (200, 201):
-                        text = await resp.text()
-                        _LOGGER.error("FCM error for %s: %s", person_email, text)
-                        failed_count += 1
-                    else:
-                        _LOGGER.debug("Notification sent to device for %s", person_email)
-
-            except Exception as e:
-                _LOGGER.error("Failed to send FCM to device: %s", e)
-                failed_count += 1
-
-        if failed_count > 0:
-            _LOGGER.warning(
-                "Sent notification to %s with %d/%d device failures",
-                person_email,
-                failed_count,
-                len(tokens),
-            )
-            return False
-
-        _LOGGER.info(
-            "Successfully sent notification to %s on %d devices",
-            person_email,
-            len(tokens),
-        )
-        return True
-
+        report = await async_fanout_fcm(hass, tokens, fcm_message)
     except Exception as e:
         _LOGGER.error("Failed to send notification to person %s: %s", person_email, e)
         return False
 
+    if report is None:
+        _LOGGER.error("Unable to get Firebase access token for person notification")
+        return False
 
-async def _get_firebase_access_token(
-    hass: HomeAssistant, domain_data: dict[str, Any]
-) -> tuple[str | None, str | None]:
-    """Get a valid Firebase access token for sending FCM messages."""
-    try:
-        if not await ensure_valid_id_token(hass):
-            _LOGGER.error("Missing or invalid id_token for Firebase access")
-            return None, None
-
-        from .oasira import OasiraAPIClient, OasiraAPIError
-        import time
-
-        async def _fetch_config() -> dict[str, Any]:
-            id_token = hass.data.get(DOMAIN, {}).get("id_token")
-            if not id_token:
-                raise OasiraAPIError("Missing id_token for Firebase access")
-            async with OasiraAPIClient(id_token=id_token) as client:
-                return await client.get_firebase_config()
-
-        firebase_config = await safe_api_call(hass, _fetch_config)
-
-        google_firebase_raw = (
-            firebase_config.get("Google_Firebase") if firebase_config else None
+    if report.failed:
+        _LOGGER.warning(
+            "Sent notification to %s with %d/%d device failures",
+            person_email,
+            len(report.failed),
+            report.total,
         )
-        if not google_firebase_raw:
-            _LOGGER.error("Missing Google_Firebase config from Oasira")
-            return None, None
-        
-        service_account_info = json.loads(google_firebase_raw)
-        private_key = service_account_info["private_key"]
-        client_email = service_account_info["client_email"]
-        project_id = service_account_info.get("project_id")
-        if not project_id:
-            _LOGGER.error("Missing project_id in Firebase service account")
-            return None, None
-
-        now = int(time.time())
-        payload = {
-            "iss": client_email,
-            "scope": "https://www.googleapis.com/auth/firebase.messaging",
-            "aud": "https://oauth2.googleapis.com/token",
-            "iat": now,
-            "exp": now + 3600,
-        }
-
-        signer = rsa.RSASigner.from_string(private_key)
-        assertion = jwt.encode(signer, payload)
-
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://oauth2.googleapis.com/token",
-                data={
-                    "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                    "assertion": assertion,
-                },
-            ) as resp:
-                result = await resp.json()
-                if "access_token" not in result:
-                    _LOGGER.error("Firebase OAuth error: %s", result)
-                    return None, None
-                return result["access_token"], project_id
-    except OasiraAPIError as exc:
-        _LOGGER.error("Failed to fetch Firebase config: %s", exc)
-        return None, None
-    except Exception as exc:
-        _LOGGER.exception("Failed to refresh Firebase access token: %s", exc)
-        return None, None
+        return False
+
+    _LOGGER.info(
+        "Successfully sent notification to %s on %d devices",
+        person_email,
+        len(report.sent),
+    )
+    return True
@@ -9,7 +9,7 @@ import json
 from typing import Optional, List
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET
+from homeassistant.const import SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET, EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.sun import get_astral_event_date
@@ -65,6 +65,7 @@ async def async_setup_entry(
     async_add_entities([VirtualIlluminanceSensor()])
     async_add_entities([HighTemperatureTomorrowSensor()])
     async_add_entities([TimelineSensor()])
+    async_add_entities([CloudHealthSensor()])
 
     # Add OasiraPerson sensors for tracked users
     persons = hass.data.get(DOMAIN, {}).get("persons", [])
@@ -723,6 +724,63 @@ class HighTemperatureTomorrowSensor(SensorEntity, RestoreEntity):
             self._state = forecast[1]["temperature"]
 
 
+class CloudHealthSensor(SensorEntity):
+    """Diagnostic sensor exposing the Oasira cloud circuit breaker state."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def device_info(self):
+        """Return information about the device."""
+        return {
+            "identifiers": {(DOMAIN, NAME)},
+            "name": NAME,
+            "manufacturer": NAME,
+        }
+
+    def __init__(self) -> None:
+        """Initialize the sensor."""
+        self._state = "closed"
+        self._breakers = {}
+
+    @property
+    def unique_id(self) -> str:
+        """Return the unique ID of the sensor."""
+        return "oasira_cloud_health_sensor"
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return "Oasira Cloud Health"
+
+    @property
+    def icon(self) -> str:
+        """Return the icon of the sensor."""
+        if self._state == "open":
+            return "mdi:cloud-off-outline"
+        if self._state == "half_open":
+            return "mdi:cloud-sync-outline"
+        return "mdi:cloud-check-outline"
+
+    @property
+    def state(self):
+        """Return the worst circuit breaker state across endpoints."""
+        return self._state
+
+    @property
+    def extra_state_attributes(self):
+        """Return per-endpoint breaker details."""
+        return {"endpoints": self._breakers}
+
+    def update(self) -> None:
+        """Read breaker state from the shared API client."""
+        api_client = self.hass.data.get(DOMAIN, {}).get("api_client")
+        if api_client is None:
+            return
+        self._state = api_client.cloud_health
+        self._breakers = api_client.breaker_states()
+
+
 class ConfigSensor(SensorEntity, RestoreEntity):
     @property
     def device_info(self):
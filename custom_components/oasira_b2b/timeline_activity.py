@@ -0,0 +1,203 @@
+"""Persisted hourly activity durations for timeline summaries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import math
+from typing import Any, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .history_loader import async_load_history
+from .timeline_summary import (
+    HOUR,
+    LIGHT_DOMAIN,
+    NO_ONE_HOME,
+    RECORDS,
+    SOMEONE_HOME,
+    SUMMARY_DOMAINS,
+    empty_activity,
+    hourly_activity,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTIVITY_STORAGE_KEY = "oasira_timeline_activity"
+ACTIVITY_STORAGE_VERSION = 1
+ACTIVITY_SAVE_DELAY = 60
+
+DAY = 24 * HOUR
+# Days of hourly activity kept, and backfilled from the recorder on first start
+ACTIVITY_RETENTION_DAYS = 35
+# Minute past each hour the rollup runs, giving the recorder time to commit
+ACTIVITY_ROLLUP_MINUTE = 2
+
+
+def summary_entities(hass: HomeAssistant) -> list[str]:
+    """Return the entities summarized when none are requested."""
+    return [
+        state.entity_id
+        for state in hass.states.async_all()
+        if state.entity_id.split(".", 1)[0] in SUMMARY_DOMAINS
+    ]
+
+
+class TimelineActivity:
+    """Light, appliance and presence seconds per entity and UTC hour.
+
+    Each hour the previous complete hour is read from the recorder once and
+    reduced to a few integers per active entity, kept as one 24-slot list
+    per series and UTC day. Summaries over long windows then add up stored
+    hours and only read the partial hours at either edge from the recorder.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the rollups."""
+        self.hass = hass
+        self._store = Store(hass, ACTIVITY_STORAGE_VERSION, ACTIVITY_STORAGE_KEY)
+        # UTC day start -> series name -> seconds for each hour of the day
+        self._days: dict[int, dict[str, list[int]]] = {}
+        # Rolled up hours are [_since, _through)
+        self._since: Optional[int] = None
+        self._through: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._unsub_time: Optional[CALLBACK_TYPE] = None
+
+    async def async_start(self) -> None:
+        """Load stored rollups, catch up and schedule hourly runs."""
+        data = await self._store.async_load()
+        if data:
+            self._since = data["since"]
+            self._through = data["through"]
+            self._days = {int(day): series for day, series in data["days"].items()}
+
+        async def _run(_now: Any) -> None:
+            await self.async_update()
+
+        self._unsub_time = async_track_time_change(
+            self.hass, _run, minute=ACTIVITY_ROLLUP_MINUTE, second=0
+        )
+        self.hass.async_create_background_task(
+            self.async_update(), "oasira_timeline_activity"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop hourly runs and save the rollups."""
+        if self._unsub_time is not None:
+            self._unsub_time()
+            self._unsub_time = None
+        async with self._lock:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_update(self) -> None:
+        """Roll up every complete hour not stored yet, a day at a time."""
+        async with self._lock:
+            try:
+                await self._async_update()
+            except Exception:
+                _LOGGER.exception("Timeline activity rollup failed")
+
+    async def _async_update(self) -> None:
+        target = int(dt_util.utcnow().timestamp()) // HOUR * HOUR
+        oldest = target // DAY * DAY - ACTIVITY_RETENTION_DAYS * DAY
+        if self._through is None or self._through < oldest:
+            self._since = self._through = oldest
+            self._days.clear()
+
+        while self._through < target:
+            chunk_start = self._through
+            chunk_end = min(chunk_start // DAY * DAY + DAY, target)
+            entity_ids = summary_entities(self.hass)
+            if entity_ids:
+                period_start = dt_util.utc_from_timestamp(chunk_start)
+                period_end = dt_util.utc_from_timestamp(chunk_end)
+                history_by_entity = await async_load_history(
+                    self.hass, entity_ids, period_start, period_end
+                )
+                series = await self.hass.async_add_executor_job(
+                    hourly_activity, history_by_entity, period_start, period_end
+                )
+                day = self._days.setdefault(chunk_start // DAY * DAY, {})
+                first = (chunk_start % DAY) // HOUR
+                for name, values in series.items():
+                    if not any(values):
+                        continue
+                    slots = day.setdefault(name, [0] * 24)
+                    slots[first : first + len(values)] = values
+            self._through = chunk_end
+            self._store.async_delay_save(self._data_to_save, ACTIVITY_SAVE_DELAY)
+
+        if self._since < oldest:
+            self._since = oldest
+            for day in [day for day in self._days if day < oldest]:
+                del self._days[day]
+
+    def covered_hours(
+        self, period_start: datetime, period_end: datetime
+    ) -> Optional[tuple[datetime, datetime]]:
+        """Return the whole hours of a period that are rolled up, if any."""
+        if self._through is None:
+            return None
+        first = max(math.ceil(period_start.timestamp() / HOUR) * HOUR, self._since)
+        last = min(int(period_end.timestamp()) // HOUR * HOUR, self._through)
+        if first >= last:
+            return None
+        return dt_util.utc_from_timestamp(first), dt_util.utc_from_timestamp(last)
+
+    def activity_seconds(self, start: datetime, end: datetime) -> dict[str, Any]:
+        """Add up rolled up hours in [start, end), as activity_seconds does.
+
+        Both ends must be whole hours within covered_hours.
+        """
+        activity = empty_activity()
+        per_entity = activity["per_entity"]
+        hour = int(start.timestamp())
+        last = int(end.timestamp())
+        while hour < last:
+            day_start = hour // DAY * DAY
+            first = (hour - day_start) // HOUR
+            count = min((last - hour) // HOUR, 24 - first)
+            lights = [0] * count
+            appliances = [0] * count
+            series = self._days.get(day_start, {})
+            empty = [0] * 24
+            home = series.get(SOMEONE_HOME, empty)[first : first + count]
+            activity["someone_home"] += sum(home)
+            activity["no_one_home"] += sum(
+                series.get(NO_ONE_HOME, empty)[first : first + count]
+            )
+            activity["records"] += sum(series.get(RECORDS, empty)[first : first + count])
+            for name, slots in series.items():
+                if name in (SOMEONE_HOME, NO_ONE_HOME, RECORDS):
+                    continue
+                values = slots[first : first + count]
+                per_entity[name] = per_entity.get(name, 0) + sum(values)
+                totals = lights if name.split(".", 1)[0] == LIGHT_DOMAIN else appliances
+                for index, seconds in enumerate(values):
+                    totals[index] += seconds
+            activity["lights"] += sum(lights)
+            activity["appliances"] += sum(appliances)
+            activity["per_hour"].extend(
+                [hour + index * HOUR, lights[index], appliances[index], home[index]]
+                for index in range(count)
+            )
+            hour += count * HOUR
+        return activity
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "since": self._since,
+            "through": self._through,
+            "days": {str(day): series for day, series in self._days.items()},
+        }
+
+
+def get_timeline_activity(hass: HomeAssistant) -> Optional[TimelineActivity]:
+    """Return the running activity rollups, if started."""
+    return hass.data.get(DOMAIN, {}).get("timeline_activity")
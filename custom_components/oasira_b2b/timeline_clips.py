@@ -0,0 +1,169 @@
+"""Record camera clips to disk and attach them to the timeline."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import os
+from typing import Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .timeline_event import TimelineEvent, get_timeline_manager, poster_path_for
+
+_LOGGER = logging.getLogger(__name__)
+
+CLIP_MEDIA_DIR = "media/clips"
+# How often to check whether the stream recorder finished writing
+CLIP_POLL_INTERVAL = 1.0
+# Extra time allowed after the clip duration for the recorder to finish
+CLIP_FINISH_TIMEOUT = 30
+
+
+@dataclass
+class ClipRecording:
+    """A finished clip on disk."""
+
+    camera_entity_id: str
+    path: str
+    poster_path: Optional[str]
+    duration: int
+    size: int
+
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as file_handle:
+        file_handle.write(data)
+
+
+def _file_size(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+class ClipRecorder:
+    """Record camera clips without touching the disk on the event loop.
+
+    camera.record returns once the stream starts recording; the file is
+    written when the clip ends. The recorder waits for the file to appear
+    and stop growing, polling from the executor, and grabs a poster frame
+    from the camera while the clip is recording. Clips stay on disk and
+    are referenced by path. Each camera records one clip at a time;
+    different cameras record concurrently.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def async_record(
+        self, camera_entity_id: str, camera_name: str, duration: int
+    ) -> ClipRecording:
+        """Record a clip and its poster frame.
+
+        Raises:
+            HomeAssistantError: If the camera is busy or no clip was written
+        """
+        lock = self._locks.setdefault(camera_entity_id, asyncio.Lock())
+        if lock.locked():
+            raise HomeAssistantError(f"{camera_entity_id} is already recording")
+
+        async with lock:
+            timestamp = dt_util.utcnow()
+            clip_dir = self.hass.config.path(
+                CLIP_MEDIA_DIR, camera_name.replace(" ", "_")
+            )
+            path = os.path.join(
+                clip_dir, f"{timestamp.strftime('%Y%m%d-%H%M%S')}_clip.mp4"
+            )
+            await self.hass.async_add_executor_job(
+                lambda: os.makedirs(clip_dir, exist_ok=True)
+            )
+
+            await self.hass.services.async_call(
+                "camera",
+                "record",
+                {
+                    "entity_id": camera_entity_id,
+                    "filename": path,
+                    "duration": duration,
+                    "lookback": 0,
+                },
+                blocking=True,
+            )
+            poster_path = await self._async_save_poster(camera_entity_id, path)
+            size = await self._async_wait_for_clip(path, duration)
+
+        return ClipRecording(camera_entity_id, path, poster_path, duration, size)
+
+    async def _async_save_poster(
+        self, camera_entity_id: str, clip_path: str
+    ) -> Optional[str]:
+        """Save the current camera image next to the clip."""
+        from homeassistant.components.camera import async_get_image
+
+        try:
+            image = await async_get_image(self.hass, camera_entity_id)
+        except HomeAssistantError as err:
+            _LOGGER.debug("No poster frame for %s: %s", camera_entity_id, err)
+            return None
+        poster_path = poster_path_for(clip_path)
+        await self.hass.async_add_executor_job(
+            _write_file, poster_path, image.content
+        )
+        return poster_path
+
+    async def _async_wait_for_clip(self, path: str, duration: int) -> int:
+        """Wait until the clip exists and stops growing; return its size."""
+        deadline = (
+            asyncio.get_running_loop().time() + duration + CLIP_FINISH_TIMEOUT
+        )
+        last_size = None
+        while asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(CLIP_POLL_INTERVAL)
+            size = await self.hass.async_add_executor_job(_file_size, path)
+            if size and size == last_size:
+                return size
+            last_size = size
+        raise HomeAssistantError(f"Camera did not write clip {path}")
+
+    async def async_record_event(
+        self,
+        camera_entity_id: str,
+        camera_name: str,
+        duration: int,
+        event_type: str = "motion",
+        area_id: Optional[str] = None,
+        area_name: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> tuple[ClipRecording, TimelineEvent]:
+        """Record a clip and add a timeline event that references it."""
+        clip = await self.async_record(camera_entity_id, camera_name, duration)
+        manager = await get_timeline_manager(self.hass)
+        event = await manager.create_event(
+            entity_id=camera_entity_id,
+            entity_name=camera_name,
+            event_type=event_type,
+            area_id=area_id,
+            area_name=area_name,
+            description=description,
+            media_path=clip.path,
+        )
+        return clip, event
+
+
+def get_clip_recorder(hass: HomeAssistant) -> ClipRecorder:
+    """Return the shared clip recorder, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    recorder = domain_data.get("clip_recorder")
+    if recorder is None:
+        recorder = ClipRecorder(hass)
+        domain_data["clip_recorder"] = recorder
+    return recorder
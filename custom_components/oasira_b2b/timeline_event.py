@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import logging
+import mimetypes
 import os
 import uuid
-from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List, Any
@@ -15,32 +15,120 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    CONF_TIMELINE_BACKEND,
+    DOMAIN,
+    TIMELINE_BACKEND_LOG,
+    TIMELINE_BACKEND_SQLITE,
+)
+from .timeline_index import (
+    TimelineDayCounts,
+    TimelineIndex,
+    decode_cursor,
+    encode_cursor,
+    search_terms,
+)
+from .timeline_log import TimelineLog
+from .timeline_media import get_media_deriver
+from .timeline_rollups import TimelineRollups
+from .timeline_sqlite import TimelineSQLiteStore
 
 _LOGGER = logging.getLogger(__name__)
 
 TIMELINE_MEDIA_DIR = "www/snapshots"
 TIMELINE_EVENTS_FILE = "timeline_events.json"
-MAX_EVENTS_PER_DAY = 1000
+TIMELINE_RETENTION_DAYS = 30
+# The SQLite backend keeps a longer history on disk and only the most recent
+# days in memory; older events are reached through paged queries
+TIMELINE_SQLITE_RETENTION_DAYS = 365
+TIMELINE_RESIDENT_DAYS = 2
+# Dispatched as (change, events) whenever timeline events change
 SIGNAL_TIMELINE_UPDATED = f"{DOMAIN}_timeline_updated"
+TIMELINE_CHANGE_ADDED = "added"
+TIMELINE_CHANGE_UPDATED = "updated"
+TIMELINE_CHANGE_REMOVED = "removed"
 
 
-@dataclass
+# Camera, area and type names repeat across thousands of events; keep one
+# shared string object per distinct value
+_SHARED_STRINGS: dict[str, str] = {}
+
+
+def _shared(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    return _SHARED_STRINGS.setdefault(value, value)
+
 
 class TimelineEvent:
-    """Represents a simple timeline event."""
-    def __init__(self, event_id: str, timestamp: datetime, event_type: str, camera_entity_id: str, camera_name: str, area_id: str = None, area_name: str = None, description: str = None):
+    """Represents a simple timeline event.
+
+    Events are kept resident for the whole retention window, so the layout
+    is compact: slots instead of a per-instance dict, shared strings for the
+    categorical fields and an epoch float instead of a datetime.
+    """
+
+    __slots__ = (
+        "event_id",
+        "ts",
+        "event_type",
+        "camera_entity_id",
+        "camera_name",
+        "area_id",
+        "area_name",
+        "description",
+        "media_path",
+        "thumbnail_url",
+        "preview_url",
+        "is_reviewed",
+        "is_favorite",
+    )
+
+    def __init__(
+        self,
+        event_id: str,
+        timestamp: datetime | float,
+        event_type: str,
+        camera_entity_id: str,
+        camera_name: str,
+        area_id: str = None,
+        area_name: str = None,
+        description: str = None,
+        media_path: str = None,
+        thumbnail_url: str = None,
+        preview_url: str = None,
+    ) -> None:
         self.event_id = event_id
-        self.timestamp = timestamp
-        self.event_type = event_type
-        self.camera_entity_id = camera_entity_id
-        self.camera_name = camera_name
-        self.area_id = area_id
-        self.area_name = area_name
+        self.ts = (
+            timestamp.timestamp()
+            if isinstance(timestamp, datetime)
+            else round(timestamp, 6)
+        )
+        self.event_type = _shared(event_type)
+        self.camera_entity_id = _shared(camera_entity_id)
+        self.camera_name = _shared(camera_name)
+        self.area_id = _shared(area_id)
+        self.area_name = _shared(area_name)
         self.description = description
+        self.media_path = media_path
+        self.thumbnail_url = thumbnail_url
+        self.preview_url = preview_url
+        self.is_reviewed = False
+        self.is_favorite = False
+
+    @property
+    def timestamp(self) -> datetime:
+        """Return the event time as an aware UTC datetime."""
+        return dt_util.utc_from_timestamp(self.ts)
+
+    def __repr__(self) -> str:
+        return (
+            f"TimelineEvent({self.event_id!r}, {self.timestamp.isoformat()}, "
+            f"{self.event_type!r}, {self.camera_entity_id!r})"
+        )
 
     def to_dict(self) -> dict:
-        return {
+        data = {
             "event_id": self.event_id,
             "timestamp": self.timestamp.isoformat(),
             "event_type": self.event_type,
@@ -50,10 +138,20 @@ class TimelineEvent:
             "area_name": self.area_name,
             "description": self.description,
         }
+        if self.media_path:
+            data["media_path"] = self.media_path
+        if self.thumbnail_url:
+            data["thumbnail_url"] = self.thumbnail_url
+            data["preview_url"] = self.preview_url
+        if self.is_reviewed:
+            data["is_reviewed"] = True
+        if self.is_favorite:
+            data["is_favorite"] = True
+        return data
 
     @classmethod
     def from_dict(cls, data: dict) -> "TimelineEvent":
-        return cls(
+        event = cls(
             event_id=data["event_id"],
             timestamp=datetime.fromisoformat(data["timestamp"]),
             event_type=data["event_type"],
@@ -62,17 +160,41 @@ class TimelineEvent:
             area_id=data.get("area_id"),
             area_name=data.get("area_name"),
             description=data.get("description"),
+            media_path=data.get("media_path"),
+            thumbnail_url=data.get("thumbnail_url"),
+            preview_url=data.get("preview_url"),
         )
+        event.is_reviewed = data.get("is_reviewed", False)
+        event.is_favorite = data.get("is_favorite", False)
+        return event
 
 
 class TimelineManager:
     """Manages timeline events and media storage."""
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self, hass: HomeAssistant, backend: str = TIMELINE_BACKEND_LOG
+    ) -> None:
         """Initialize timeline manager."""
         self.hass = hass
+        self.backend = backend
+        # Pre-segment storage, only read once to migrate it into the log
         self._store = Store(hass, version=1, key=DOMAIN)
-        self._events: List[TimelineEvent] = []
+        self._log = TimelineLog(hass)
+        if backend == TIMELINE_BACKEND_SQLITE:
+            self._repository: TimelineLog | TimelineSQLiteStore = (
+                TimelineSQLiteStore(hass)
+            )
+            self._retention_days = TIMELINE_SQLITE_RETENTION_DAYS
+            self._resident_days = TIMELINE_RESIDENT_DAYS
+        else:
+            self._repository = self._log
+            self._retention_days = TIMELINE_RETENTION_DAYS
+            self._resident_days = TIMELINE_RETENTION_DAYS
+        self._events = TimelineIndex()
+        self._today = TimelineDayCounts()
+        self.rollups = TimelineRollups(hass)
+        self._cleanup_day: Optional[str] = None
         # Save to /config/www/snapshots/<camera_name>/, accessible as /local/snapshots/<camera_name>/
         self._media_dir = Path(hass.config.path(TIMELINE_MEDIA_DIR))
         self._initialized = False
@@ -85,45 +207,119 @@ class TimelineManager:
         # Create media directory
         self._media_dir.mkdir(parents=True, exist_ok=True)
 
-        # Load existing events
-        data = await self._store.async_load()
-        if data and "events" in data:
-            self._events = [
-                TimelineEvent.from_dict(e) for e in data["events"]
-            ]
+        await self._async_migrate()
+
+        # Only the resident window is loaded into memory
+        cutoff = dt_util.utcnow() - timedelta(days=self._resident_days)
+        data = await self._repository.async_load(cutoff)
+        self._events = TimelineIndex(TimelineEvent.from_dict(e) for e in data)
+        self._today.reset(
+            self._events.query(start_date=self._today.day_start, limit=None)
+        )
+        await self._async_load_rollups()
 
         # Clean up old events beyond retention period
-        await self._cleanup_old_events()
+        await self.async_cleanup_old_events()
         self._initialized = True
         _LOGGER.info("TimelineManager initialized with %d events", len(self._events))
 
-    async def _cleanup_old_events(self, retention_days: int = 30) -> None:
-        """Remove events older than retention period."""
-        cutoff = dt_util.utcnow() - timedelta(days=retention_days)
-        original_count = len(self._events)
-        self._events = [e for e in self._events if e.timestamp > cutoff]
-        if original_count > len(self._events):
+    async def _async_migrate(self) -> None:
+        """Copy over events the repository is missing from the other backend.
+
+        Runs on every start, so events written while the other backend was
+        selected are carried over each time the backend is switched. Only
+        events newer than the repository's newest are copied. The legacy
+        store only seeds an empty repository.
+        """
+        newest = await self._repository.async_newest()
+        since = dt_util.utcnow() - timedelta(days=self._retention_days)
+        if newest is not None:
+            since = max(since, newest)
+
+        stored = None
+        if self._repository is self._log:
+            data = await self._async_load_sqlite_since(since)
+        elif await self.hass.async_add_executor_job(self._log.exists):
+            data = await self._log.async_load_since(since)
+        else:
+            data = []
+        if newest is None and not data:
+            stored = await self._store.async_load()
+            data = (stored or {}).get("events", [])
+
+        events = [TimelineEvent.from_dict(e) for e in data]
+        if not events and stored is None:
+            return
+        await self._repository.async_put_many(
+            [(event.to_dict(), event.timestamp) for event in events]
+        )
+        if stored is not None:
+            await self._store.async_remove()
+        if events:
             _LOGGER.info(
-                "Cleaned up %d old timeline events",
-                original_count - len(self._events)
+                "Migrated %d timeline events to the %s backend",
+                len(events),
+                self.backend,
             )
 
-    async def _save_events(self) -> None:
-        """Save events to persistent storage."""
-        data = {
-            "events": [e.to_dict() for e in self._events[-MAX_EVENTS_PER_DAY:]]
-        }
-        await self._store.async_save(data)
-
-    def _notify_timeline_updated(self) -> None:
-        """Notify listeners that timeline data changed."""
-        async_dispatcher_send(self.hass, SIGNAL_TIMELINE_UPDATED)
-
-
-
+    async def _async_load_sqlite_since(self, since: datetime) -> list[dict[str, Any]]:
+        """Return events newer than since from a SQLite backend used before."""
+        store = TimelineSQLiteStore(self.hass)
+        if not await self.hass.async_add_executor_job(store.exists):
+            return []
+        try:
+            return await store.async_load(since)
+        finally:
+            await store.async_close()
+
+    async def _async_load_rollups(self) -> None:
+        """Load the rollups and recount hours that may have missed changes.
+
+        Rollups are saved with a delay, so creates and deletes just before
+        an unclean shutdown can be missing. The resident window is always
+        recounted from memory, and older hours are read back from the
+        database when the stored counts end before it.
+        """
+        if self._repository is self._log:
+            # The log keeps its whole retention period resident
+            self.rollups.rebuild(self._events)
+            return
 
+        stale_from = await self.rollups.async_load()
+        resident_start = dt_util.utcnow() - timedelta(days=self._resident_days)
+        if stale_from is None:
+            cutoff = dt_util.utcnow() - timedelta(days=self._retention_days)
+            data = await self._repository.async_load(cutoff)
+            self.rollups.rebuild(TimelineEvent.from_dict(e) for e in data)
+        elif stale_from < resident_start:
+            data = await self._repository.async_load(
+                stale_from - timedelta(seconds=1)
+            )
+            self.rollups.recount(
+                stale_from, (TimelineEvent.from_dict(e) for e in data)
+            )
+        else:
+            self.rollups.recount(resident_start, self._events)
 
+    async def async_cleanup_old_events(self) -> None:
+        """Remove events older than retention period."""
+        now = dt_util.utcnow()
+        removed = self._events.prune_before(
+            now - timedelta(days=self._resident_days)
+        )
+        await self._repository.async_drop_before(
+            now - timedelta(days=self._retention_days)
+        )
+        self.rollups.prune_before(now - timedelta(days=self._retention_days))
+        self._cleanup_day = now.date().isoformat()
+        if removed:
+            _LOGGER.info("Cleaned up %d old timeline events", len(removed))
 
+    def _notify_timeline_updated(
+        self, change: str, events: List[TimelineEvent]
+    ) -> None:
+        """Notify listeners which events changed and how."""
+        async_dispatcher_send(self.hass, SIGNAL_TIMELINE_UPDATED, change, events)
 
     def get_timeline_for_camera(
         self,
@@ -134,21 +330,13 @@ class TimelineManager:
         limit: int = 100,
     ) -> List[TimelineEvent]:
         """Get timeline events for a specific camera."""
-        filtered = [
-            e for e in self._events
-            if e.camera_entity_id == camera_entity_id
-        ]
-
-        if start_date:
-            filtered = [e for e in filtered if e.timestamp >= start_date]
-        if end_date:
-            filtered = [e for e in filtered if e.timestamp <= end_date]
-        if event_types:
-            filtered = [e for e in filtered if e.event_type in event_types]
-
-        # Sort by timestamp descending
-        filtered.sort(key=lambda e: e.timestamp, reverse=True)
-        return filtered[:limit]
+        return self._events.query(
+            camera_entity_id=camera_entity_id,
+            start_date=start_date,
+            end_date=end_date,
+            event_types=event_types,
+            limit=limit,
+        )
 
     def get_timeline_for_area(
         self,
@@ -159,40 +347,206 @@ class TimelineManager:
         limit: int = 100,
     ) -> List[TimelineEvent]:
         """Get timeline events for a specific area."""
-        filtered = [
-            e for e in self._events if e.area_id == area_id
-        ]
+        return self._events.query(
+            area_id=area_id,
+            start_date=start_date,
+            end_date=end_date,
+            event_types=event_types,
+            limit=limit,
+        )
 
-        if start_date:
-            filtered = [e for e in filtered if e.timestamp >= start_date]
-        if end_date:
-            filtered = [e for e in filtered if e.timestamp <= end_date]
-        if event_types:
-            filtered = [e for e in filtered if e.event_type in event_types]
+    async def async_get_timeline_page(
+        self,
+        camera_entity_id: Optional[str] = None,
+        area_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[TimelineEvent], Optional[str]]:
+        """Get one page of timeline events, newest first.
+
+        Pages are keyset based, so later pages stay cheap and stable while
+        new events arrive. With the SQLite backend pages reach beyond the
+        events held in memory.
+
+        Returns:
+            The events and the cursor for the next page, or None on the last
+            page
+
+        Raises:
+            ValueError: If cursor is malformed
+        """
+        position = decode_cursor(cursor) if cursor else None
+        if self._repository is self._log:
+            events = self._events.query(
+                camera_entity_id=camera_entity_id,
+                area_id=area_id,
+                start_date=start_date,
+                end_date=end_date,
+                event_types=event_types,
+                limit=limit + 1,
+                cursor=position,
+            )
+        else:
+            rows = await self._repository.async_query_page(
+                camera_entity_id=camera_entity_id,
+                area_id=area_id,
+                start_date=start_date,
+                end_date=end_date,
+                event_types=event_types,
+                limit=limit + 1,
+                cursor=position,
+            )
+            events = [
+                self._events.get(row["event_id"]) or TimelineEvent.from_dict(row)
+                for row in rows
+            ]
 
-        filtered.sort(key=lambda e: e.timestamp, reverse=True)
-        return filtered[:limit]
+        next_cursor = encode_cursor(events[limit - 1]) if len(events) > limit else None
+        return events[:limit], next_cursor
+
+    async def async_get_timeline_for_camera(
+        self,
+        camera_entity_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[TimelineEvent], Optional[str]]:
+        """Get one page of timeline events for a specific camera."""
+        return await self.async_get_timeline_page(
+            camera_entity_id=camera_entity_id,
+            start_date=start_date,
+            end_date=end_date,
+            event_types=event_types,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def async_get_timeline_for_area(
+        self,
+        area_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[TimelineEvent], Optional[str]]:
+        """Get one page of timeline events for a specific area."""
+        return await self.async_get_timeline_page(
+            area_id=area_id,
+            start_date=start_date,
+            end_date=end_date,
+            event_types=event_types,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def async_search_timeline(
+        self,
+        query: str,
+        camera_entity_id: Optional[str] = None,
+        area_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[TimelineEvent], Optional[str]]:
+        """Find events matching every word of query, newest first.
+
+        Words are matched against the description, type, camera name and
+        area name of each event.
+
+        Returns:
+            The events and the cursor for the next page, or None on the last
+            page
+
+        Raises:
+            ValueError: If cursor is malformed
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], None
+        position = decode_cursor(cursor) if cursor else None
+        if self._repository is self._log:
+            events = self._events.search(
+                terms,
+                camera_entity_id=camera_entity_id,
+                area_id=area_id,
+                start_date=start_date,
+                end_date=end_date,
+                event_types=event_types,
+                limit=limit + 1,
+                cursor=position,
+            )
+        else:
+            rows = await self._repository.async_search(
+                terms,
+                camera_entity_id=camera_entity_id,
+                area_id=area_id,
+                start_date=start_date,
+                end_date=end_date,
+                event_types=event_types,
+                limit=limit + 1,
+                cursor=position,
+            )
+            events = [
+                self._events.get(row["event_id"]) or TimelineEvent.from_dict(row)
+                for row in rows
+            ]
+
+        next_cursor = encode_cursor(events[limit - 1]) if len(events) > limit else None
+        return events[:limit], next_cursor
 
     def get_recent_events(self, limit: int = 50) -> List[TimelineEvent]:
         """Get most recent timeline events across all cameras."""
-        sorted_events = sorted(self._events, key=lambda e: e.timestamp, reverse=True)
-        return sorted_events[:limit]
+        return self._events.query(limit=limit)
+
+    def count_events_today(
+        self, camera_entity_id: Optional[str] = None, area_id: Optional[str] = None
+    ) -> int:
+        """Return how many events happened today, local time.
+
+        Optionally only for one camera or one area.
+        """
+        return self._today.count(camera_entity_id=camera_entity_id, area_id=area_id)
+
+    def get_event(self, event_id: str) -> Optional[TimelineEvent]:
+        """Get a timeline event by id."""
+        return self._events.get(event_id)
+
+    async def _async_find_event(self, event_id: str) -> Optional[TimelineEvent]:
+        """Return an event, reading it from the database if not resident."""
+        event = self._events.get(event_id)
+        if event is None and self._repository is not self._log:
+            data = await self._repository.async_get(event_id)
+            if data is not None:
+                event = TimelineEvent.from_dict(data)
+        return event
 
-    def mark_event_reviewed(self, event_id: str) -> bool:
+    async def mark_event_reviewed(self, event_id: str) -> bool:
         """Mark an event as reviewed."""
-        for event in self._events:
-            if event.event_id == event_id:
-                event.is_reviewed = True
-                return True
-        return False
-
-    def toggle_event_favorite(self, event_id: str) -> bool:
+        event = await self._async_find_event(event_id)
+        if event is None:
+            return False
+        event.is_reviewed = True
+        await self._repository.async_put(event.to_dict(), event.timestamp)
+        self._notify_timeline_updated(TIMELINE_CHANGE_UPDATED, [event])
+        return True
+
+    async def toggle_event_favorite(self, event_id: str) -> bool:
         """Toggle the favorite status of an event."""
-        for event in self._events:
-            if event.event_id == event_id:
-                event.is_favorite = not event.is_favorite
-                return True
-        return False
+        event = await self._async_find_event(event_id)
+        if event is None:
+            return False
+        event.is_favorite = not event.is_favorite
+        await self._repository.async_put(event.to_dict(), event.timestamp)
+        self._notify_timeline_updated(TIMELINE_CHANGE_UPDATED, [event])
+        return True
 
     async def create_event(
         self,
@@ -202,9 +556,15 @@ class TimelineManager:
         area_id: str = None,
         area_name: str = None,
         description: str = None,
+        media_path: str = None,
     ) -> TimelineEvent:
-        """Create a simple timeline event for any sensor or device."""
-        event_id = str(uuid.uuid4())[:8]
+        """Create a simple timeline event for any sensor or device.
+
+        media_path is the filesystem path of an attached snapshot or clip;
+        it is deleted together with the event if it lies in one of the
+        timeline media folders.
+        """
+        event_id = uuid.uuid4().hex
         timestamp = dt_util.utcnow()
         event = TimelineEvent(
             event_id=event_id,
@@ -215,35 +575,127 @@ class TimelineManager:
             area_id=area_id,
             area_name=area_name,
             description=description,
+            media_path=media_path,
         )
-        self._events.append(event)
-        await self._save_events()
-        self._notify_timeline_updated()
+        if self._cleanup_day != timestamp.date().isoformat():
+            await self.async_cleanup_old_events()
+        self._events.add(event)
+        self._today.add(event)
+        self.rollups.add(event)
+        await self._repository.async_put(event.to_dict(), event.timestamp)
+        self._notify_timeline_updated(TIMELINE_CHANGE_ADDED, [event])
+        if media_path:
+            self.hass.async_create_background_task(
+                self._async_attach_previews(event),
+                f"oasira_timeline_previews_{event_id}",
+            )
         _LOGGER.info(
             "Created timeline event %s for entity %s: %s",
             event_id, entity_name, event_type
         )
         return event
 
+    async def _async_attach_previews(self, event: TimelineEvent) -> None:
+        """Derive a thumbnail and preview of the event's image or poster."""
+        source = event.media_path
+        mime_type, _ = mimetypes.guess_type(source)
+        if mime_type and mime_type.startswith("video/"):
+            source = poster_path_for(source)
+        previews = await get_media_deriver(self.hass).async_derive(source)
+        if previews is None or event.event_id not in self._events:
+            return
+        event.thumbnail_url = previews["thumbnail_url"]
+        event.preview_url = previews["preview_url"]
+        await self._repository.async_put(event.to_dict(), event.timestamp)
+        self._notify_timeline_updated(TIMELINE_CHANGE_UPDATED, [event])
+
     async def delete_event(self, event_id: str) -> bool:
         """Delete a timeline event."""
-        for i, event in enumerate(self._events):
-            if event.event_id == event_id:
-                self._events.pop(i)
-                await self._save_events()
-                self._notify_timeline_updated()
-                return True
-        return False
+        event = self._events.remove(event_id)
+        if event is None:
+            event = await self._async_find_event(event_id)
+        if event is None:
+            return False
+        self._today.remove(event)
+        self.rollups.remove([event])
+        await self._repository.async_delete(event_id, event.timestamp)
+        retention = self.hass.data.get(DOMAIN, {}).get("timeline_retention")
+        if event.media_path and retention is not None:
+            await self.hass.async_add_executor_job(
+                retention.remove_event_media, event.media_path
+            )
+        self._notify_timeline_updated(TIMELINE_CHANGE_REMOVED, [event])
+        return True
+
+    async def async_delete_events_for_media(self, media_paths: set[str]) -> int:
+        """Delete every event whose attached media is in media_paths.
+
+        Used by the retention engine after it evicted media files.
+        """
+        events = [e for e in self._events if e.media_path in media_paths]
+        for event in events:
+            self._events.remove(event.event_id)
+            self._today.remove(event)
+        self.rollups.remove(events)
+        await self._repository.async_delete_many(
+            [(event.event_id, event.timestamp) for event in events]
+        )
+        if self._repository is not self._log:
+            # Events outside the resident window only exist in the database
+            dropped = [
+                TimelineEvent.from_dict(data)
+                for data in await self._repository.async_delete_by_media(media_paths)
+            ]
+            self.rollups.remove(dropped)
+            events.extend(dropped)
+        if events:
+            self._notify_timeline_updated(TIMELINE_CHANGE_REMOVED, events)
+        return len(events)
+
+    async def async_close(self) -> None:
+        """Flush and close the storage backend."""
+        await self.rollups.async_flush()
+        await self._repository.async_close()
+
+
+def poster_path_for(media_path: str) -> str:
+    """Return where the poster frame of a clip is stored."""
+    return f"{os.path.splitext(media_path)[0]}.jpg"
 
 
 # Global timeline manager instance
 _timeline_manager: Optional[TimelineManager] = None
 
 
+def get_timeline_backend(hass: HomeAssistant) -> str:
+    """Return the timeline backend selected in the integration options."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        backend = entry.options.get(CONF_TIMELINE_BACKEND)
+        if backend:
+            return backend
+    return TIMELINE_BACKEND_LOG
+
+
 async def get_timeline_manager(hass: HomeAssistant) -> TimelineManager:
     """Get or create the timeline manager."""
     global _timeline_manager
     if _timeline_manager is None:
-        _timeline_manager = TimelineManager(hass)
+        _timeline_manager = TimelineManager(hass, get_timeline_backend(hass))
         await _timeline_manager.async_initialize()
-    return _timeline_manager
\ No newline at end of file
+    return _timeline_manager
+
+
+async def async_unload_timeline_manager(hass: HomeAssistant) -> None:
+    """Close the timeline manager; the next caller creates a fresh one."""
+    global _timeline_manager
+    manager, _timeline_manager = _timeline_manager, None
+    if manager is not None:
+        await manager.async_close()
+
+
+async def async_apply_timeline_backend(hass: HomeAssistant) -> None:
+    """Recreate the timeline manager if the selected backend changed."""
+    if _timeline_manager is not None and (
+        _timeline_manager.backend != get_timeline_backend(hass)
+    ):
+        await async_unload_timeline_manager(hass)
@@ -0,0 +1,398 @@
+"""Time-sorted in-memory indices for timeline events."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort_right
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+import re
+from typing import TYPE_CHECKING, Optional, List
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .timeline_event import TimelineEvent
+
+
+# Sorts after any real event id, for inclusive upper bounds
+_MAX_ID = "\U0010ffff"
+
+
+def _sort_key(event: TimelineEvent) -> tuple[float, str]:
+    return event.ts, event.event_id
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    {"a", "an", "and", "at", "by", "for", "in", "is", "of", "on", "the", "to", "with"}
+)
+
+
+# Event fields whose words are searchable
+SEARCH_FIELDS = ("description", "event_type", "camera_name", "area_name")
+
+
+def _normalize_term(token: str) -> str:
+    """Fold simple plurals so "packages" finds "package"."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def search_terms(text: Optional[str]) -> set[str]:
+    """Split free text into normalized search terms."""
+    if not text:
+        return set()
+    return {
+        _normalize_term(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if token not in _STOP_WORDS
+    }
+
+
+def event_terms(event: TimelineEvent) -> set[str]:
+    """Return the search terms an event is indexed under."""
+    terms: set[str] = set()
+    for field in SEARCH_FIELDS:
+        terms |= search_terms(getattr(event, field))
+    return terms
+
+
+def encode_cursor(event: TimelineEvent) -> str:
+    """Return an opaque pagination cursor positioned at event."""
+    return f"{event.ts!r}|{event.event_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """Return the (epoch timestamp, event_id) a cursor points at.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    timestamp, separator, event_id = cursor.partition("|")
+    if not separator or not event_id:
+        raise ValueError(f"Invalid timeline cursor: {cursor}")
+    return float(timestamp), event_id
+
+
+class TimelineIndex:
+    """Timeline event store indexed by id, camera, area and search term.
+
+    Every index is a list kept sorted by (timestamp, event_id), so range,
+    recent-N and keyset page queries are a bisect plus a walk over the k
+    matching events instead of a scan and sort of the whole timeline.
+    Search terms map to the ids of the events containing them.
+    """
+
+    def __init__(self, events: Iterable[TimelineEvent] = ()) -> None:
+        """Initialize the index, bulk loading events."""
+        self._by_id: dict[str, TimelineEvent] = {}
+        self._all: List[TimelineEvent] = []
+        self._by_camera: dict[str, List[TimelineEvent]] = {}
+        self._by_area: dict[str, List[TimelineEvent]] = {}
+        self._by_term: dict[str, set[str]] = {}
+
+        # Sort once and append instead of inserting one by one
+        for event in sorted(events, key=_sort_key):
+            if event.event_id in self._by_id:
+                continue
+            self._by_id[event.event_id] = event
+            self._all.append(event)
+            self._by_camera.setdefault(event.camera_entity_id, []).append(event)
+            if event.area_id:
+                self._by_area.setdefault(event.area_id, []).append(event)
+            self._index_terms(event)
+
+    def __len__(self) -> int:
+        """Return the number of events."""
+        return len(self._all)
+
+    def __iter__(self) -> Iterator[TimelineEvent]:
+        """Iterate events oldest first."""
+        return iter(self._all)
+
+    def __contains__(self, event_id: object) -> bool:
+        """Return True if an event with this id is stored."""
+        return event_id in self._by_id
+
+    def get(self, event_id: str) -> Optional[TimelineEvent]:
+        """Return the event with this id."""
+        return self._by_id.get(event_id)
+
+    def add(self, event: TimelineEvent) -> None:
+        """Insert an event, replacing any event with the same id."""
+        if event.event_id in self._by_id:
+            self.remove(event.event_id)
+        self._by_id[event.event_id] = event
+        insort_right(self._all, event, key=_sort_key)
+        insort_right(
+            self._by_camera.setdefault(event.camera_entity_id, []),
+            event,
+            key=_sort_key,
+        )
+        if event.area_id:
+            insort_right(
+                self._by_area.setdefault(event.area_id, []), event, key=_sort_key
+            )
+        self._index_terms(event)
+
+    def _index_terms(self, event: TimelineEvent) -> None:
+        for term in event_terms(event):
+            self._by_term.setdefault(term, set()).add(event.event_id)
+
+    def _unindex_terms(self, event: TimelineEvent) -> None:
+        for term in event_terms(event):
+            ids = self._by_term.get(term)
+            if ids is not None:
+                ids.discard(event.event_id)
+                if not ids:
+                    del self._by_term[term]
+
+    def remove(self, event_id: str) -> Optional[TimelineEvent]:
+        """Remove and return the event with this id."""
+        event = self._by_id.pop(event_id, None)
+        if event is None:
+            return None
+        _remove_sorted(self._all, event)
+        _remove_from_bucket(self._by_camera, event.camera_entity_id, event)
+        if event.area_id:
+            _remove_from_bucket(self._by_area, event.area_id, event)
+        self._unindex_terms(event)
+        return event
+
+    def prune_before(self, cutoff: datetime) -> List[TimelineEvent]:
+        """Remove and return every event at or before cutoff."""
+        cutoff_key = (cutoff.timestamp(), _MAX_ID)
+        index = bisect_right(self._all, cutoff_key, key=_sort_key)
+        if not index:
+            return []
+
+        removed = self._all[:index]
+        del self._all[:index]
+        for event in removed:
+            del self._by_id[event.event_id]
+            self._unindex_terms(event)
+        for buckets in (self._by_camera, self._by_area):
+            for key in list(buckets):
+                bucket = buckets[key]
+                cut = bisect_right(bucket, cutoff_key, key=_sort_key)
+                if cut == len(bucket):
+                    del buckets[key]
+                elif cut:
+                    del bucket[:cut]
+        return removed
+
+    def clear(self) -> None:
+        """Remove all events."""
+        self._by_id.clear()
+        self._all.clear()
+        self._by_camera.clear()
+        self._by_area.clear()
+        self._by_term.clear()
+
+    def tail(self, count: int) -> List[TimelineEvent]:
+        """Return the newest count events, oldest first."""
+        return self._all[-count:] if count > 0 else []
+
+    def query(
+        self,
+        camera_entity_id: Optional[str] = None,
+        area_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[Iterable[str]] = None,
+        limit: Optional[int] = 100,
+        cursor: Optional[tuple[float, str]] = None,
+    ) -> List[TimelineEvent]:
+        """Return matching events, newest first.
+
+        Args:
+            camera_entity_id: Only events for this entity
+            area_id: Only events in this area
+            start_date: Inclusive lower bound
+            end_date: Inclusive upper bound
+            event_types: Only events of these types
+            limit: Maximum number of events; None for no limit
+            cursor: (timestamp, event_id) of the last event of the previous
+                page; only events after it are returned
+        """
+        if camera_entity_id is not None:
+            events = self._by_camera.get(camera_entity_id, [])
+        elif area_id is not None:
+            events = self._by_area.get(area_id, [])
+        else:
+            events = self._all
+
+        lo = (
+            bisect_left(events, (start_date.timestamp(), ""), key=_sort_key)
+            if start_date
+            else 0
+        )
+        hi = (
+            bisect_right(events, (end_date.timestamp(), _MAX_ID), key=_sort_key)
+            if end_date
+            else len(events)
+        )
+        if cursor is not None:
+            hi = min(hi, bisect_left(events, cursor, key=_sort_key))
+
+        check_area = camera_entity_id is not None and area_id is not None
+        types = set(event_types) if event_types else None
+        if not check_area and types is None:
+            if limit is not None:
+                lo = max(lo, hi - limit)
+            return events[lo:hi][::-1]
+
+        result: List[TimelineEvent] = []
+        for position in range(hi - 1, lo - 1, -1):
+            event = events[position]
+            if check_area and event.area_id != area_id:
+                continue
+            if types is not None and event.event_type not in types:
+                continue
+            result.append(event)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def search(
+        self,
+        terms: Iterable[str],
+        camera_entity_id: Optional[str] = None,
+        area_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[Iterable[str]] = None,
+        limit: Optional[int] = 100,
+        cursor: Optional[tuple[float, str]] = None,
+    ) -> List[TimelineEvent]:
+        """Return events containing every term, newest first.
+
+        Terms must already be normalized with search_terms. The other
+        arguments filter like query.
+        """
+        postings = sorted(
+            (self._by_term.get(term, set()) for term in set(terms)), key=len
+        )
+        if not postings or not postings[0]:
+            return []
+        ids = postings[0].intersection(*postings[1:])
+
+        low = start_date.timestamp() if start_date else None
+        high = end_date.timestamp() if end_date else None
+        types = set(event_types) if event_types else None
+        matches = []
+        for event_id in ids:
+            event = self._by_id[event_id]
+            if camera_entity_id is not None and event.camera_entity_id != camera_entity_id:
+                continue
+            if area_id is not None and event.area_id != area_id:
+                continue
+            if types is not None and event.event_type not in types:
+                continue
+            if low is not None and event.ts < low:
+                continue
+            if high is not None and event.ts > high:
+                continue
+            if cursor is not None and _sort_key(event) >= cursor:
+                continue
+            matches.append(event)
+
+        matches.sort(key=_sort_key, reverse=True)
+        return matches[:limit] if limit is not None else matches
+
+
+class TimelineDayCounts:
+    """Running event counts for the current local day.
+
+    Counts are kept in total, per camera and per area, and updated as
+    events are added or removed, so reading them never walks the
+    timeline. They reset themselves on first use after local midnight.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counts."""
+        self._day_start = 0.0
+        self._day_end = 0.0
+        self._total = 0
+        self._by_camera: Counter[str] = Counter()
+        self._by_area: Counter[str] = Counter()
+
+    def _roll(self) -> None:
+        now = dt_util.now()
+        if self._day_start <= now.timestamp() < self._day_end:
+            return
+        start = dt_util.start_of_local_day(now)
+        self._day_start = start.timestamp()
+        self._day_end = dt_util.start_of_local_day(
+            start.date() + timedelta(days=1)
+        ).timestamp()
+        self._total = 0
+        self._by_camera.clear()
+        self._by_area.clear()
+
+    @property
+    def day_start(self) -> datetime:
+        """Return the start of the counted day."""
+        self._roll()
+        return dt_util.utc_from_timestamp(self._day_start)
+
+    def reset(self, events: Iterable[TimelineEvent]) -> None:
+        """Recount from events; those outside today are ignored."""
+        self._day_end = 0.0
+        self._roll()
+        for event in events:
+            self.add(event)
+
+    def add(self, event: TimelineEvent) -> None:
+        """Count an added event."""
+        self._update(event, 1)
+
+    def remove(self, event: TimelineEvent) -> None:
+        """Uncount a removed event."""
+        self._update(event, -1)
+
+    def _update(self, event: TimelineEvent, delta: int) -> None:
+        self._roll()
+        if not self._day_start <= event.ts < self._day_end:
+            return
+        self._total += delta
+        self._by_camera[event.camera_entity_id] += delta
+        if event.area_id:
+            self._by_area[event.area_id] += delta
+
+    def count(
+        self, camera_entity_id: Optional[str] = None, area_id: Optional[str] = None
+    ) -> int:
+        """Return today's event count, optionally for one camera or area."""
+        self._roll()
+        if camera_entity_id is not None:
+            return self._by_camera[camera_entity_id]
+        if area_id is not None:
+            return self._by_area[area_id]
+        return self._total
+
+
+def _remove_sorted(events: List[TimelineEvent], event: TimelineEvent) -> None:
+    """Remove one event, by identity, from a timestamp-sorted list."""
+    key = _sort_key(event)
+    position = bisect_left(events, key, key=_sort_key)
+    while position < len(events) and _sort_key(events[position]) == key:
+        if events[position] is event:
+            del events[position]
+            return
+        position += 1
+
+
+def _remove_from_bucket(
+    buckets: dict[str, List[TimelineEvent]], key: str, event: TimelineEvent
+) -> None:
+    bucket = buckets.get(key)
+    if bucket is None:
+        return
+    _remove_sorted(bucket, event)
+    if not bucket:
+        del buckets[key]
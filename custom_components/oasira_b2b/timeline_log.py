@@ -0,0 +1,272 @@
+"""Append-only, day-segmented persistence for timeline events."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+import json
+import logging
+import os
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMELINE_LOG_DIR = ".storage/oasira_timeline"
+SEGMENT_SUFFIX = ".jsonl"
+
+OP_PUT = "put"
+OP_DELETE = "del"
+
+# Rewrite a segment once it holds this many superseded or deleted records
+COMPACT_MIN_GARBAGE = 100
+
+
+def _segment_name(timestamp: datetime) -> str:
+    """Return the segment (UTC day) an event timestamp belongs to."""
+    return dt_util.as_utc(timestamp).date().isoformat()
+
+
+def _segment_date(filename: str) -> Optional[date]:
+    if not filename.endswith(SEGMENT_SUFFIX):
+        return None
+    try:
+        return date.fromisoformat(filename[: -len(SEGMENT_SUFFIX)])
+    except ValueError:
+        return None
+
+
+def _replay_segment(path: str) -> tuple[dict[str, dict[str, Any]], int]:
+    """Replay one segment; return live events by id and the record count."""
+    events: dict[str, dict[str, Any]] = {}
+    records = 0
+    with open(path, encoding="utf-8") as file_handle:
+        for line_number, line in enumerate(file_handle, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-append can leave a partial last line
+                _LOGGER.warning("Skipping corrupt timeline record %s:%d", path, line_number)
+                continue
+            records += 1
+            if record.get("op") == OP_PUT:
+                event = record["event"]
+                events[event["event_id"]] = event
+            elif record.get("op") == OP_DELETE:
+                events.pop(record.get("event_id"), None)
+    return events, records
+
+
+def _write_segment(path: str, events: list[dict[str, Any]]) -> None:
+    """Atomically replace a segment with put records for events."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file_handle:
+        for event in events:
+            file_handle.write(json.dumps({"op": OP_PUT, "event": event}) + "\n")
+    os.replace(tmp_path, path)
+
+
+class TimelineLog:
+    """Write-ahead log of timeline events, one JSONL file per UTC day.
+
+    Creating, updating or deleting an event appends one line to the segment
+    for the event's day, instead of re-encoding and rewriting the whole
+    timeline. Deletes are tombstones; segments with enough dead records are
+    compacted in place, and whole segments are dropped by retention.
+    Concurrent appends are written together in one executor job.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Optional[str] = None) -> None:
+        """Initialize the log."""
+        self.hass = hass
+        self._dir = directory or hass.config.path(TIMELINE_LOG_DIR)
+        self._lock = asyncio.Lock()
+        self._pending: dict[str, list[str]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._garbage: dict[str, int] = {}
+
+    @property
+    def directory(self) -> str:
+        """Return the segment directory."""
+        return self._dir
+
+    def _path(self, segment: str) -> str:
+        return os.path.join(self._dir, f"{segment}{SEGMENT_SUFFIX}")
+
+    def exists(self) -> bool:
+        """Return True if the log directory has been created."""
+        return os.path.isdir(self._dir)
+
+    async def async_newest(self) -> Optional[datetime]:
+        """Return the timestamp of the newest live event, if any."""
+
+        def _newest() -> Optional[datetime]:
+            if not self.exists():
+                return None
+            for filename in sorted(os.listdir(self._dir), reverse=True):
+                if _segment_date(filename) is None:
+                    continue
+                live, _records = _replay_segment(os.path.join(self._dir, filename))
+                if live:
+                    return max(
+                        datetime.fromisoformat(event["timestamp"])
+                        for event in live.values()
+                    )
+            return None
+
+        async with self._lock:
+            return await self.hass.async_add_executor_job(_newest)
+
+    async def async_load(self, cutoff: datetime) -> list[dict[str, Any]]:
+        """Replay segments newer than cutoff and drop older ones.
+
+        Returns:
+            Serialized live events, oldest segment first
+        """
+        async with self._lock:
+            return await self.hass.async_add_executor_job(self._load, cutoff)
+
+    async def async_load_since(self, since: datetime) -> list[dict[str, Any]]:
+        """Return serialized events newer than since, leaving the log as is."""
+
+        def _load_since() -> list[dict[str, Any]]:
+            since_day = dt_util.as_utc(since).date()
+            events: list[dict[str, Any]] = []
+            for filename in sorted(os.listdir(self._dir)):
+                segment_day = _segment_date(filename)
+                if segment_day is None or segment_day < since_day:
+                    continue
+                live, _records = _replay_segment(os.path.join(self._dir, filename))
+                events.extend(
+                    event
+                    for event in live.values()
+                    if datetime.fromisoformat(event["timestamp"]) > since
+                )
+            return events
+
+        async with self._lock:
+            return await self.hass.async_add_executor_job(_load_since)
+
+    def _load(self, cutoff: datetime) -> list[dict[str, Any]]:
+        os.makedirs(self._dir, exist_ok=True)
+        cutoff_day = dt_util.as_utc(cutoff).date()
+        events: list[dict[str, Any]] = []
+
+        for filename in sorted(os.listdir(self._dir)):
+            segment_day = _segment_date(filename)
+            if segment_day is None:
+                continue
+            path = os.path.join(self._dir, filename)
+            if segment_day < cutoff_day:
+                os.remove(path)
+                continue
+
+            live, records = _replay_segment(path)
+            garbage = records - len(live)
+            if garbage >= COMPACT_MIN_GARBAGE:
+                _write_segment(path, list(live.values()))
+                garbage = 0
+            self._garbage[segment_day.isoformat()] = garbage
+            events.extend(live.values())
+
+        return events
+
+    async def async_put(self, event_data: dict[str, Any], timestamp: datetime) -> None:
+        """Append a created or updated event."""
+        await self._async_append(
+            _segment_name(timestamp), {"op": OP_PUT, "event": event_data}
+        )
+
+    async def async_put_many(
+        self, events: list[tuple[dict[str, Any], datetime]]
+    ) -> None:
+        """Append several events in one write."""
+        for event_data, timestamp in events:
+            self._pending.setdefault(_segment_name(timestamp), []).append(
+                json.dumps({"op": OP_PUT, "event": event_data})
+            )
+        await self._async_flush_pending()
+
+    async def async_delete(self, event_id: str, timestamp: datetime) -> None:
+        """Append a tombstone for a deleted event."""
+        segment = _segment_name(timestamp)
+        # The tombstone and the record it hides are both dead weight
+        self._garbage[segment] = self._garbage.get(segment, 0) + 2
+        await self._async_append(segment, {"op": OP_DELETE, "event_id": event_id})
+
+    async def async_delete_many(self, events: list[tuple[str, datetime]]) -> None:
+        """Append tombstones for several deleted events in one write."""
+        for event_id, timestamp in events:
+            segment = _segment_name(timestamp)
+            self._garbage[segment] = self._garbage.get(segment, 0) + 2
+            self._pending.setdefault(segment, []).append(
+                json.dumps({"op": OP_DELETE, "event_id": event_id})
+            )
+        await self._async_flush_pending()
+
+    async def async_drop_before(self, cutoff: datetime) -> int:
+        """Delete segments for days before cutoff; return how many."""
+        cutoff_day = dt_util.as_utc(cutoff).date()
+
+        def _drop() -> list[str]:
+            dropped = []
+            if not os.path.isdir(self._dir):
+                return dropped
+            for filename in os.listdir(self._dir):
+                segment_day = _segment_date(filename)
+                if segment_day is not None and segment_day < cutoff_day:
+                    os.remove(os.path.join(self._dir, filename))
+                    dropped.append(segment_day.isoformat())
+            return dropped
+
+        async with self._lock:
+            dropped = await self.hass.async_add_executor_job(_drop)
+        for segment in dropped:
+            self._garbage.pop(segment, None)
+        return len(dropped)
+
+    async def async_close(self) -> None:
+        """Wait for queued appends to reach disk."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+
+    async def _async_append(self, segment: str, record: dict[str, Any]) -> None:
+        self._pending.setdefault(segment, []).append(json.dumps(record))
+        await self._async_flush_pending()
+
+    async def _async_flush_pending(self) -> None:
+        """Wait until everything queued so far is on disk."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self.hass.async_create_task(self._async_flush())
+        await asyncio.shield(self._flush_task)
+
+    async def _async_flush(self) -> None:
+        async with self._lock:
+            # Appends queued while a batch is being written join the next one
+            while self._pending:
+                batch, self._pending = self._pending, {}
+                to_compact = [
+                    segment
+                    for segment in batch
+                    if self._garbage.get(segment, 0) >= COMPACT_MIN_GARBAGE
+                ]
+                await self.hass.async_add_executor_job(
+                    self._write_batch, batch, to_compact
+                )
+                for segment in to_compact:
+                    self._garbage[segment] = 0
+
+    def _write_batch(self, batch: dict[str, list[str]], to_compact: list[str]) -> None:
+        os.makedirs(self._dir, exist_ok=True)
+        for segment, lines in batch.items():
+            with open(self._path(segment), "a", encoding="utf-8") as file_handle:
+                file_handle.write("\n".join(lines) + "\n")
+        for segment in to_compact:
+            path = self._path(segment)
+            live, _records = _replay_segment(path)
+            _write_segment(path, list(live.values()))
+            _LOGGER.debug("Compacted timeline segment %s", segment)
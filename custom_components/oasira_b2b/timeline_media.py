@@ -0,0 +1,144 @@
+"""Thumbnails and previews for timeline snapshots and clip posters."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import importlib.util
+import logging
+import multiprocessing
+import os
+import site
+import sys
+from types import ModuleType
+from typing import Optional
+
+try:
+    import PIL
+except ImportError:
+    PIL = None
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DERIVED_MEDIA_DIR = "www/oasira_previews"
+DERIVED_MEDIA_URL = "/local/oasira_previews"
+
+# Decoding and resizing is CPU bound; keep it off the event loop and out of
+# the shared executor, but never use more than a couple of cores for it
+MEDIA_WORKERS = 2
+
+# Workers import the worker module by this top-level name from this
+# directory, so they never import the integration package itself
+_WORKER_MODULE = "oasira_media_worker"
+_WORKER_DIR = os.path.dirname(__file__)
+
+
+def _load_worker_module() -> ModuleType:
+    """Import the worker module under the name the workers will use."""
+    module = sys.modules.get(_WORKER_MODULE)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            _WORKER_MODULE, os.path.join(_WORKER_DIR, f"{_WORKER_MODULE}.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[_WORKER_MODULE] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _start_pool() -> tuple[ProcessPoolExecutor, ModuleType]:
+    """Start the worker processes and wait until they are ready."""
+    worker = _load_worker_module()
+    pool = ProcessPoolExecutor(
+        max_workers=MEDIA_WORKERS,
+        # Forking a threaded process is unsafe
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=site.addsitedir,
+        initargs=(_WORKER_DIR,),
+    )
+    # Spawning interpreters and importing Pillow takes a while; pay for it
+    # now instead of on the first event
+    try:
+        for future in [pool.submit(worker.warm_up) for _ in range(MEDIA_WORKERS)]:
+            future.result()
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    return pool, worker
+
+
+class MediaDeriver:
+    """Create small thumbnails and medium previews of timeline images.
+
+    Work runs in a bounded process pool, started and warmed up in an
+    executor job at setup. Results are cached on disk by content hash, so
+    duplicate or re-submitted images are not decoded again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the deriver."""
+        self.hass = hass
+        self._out_dir = hass.config.path(DERIVED_MEDIA_DIR)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._worker: Optional[ModuleType] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Return True if Pillow is installed."""
+        return PIL is not None
+
+    async def async_start(self) -> None:
+        """Start the worker pool off the event loop, if not running."""
+        if not self.available:
+            return
+        async with self._lock:
+            if self._pool is None:
+                self._pool, self._worker = await self.hass.async_add_executor_job(
+                    _start_pool
+                )
+
+    async def async_derive(self, source: str) -> Optional[dict[str, str]]:
+        """Return thumbnail and preview URLs for an image file.
+
+        Returns None if the image cannot be read or Pillow is missing.
+        """
+        if not self.available:
+            return None
+        loop = asyncio.get_running_loop()
+        try:
+            await self.async_start()
+            names = await loop.run_in_executor(
+                self._pool, self._worker.derive_images, source, self._out_dir
+            )
+        except BrokenProcessPool:
+            _LOGGER.warning("Media worker pool stopped; restarting it")
+            self.shutdown()
+            return None
+        except Exception as err:
+            _LOGGER.debug("Could not derive previews of %s: %s", source, err)
+            return None
+        return {
+            f"{kind}_url": f"{DERIVED_MEDIA_URL}/{name}" for kind, name in names.items()
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def get_media_deriver(hass: HomeAssistant) -> MediaDeriver:
+    """Return the shared media deriver, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    deriver = domain_data.get("media_deriver")
+    if deriver is None:
+        deriver = MediaDeriver(hass)
+        domain_data["media_deriver"] = deriver
+    return deriver
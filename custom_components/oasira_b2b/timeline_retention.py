@@ -0,0 +1,311 @@
+"""Periodic retention and disk quota enforcement for timeline media."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+import os
+import time
+from typing import Any, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import storage
+from homeassistant.helpers.event import async_track_time_interval
+
+from .timeline_clips import CLIP_MEDIA_DIR
+from .timeline_event import (
+    TIMELINE_MEDIA_DIR,
+    TIMELINE_RETENTION_DAYS,
+    get_timeline_manager,
+    poster_path_for,
+)
+from .timeline_media import DERIVED_MEDIA_DIR
+
+_LOGGER = logging.getLogger(__name__)
+
+MEDIA_INDEX_STORAGE_KEY = "oasira_timeline_media"
+MEDIA_INDEX_STORAGE_VERSION = 1
+
+# Snapshot folder written by the camera blueprints; only swept by age, and
+# only when asked to
+BLUEPRINT_SNAPSHOT_DIR = "/media/snapshots"
+
+RETENTION_INTERVAL = timedelta(hours=1)
+MEDIA_RETENTION_DAYS = TIMELINE_RETENTION_DAYS
+MEDIA_QUOTA_BYTES = 10 * 1024**3
+# Files deleted per executor job
+DELETE_BATCH_SIZE = 250
+# Files this recent may still be growing (clips being recorded); re-stat them
+RESTAT_WINDOW = 600
+
+
+def _refresh_tree(
+    dirs: dict[str, dict[str, Any]], root: str, now: float
+) -> None:
+    """Bring the index for root up to date.
+
+    A directory's mtime only changes when entries are added or removed, so
+    directories whose mtime matches the index are not listed again; only
+    their recently written files are re-stat'ed.
+    """
+    visited: set[str] = set()
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        visited.add(path)
+
+        cached = dirs.get(path)
+        if cached is None or cached["mtime_ns"] != mtime_ns:
+            files: dict[str, list[float]] = {}
+            subdirs: list[str] = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files[entry.name] = [stat.st_size, stat.st_mtime]
+            cached = {"mtime_ns": mtime_ns, "files": files, "subdirs": subdirs}
+            dirs[path] = cached
+        else:
+            for name, info in list(cached["files"].items()):
+                if now - info[1] < RESTAT_WINDOW:
+                    try:
+                        stat = os.stat(os.path.join(path, name))
+                    except FileNotFoundError:
+                        del cached["files"][name]
+                        continue
+                    info[0], info[1] = stat.st_size, stat.st_mtime
+
+        stack.extend(cached["subdirs"])
+
+    prefix = root.rstrip(os.sep) + os.sep
+    for path in [p for p in dirs if (p == root or p.startswith(prefix))]:
+        if path not in visited:
+            del dirs[path]
+
+
+def _is_within(path: str, root: str) -> bool:
+    """Return True if path resolves to a location inside root."""
+    real_root = os.path.realpath(root)
+    return os.path.commonpath([os.path.realpath(path), real_root]) == real_root
+
+
+def _delete_batch(
+    dirs: dict[str, dict[str, Any]], paths: list[str]
+) -> list[str]:
+    """Delete files and drop them from the index; return the deleted paths."""
+    deleted = []
+    touched: set[str] = set()
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            _LOGGER.warning("Failed to delete timeline media %s: %s", path, err)
+            continue
+        directory, name = os.path.split(path)
+        cached = dirs.get(directory)
+        if cached is not None:
+            cached["files"].pop(name, None)
+            touched.add(directory)
+        deleted.append(path)
+
+    # Our own deletes changed the directory mtime; record it so the next run
+    # does not list the directory again
+    for directory in touched:
+        try:
+            dirs[directory]["mtime_ns"] = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            dirs.pop(directory, None)
+    return deleted
+
+
+class TimelineRetention:
+    """Enforce age and total-size limits on timeline media and events.
+
+    Keeps an index of media files per directory, persisted between runs,
+    so each run only lists directories that changed. Expired files and,
+    when over quota, the oldest files are deleted in batches on the
+    executor, and the timeline events that reference them are removed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_age_days: int = MEDIA_RETENTION_DAYS,
+        max_bytes: int = MEDIA_QUOTA_BYTES,
+    ) -> None:
+        """Initialize the retention engine."""
+        self.hass = hass
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self._store = storage.Store(
+            hass, MEDIA_INDEX_STORAGE_VERSION, MEDIA_INDEX_STORAGE_KEY
+        )
+        self._dirs: dict[str, dict[str, Any]] = {}
+        self._clip_root = hass.config.path(CLIP_MEDIA_DIR)
+        self._roots = [
+            hass.config.path(TIMELINE_MEDIA_DIR),
+            self._clip_root,
+            hass.config.path(DERIVED_MEDIA_DIR),
+        ]
+        self._lock = asyncio.Lock()
+        self._unsub_interval: Optional[CALLBACK_TYPE] = None
+        self.total_bytes = 0
+        self.file_count = 0
+
+    async def async_start(self) -> None:
+        """Load the media index and schedule periodic runs."""
+        data = await self._store.async_load()
+        self._dirs = (data or {}).get("dirs", {})
+
+        async def _run(_now: Any) -> None:
+            await self.async_run()
+
+        self._unsub_interval = async_track_time_interval(
+            self.hass, _run, RETENTION_INTERVAL
+        )
+        self.hass.async_create_background_task(
+            self.async_run(), "oasira_timeline_retention"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop periodic runs and save the media index."""
+        if self._unsub_interval is not None:
+            self._unsub_interval()
+            self._unsub_interval = None
+        async with self._lock:
+            await self._store.async_save({"dirs": self._dirs})
+
+    def remove_event_media(self, media_path: str) -> None:
+        """Delete the media of a deleted event, if it lives in a media root.
+
+        Files attached from anywhere else are left alone, and only clips
+        recorded by ClipRecorder have a poster frame next to them. The
+        index picks the change up from the directory mtime on the next
+        run. Runs in the executor.
+        """
+        if not any(_is_within(media_path, root) for root in self._roots):
+            _LOGGER.debug("Not deleting media outside the timeline: %s", media_path)
+            return
+        paths = [media_path]
+        poster_path = poster_path_for(media_path)
+        if poster_path != media_path and _is_within(media_path, self._clip_root):
+            paths.append(poster_path)
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as err:
+                _LOGGER.warning("Failed to remove timeline media %s: %s", path, err)
+
+    async def async_run(
+        self, max_age_days: Optional[int] = None, include_snapshots: bool = False
+    ) -> int:
+        """Apply retention now; return the number of media files deleted.
+
+        Args:
+            max_age_days: Override the configured media age limit
+            include_snapshots: Also delete camera blueprint snapshots older
+                than the age limit; they never count towards the quota
+        """
+        async with self._lock:
+            try:
+                return await self._async_run(
+                    self.max_age_days if max_age_days is None else max_age_days,
+                    include_snapshots,
+                )
+            except Exception:
+                _LOGGER.exception("Timeline retention run failed")
+                return 0
+
+    async def _async_run(self, max_age_days: int, include_snapshots: bool) -> int:
+        manager = await get_timeline_manager(self.hass)
+        await manager.async_cleanup_old_events()
+
+        now = time.time()
+
+        def _refresh() -> None:
+            for root in self._roots:
+                _refresh_tree(self._dirs, root, now)
+
+        await self.hass.async_add_executor_job(_refresh)
+
+        # (mtime, size, path), oldest first
+        media = sorted(
+            (info[1], info[0], os.path.join(directory, name))
+            for directory, cached in self._dirs.items()
+            for name, info in cached["files"].items()
+        )
+        total = sum(size for _mtime, size, _path in media)
+
+        cutoff = now - max_age_days * 86400
+        doomed: list[str] = []
+        for mtime, size, path in media:
+            if mtime < cutoff or total > self.max_bytes:
+                doomed.append(path)
+                total -= size
+            else:
+                break
+
+        deleted: list[str] = []
+        for start in range(0, len(doomed), DELETE_BATCH_SIZE):
+            deleted.extend(
+                await self.hass.async_add_executor_job(
+                    _delete_batch, self._dirs, doomed[start : start + DELETE_BATCH_SIZE]
+                )
+            )
+
+        self.total_bytes = total
+        self.file_count = len(media) - len(deleted)
+
+        if include_snapshots:
+            deleted.extend(await self._async_delete_expired_snapshots(cutoff, now))
+
+        if deleted:
+            removed_events = await manager.async_delete_events_for_media(set(deleted))
+            _LOGGER.info(
+                "Timeline retention deleted %d media files and %d events; "
+                "%.1f MiB in use",
+                len(deleted),
+                removed_events,
+                total / 1024**2,
+            )
+
+        self._store.async_delay_save(lambda: {"dirs": self._dirs}, 60)
+        return len(deleted)
+
+    async def _async_delete_expired_snapshots(
+        self, cutoff: float, now: float
+    ) -> list[str]:
+        """Delete blueprint snapshots last modified before cutoff.
+
+        The folder is not part of the persisted index, so it is listed in
+        full each time.
+        """
+        dirs: dict[str, dict[str, Any]] = {}
+        await self.hass.async_add_executor_job(
+            _refresh_tree, dirs, BLUEPRINT_SNAPSHOT_DIR, now
+        )
+        expired = [
+            os.path.join(directory, name)
+            for directory, cached in dirs.items()
+            for name, info in cached["files"].items()
+            if info[1] < cutoff
+        ]
+        deleted: list[str] = []
+        for start in range(0, len(expired), DELETE_BATCH_SIZE):
+            deleted.extend(
+                await self.hass.async_add_executor_job(
+                    _delete_batch, dirs, expired[start : start + DELETE_BATCH_SIZE]
+                )
+            )
+        return deleted
@@ -0,0 +1,214 @@
+"""Hourly timeline event counts for dashboards and AI evaluation."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .timeline_event import TimelineEvent
+
+_LOGGER = logging.getLogger(__name__)
+
+ROLLUP_STORAGE_KEY = "oasira_timeline_rollups"
+ROLLUP_STORAGE_VERSION = 1
+ROLLUP_SAVE_DELAY = 60
+
+INTERVAL_HOUR = "hour"
+INTERVAL_DAY = "day"
+GROUP_AREA = "area"
+GROUP_ENTITY = "entity"
+GROUP_EVENT_TYPE = "event_type"
+GROUP_FIELDS = (GROUP_AREA, GROUP_ENTITY, GROUP_EVENT_TYPE)
+
+# (area_id, entity_id, event_type)
+RollupKey = tuple[Optional[str], str, str]
+
+
+def _hour(ts: float) -> int:
+    return int(ts // 3600) * 3600
+
+
+class TimelineRollups:
+    """Event counts per (hour, area, entity, event_type).
+
+    Updated as events are created and deleted and persisted alongside the
+    timeline, so period aggregates cost one dict walk per hour in range
+    no matter how many raw events the period held. Saves are delayed, so
+    each save records a watermark; hours from the watermark on may have
+    missed changes and are recounted from events on load.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the rollups."""
+        self.hass = hass
+        self._store = Store(hass, ROLLUP_STORAGE_VERSION, ROLLUP_STORAGE_KEY)
+        self._hours: dict[int, Counter[RollupKey]] = {}
+
+    async def async_load(self) -> Optional[datetime]:
+        """Load persisted rollups.
+
+        Returns:
+            Start of the hour from which the counts may be incomplete, or
+            None if no usable rollups were stored
+        """
+        data = await self._store.async_load()
+        if data is None or "watermark" not in data:
+            return None
+        for hour, area_id, entity_id, event_type, count in data.get("rows", []):
+            self._hours.setdefault(hour, Counter())[
+                (area_id, entity_id, event_type)
+            ] = count
+        return dt_util.utc_from_timestamp(_hour(data["watermark"]))
+
+    def rebuild(self, events: Iterable[TimelineEvent]) -> None:
+        """Recount every bucket from events."""
+        self._hours.clear()
+        for event in events:
+            self._update(event, 1)
+        self._schedule_save()
+
+    def recount(self, since: datetime, events: Iterable[TimelineEvent]) -> None:
+        """Recount every whole hour from since on.
+
+        events must hold every event from the first whole hour at or after
+        since; older ones are ignored.
+        """
+        first = math.ceil(since.timestamp() / 3600) * 3600
+        for hour in [hour for hour in self._hours if hour >= first]:
+            del self._hours[hour]
+        for event in events:
+            if event.ts >= first:
+                self._update(event, 1)
+        self._schedule_save()
+
+    def add(self, event: TimelineEvent) -> None:
+        """Count a created event."""
+        self._update(event, 1)
+        self._schedule_save()
+
+    def remove(self, events: Iterable[TimelineEvent]) -> None:
+        """Uncount deleted events."""
+        for event in events:
+            self._update(event, -1)
+        self._schedule_save()
+
+    def prune_before(self, cutoff: datetime) -> None:
+        """Drop hours that ended before cutoff."""
+        limit = _hour(cutoff.timestamp())
+        stale = [hour for hour in self._hours if hour < limit]
+        for hour in stale:
+            del self._hours[hour]
+        if stale:
+            self._schedule_save()
+
+    def _update(self, event: TimelineEvent, delta: int) -> None:
+        hour = _hour(event.ts)
+        key = (event.area_id, event.camera_entity_id, event.event_type)
+        bucket = self._hours.setdefault(hour, Counter())
+        bucket[key] += delta
+        if bucket[key] <= 0:
+            del bucket[key]
+            if not bucket:
+                del self._hours[hour]
+
+    def query(
+        self,
+        start: datetime,
+        end: datetime,
+        interval: str = INTERVAL_HOUR,
+        group_by: Iterable[str] = GROUP_FIELDS,
+        area_id: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        event_types: Optional[Iterable[str]] = None,
+    ) -> list[dict[str, Any]]:
+        """Return event counts per period and group, oldest period first.
+
+        Args:
+            start: Inclusive start; partial hours count whole
+            end: Exclusive end
+            interval: "hour", or "day" for local calendar days
+            group_by: Subset of "area", "entity" and "event_type" to keep
+                apart; the others are summed over
+            area_id: Only events in this area
+            entity_id: Only events for this entity
+            event_types: Only events of these types
+        """
+        fields = [field for field in GROUP_FIELDS if field in set(group_by)]
+        types = set(event_types) if event_types else None
+        first = _hour(start.timestamp())
+        last = end.timestamp()
+
+        totals: Counter[tuple] = Counter()
+        for hour in sorted(h for h in self._hours if first <= h < last):
+            if interval == INTERVAL_DAY:
+                period = dt_util.as_local(dt_util.utc_from_timestamp(hour)).date()
+            else:
+                period = hour
+            for (area, entity, event_type), count in self._hours[hour].items():
+                if area_id is not None and area != area_id:
+                    continue
+                if entity_id is not None and entity != entity_id:
+                    continue
+                if types is not None and event_type not in types:
+                    continue
+                values = {
+                    GROUP_AREA: area,
+                    GROUP_ENTITY: entity,
+                    GROUP_EVENT_TYPE: event_type,
+                }
+                totals[(period, *(values[field] for field in fields))] += count
+
+        rows = []
+        for (period, *values), count in totals.items():
+            row: dict[str, Any] = {
+                "period": (
+                    period.isoformat()
+                    if interval == INTERVAL_DAY
+                    else dt_util.utc_from_timestamp(period).isoformat()
+                )
+            }
+            for field, value in zip(fields, values):
+                row[f"{field}_id" if field != GROUP_EVENT_TYPE else field] = value
+            row["count"] = count
+            rows.append(row)
+        return rows
+
+    def hourly_profile(self, start: datetime, end: datetime) -> dict[int, int]:
+        """Return event counts per local hour of day (0-23) in a period."""
+        first = _hour(start.timestamp())
+        last = end.timestamp()
+        profile: dict[int, int] = {}
+        for hour, bucket in self._hours.items():
+            if first <= hour < last:
+                local_hour = dt_util.as_local(dt_util.utc_from_timestamp(hour)).hour
+                profile[local_hour] = profile.get(local_hour, 0) + sum(
+                    bucket.values()
+                )
+        return dict(sorted(profile.items()))
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, ROLLUP_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "watermark": time.time(),
+            "rows": [
+                [hour, *key, count]
+                for hour, bucket in self._hours.items()
+                for key, count in bucket.items()
+            ]
+        }
+
+    async def async_flush(self) -> None:
+        """Write pending changes now."""
+        await self._store.async_save(self._data_to_save())
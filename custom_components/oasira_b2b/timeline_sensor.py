@@ -10,11 +10,16 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, NAME
-from .timeline_event import SIGNAL_TIMELINE_UPDATED, get_timeline_manager, TimelineEvent
+from .timeline_event import (
+    SIGNAL_TIMELINE_UPDATED,
+    TimelineEvent,
+    get_timeline_manager,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +29,9 @@ class TimelineSensor(SensorEntity, RestoreEntity):
 
     _attr_should_poll = False
     _attr_icon = "mdi:timeline"
+    # The event list and refresh time change on every update; keep them out
+    # of the recorder
+    _unrecorded_attributes = frozenset({"recent_events", "last_update"})
 
     def __init__(self) -> None:
         """Initialize timeline sensor."""
@@ -70,23 +78,35 @@ class TimelineSensor(SensorEntity, RestoreEntity):
                 self._handle_timeline_updated,
             )
         )
+        # Today's count drops back to zero at local midnight
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._handle_timeline_updated, hour=0, minute=0, second=0
+            )
+        )
         # Load recent events on startup
         await self._update_recent_events()
 
     @callback
-    def _handle_timeline_updated(self) -> None:
+    def _handle_timeline_updated(self, *_args) -> None:
         """Refresh when timeline events change."""
         self.hass.async_create_task(self._update_recent_events())
 
     async def _update_recent_events(self) -> None:
-        """Update sensor with recent events."""
+        """Update sensor with recent events.
+
+        Reads the newest events from the time-sorted index and today's
+        count from running counters, so the cost does not grow with the
+        size of the timeline.
+        """
         try:
             manager = await get_timeline_manager(self.hass)
-            recent = manager.get_recent_events(limit=10)
+            recent = manager.get_recent_events(limit=5)
 
             if not recent:
                 self._state = "clear"
                 self._attributes = {}
+                self.async_write_ha_state()
                 return
 
             # State is most recent event type
@@ -96,7 +116,7 @@ class TimelineSensor(SensorEntity, RestoreEntity):
 
             # Build attributes with recent events
             events_data = []
-            for event in recent[:5]:
+            for event in recent:
                 events_data.append({
                     "event_id": event.event_id,
                     "event_type": event.event_type,
@@ -117,7 +137,7 @@ class TimelineSensor(SensorEntity, RestoreEntity):
                 "last_area_name": latest.area_name,
                 "last_description": latest.description,
                 "recent_events": events_data,
-                "total_events_today": len([e for e in recent if e.timestamp.date() == dt_util.utcnow().date()]),
+                "total_events_today": manager.count_events_today(),
                 "last_update": dt_util.utcnow().isoformat(),
             }
             self.async_write_ha_state()
@@ -133,6 +153,8 @@ class TimelineSensor(SensorEntity, RestoreEntity):
 class TimelineCameraSensor(SensorEntity):
     """Sensor for per-camera timeline summary."""
 
+    _attr_should_poll = False
+
     def __init__(self, camera_entity_id: str, camera_name: str, area_id: Optional[str] = None) -> None:
         """Initialize camera timeline sensor."""
         self._camera_entity_id = camera_entity_id
@@ -177,24 +199,50 @@ class TimelineCameraSensor(SensorEntity):
         """Return icon."""
         return "mdi:timeline"
 
+    async def async_added_to_hass(self) -> None:
+        """Follow timeline changes for this camera."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_TIMELINE_UPDATED,
+                self._handle_timeline_updated,
+            )
+        )
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._handle_day_rollover, hour=0, minute=0, second=0
+            )
+        )
+        await self.async_update()
+
+    @callback
+    def _handle_timeline_updated(
+        self, _change: str, events: List[TimelineEvent]
+    ) -> None:
+        """Refresh when one of this camera's events changed."""
+        if any(e.camera_entity_id == self._camera_entity_id for e in events):
+            self.async_schedule_update_ha_state(True)
+
+    @callback
+    def _handle_day_rollover(self, _now) -> None:
+        """Reset today's count at local midnight."""
+        self.async_schedule_update_ha_state(True)
+
     async def async_update(self) -> None:
         """Update sensor."""
         try:
             manager = await get_timeline_manager(self.hass)
-            today = dt_util.utcnow().date()
-            start = dt_util.datetime_to_timestamp(dt_util.start_of_local_day())
-            end = dt_util.datetime_to_timestamp(dt_util.end_of_local_day(start))
-
-            events = manager.get_timeline_for_camera(
+            latest = manager.get_timeline_for_camera(
                 self._camera_entity_id,
-                start_date=dt_util.utc_from_timestamp(start),
-                end_date=dt_util.utc_from_timestamp(end),
-                limit=100
+                start_date=dt_util.start_of_local_day(),
+                limit=1,
             )
 
-            self._today_count = len(events)
-            if events:
-                self._state = events[0].event_type
+            self._today_count = manager.count_events_today(
+                camera_entity_id=self._camera_entity_id
+            )
+            if latest:
+                self._state = latest[0].event_type
             else:
                 self._state = "clear"
 
@@ -203,6 +251,10 @@ class TimelineCameraSensor(SensorEntity):
                 "camera_entity_id": self._camera_entity_id,
                 "area_id": self._area_id,
             }
+            if self._area_id:
+                self._attributes["area_events_today"] = manager.count_events_today(
+                    area_id=self._area_id
+                )
         except Exception as e:
             _LOGGER.error("Failed to update camera timeline sensor: %s", e)
 
@@ -10,11 +10,25 @@ from datetime import datetime, timedelta
 import voluptuous as vol
 
 from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
-from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
 from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
+from .timeline_clips import get_clip_recorder
 from .timeline_event import get_timeline_manager
+from .timeline_rollups import GROUP_FIELDS, INTERVAL_DAY, INTERVAL_HOUR
+from .history_loader import async_load_history
+from .timeline_activity import get_timeline_activity, summary_entities
+from .timeline_summary import (
+    _hours,
+    activity_seconds,
+    format_activity,
+    merge_activity,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -127,51 +141,18 @@ def _resolve_media_path(hass: HomeAssistant, media_path: str) -> str:
     return hass.config.path(normalized_path)
 
 
-async def _record_camera_clip(
-    hass: HomeAssistant,
-    camera_entity_id: str,
-    camera_name: str,
-    duration: int,
-    remove_after_read: bool = True,
-) -> bytes | None:
-    """Record a temporary clip from a camera and return its bytes."""
-    from homeassistant.util import dt as dt_util
-
-    timestamp = dt_util.utcnow()
-    camera_slug = camera_name.replace(" ", "_")
-    video_filename = f"{timestamp.strftime('%Y%m%d-%H%M%S')}_clip.mp4"
-    clip_dir = hass.config.path(f"media/clips/{camera_slug}")
-    os.makedirs(clip_dir, exist_ok=True)
-
-    full_video_path = hass.config.path(f"media/clips/{camera_slug}/{video_filename}")
-
-    await hass.services.async_call(
-        "camera",
-        "record",
-        {
-            "entity_id": camera_entity_id,
-            "filename": full_video_path,
-            "duration": duration,
-            "lookback": 0,
-        },
-        blocking=True,
-    )
-
-    if not os.path.exists(full_video_path):
-        return None
-
-    with open(full_video_path, "rb") as file_handle:
-        video_data = file_handle.read()
-
-    if remove_after_read:
-        try:
-            os.remove(full_video_path)
-        except OSError:
-            _LOGGER.debug("Failed to remove temporary clip: %s", full_video_path)
-
-    return video_data
-
-
+RECORD_VIDEO_CLIP_SCHEMA = vol.Schema({
+    vol.Optional("camera_entity_id"): cv.entity_id,
+    vol.Optional("entity_id"): vol.Any(cv.entity_id, [cv.entity_id]),
+    vol.Optional("duration", default=5): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=300)
+    ),
+    vol.Optional("save_to_timeline", default=True): cv.boolean,
+    vol.Optional("event_type", default="motion"): cv.string,
+    vol.Optional("description"): cv.string,
+    vol.Optional("area_id"): cv.string,
+    vol.Optional("area_name"): cv.string,
+})
 
 CREATE_TIMELINE_EVENT_SCHEMA = vol.Schema({
     vol.Required("entity_id"): cv.string,
@@ -193,6 +174,54 @@ SUMMARIZE_TIMELINE_PERIOD_SCHEMA = vol.Schema({
 })
 
 
+GET_TIMELINE_ROLLUPS_SCHEMA = vol.Schema({
+    vol.Optional("start_time"): cv.string,
+    vol.Optional("end_time"): cv.string,
+    vol.Optional("hours_back", default=24 * 7): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=24 * 365)
+    ),
+    vol.Optional("interval", default=INTERVAL_HOUR): vol.In(
+        [INTERVAL_HOUR, INTERVAL_DAY]
+    ),
+    vol.Optional("group_by", default=list(GROUP_FIELDS)): [vol.In(GROUP_FIELDS)],
+    vol.Optional("area_id"): cv.string,
+    vol.Optional("entity_id"): cv.string,
+    vol.Optional("event_types"): vol.All(cv.ensure_list, [cv.string]),
+})
+
+
+SEARCH_TIMELINE_SCHEMA = vol.Schema({
+    vol.Required("query"): cv.string,
+    vol.Optional("camera_entity_id"): cv.string,
+    vol.Optional("area_id"): cv.string,
+    vol.Optional("event_types"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("start_time"): cv.string,
+    vol.Optional("end_time"): cv.string,
+    vol.Optional("limit", default=50): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=500)
+    ),
+    vol.Optional("cursor"): cv.string,
+})
+
+
+def _area_by_entity(hass: HomeAssistant, entity_ids: list[str]) -> dict[str, str]:
+    """Map entities to their area, directly or through their device."""
+    ent_reg = er.async_get(hass)
+    dev_reg = dr.async_get(hass)
+    areas: dict[str, str] = {}
+    for entity_id in entity_ids:
+        entry = ent_reg.async_get(entity_id)
+        if entry is None:
+            continue
+        area_id = entry.area_id
+        if area_id is None and entry.device_id:
+            device = dev_reg.async_get(entry.device_id)
+            area_id = device.area_id if device else None
+        if area_id:
+            areas[entity_id] = area_id
+    return areas
+
+
 def _parse_service_datetime(value: str | None) -> datetime | None:
     """Parse an ISO datetime from service input and normalize to UTC."""
     if not value:
@@ -208,20 +237,6 @@ def _parse_service_datetime(value: str | None) -> datetime | None:
     return dt_util.as_utc(parsed)
 
 
-def _is_on_state(state: str) -> bool:
-    """Return True when a state should be treated as active/on."""
-    lowered = state.lower()
-    return lowered not in {"off", "idle", "standby", "unavailable", "unknown", "none", "not_home"}
-
-
-def _is_home_state(state: str) -> bool:
-    """Return True when occupancy state indicates someone is home."""
-    return state.lower() in {"home", "on", "present"}
-
-
-def _hours(seconds: float) -> float:
-    """Convert seconds to rounded hours."""
-    return round(seconds / 3600, 2)
 
 async def async_setup_services(hass: HomeAssistant) -> None:
 
@@ -244,6 +259,9 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 area_id=area_id,
                 area_name=area_name,
                 description=description,
+                media_path=(
+                    _resolve_media_path(hass, media_path) if media_path else None
+                ),
             )
             response = {
                 "success": True,
@@ -279,44 +297,36 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         camera_state = hass.states.get(camera_entity_id)
         camera_name = camera_state.name if camera_state else camera_entity_id
 
+        recorder = get_clip_recorder(hass)
         try:
-            from homeassistant.util import dt as dt_util
-
-            timestamp = dt_util.utcnow()
-            video_filename = f"{timestamp.strftime('%Y%m%d-%H%M%S')}_clip.mp4"
-            video_path = f"/media/clips/{camera_name.replace(' ', '_')}/{video_filename}"
-            full_video_path = hass.config.path(video_path.lstrip("/"))
-
-            video_data = await _record_camera_clip(
-                hass,
-                camera_entity_id,
-                camera_name,
-                duration,
-                remove_after_read=False,
-            )
-
             if save_to_timeline:
-                manager = await get_timeline_manager(hass)
-
-                event = await manager.create_motion_event(
-                    camera_entity_id=camera_entity_id,
-                    camera_name=camera_name,
-                    video_clip_data=video_data,
-                    video_duration=duration,
+                clip, event = await recorder.async_record_event(
+                    camera_entity_id,
+                    camera_name,
+                    duration,
+                    event_type=event_type,
                     area_id=area_id,
                     area_name=area_name,
                     description=description,
                 )
-
-                return {"success": True, "event_id": event.event_id, "video_path": video_path}
-
-            return {"success": True, "video_path": video_path}
-
+            else:
+                clip = await recorder.async_record(
+                    camera_entity_id, camera_name, duration
+                )
+                event = None
         except Exception as e:
             _LOGGER.error("Failed to record video clip: %s", e)
             return {"success": False, "error": str(e)}
 
-
+        response = {
+            "success": True,
+            "video_path": clip.path,
+            "poster_path": clip.poster_path,
+            "size": clip.size,
+        }
+        if event is not None:
+            response["event_id"] = event.event_id
+        return response
 
     async def summarize_timeline_period(call: ServiceCall) -> ServiceResponse:
         """Summarize entity activity over a period and compute duration-based insights."""
@@ -336,20 +346,9 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                     "error": "start_time must be before end_time",
                 }
 
-            from homeassistant.components import recorder
-            from homeassistant.components.recorder import history as recorder_history
-
-            appliance_domains = {"switch", "fan", "climate", "humidifier", "dehumidifier", "vacuum", "water_heater"}
-            presence_domains = {"person", "device_tracker"}
-
             # Auto-detect relevant entities if none specified
             if not include_entities:
-                target_domains = {"light"} | appliance_domains | presence_domains
-                include_entities = [
-                    state.entity_id
-                    for state in hass.states.async_all()
-                    if state.entity_id.split(".", 1)[0] in target_domains
-                ]
+                include_entities = summary_entities(hass)
 
             if not include_entities:
                 return {
@@ -367,113 +366,51 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                         "no_one_home_hours": 0.0,
                     },
                     "per_entity_hours": {},
+                    "per_area_hours": {},
+                    "per_hour": [],
                     "events_analyzed": 0,
                 }
 
+            # Complete hours that are already rolled up are not read again
+            windows = [(period_start, period_end)]
+            parts = []
+            rollups = get_timeline_activity(hass)
+            if rollups is not None and not call.data.get("include_entities"):
+                covered = rollups.covered_hours(period_start, period_end)
+                if covered is not None:
+                    parts.append(rollups.activity_seconds(*covered))
+                    windows = [
+                        (window_start, window_end)
+                        for window_start, window_end in (
+                            (period_start, covered[0]),
+                            (covered[1], period_end),
+                        )
+                        if window_start < window_end
+                    ]
+
             _LOGGER.debug(
-                "Querying recorder history for %d entities from %s to %s",
-                len(include_entities), period_start, period_end,
+                "Querying recorder history for %d entities in %s",
+                len(include_entities), windows,
             )
 
-            def _query_history():
-                with recorder.util.session_scope(hass=hass, read_only=True) as session:
-                    return recorder_history.get_significant_states_with_session(
-                        hass,
-                        session,
-                        period_start,
-                        period_end,
-                        include_entities,
-                        None,   # filters
-                        True,   # include_start_time_state
-                        False,  # significant_changes_only
-                        False,  # minimal_response
-                        False,  # no_attributes
-                    )
+            area_by_entity = _area_by_entity(hass, include_entities)
 
-            history_by_entity = await recorder.get_instance(hass).async_add_executor_job(_query_history)
-
-            lights_on_seconds = 0.0
-            appliances_running_seconds = 0.0
-            home_event_changes: list[tuple[datetime, str, str]] = []
-            per_entity_hours: dict[str, dict[str, float]] = {}
-            total_state_records = 0
-
-            for entity_id, states in (history_by_entity or {}).items():
-                if not states:
-                    continue
-                total_state_records += len(states)
-                domain = entity_id.split(".", 1)[0] if "." in entity_id else ""
-                entity_light_seconds = 0.0
-                entity_appliance_seconds = 0.0
-
-                for index, state in enumerate(states):
-                    ts = state.last_changed
-                    next_ts = states[index + 1].last_changed if index + 1 < len(states) else period_end
-                    interval_seconds = (next_ts - ts).total_seconds()
-                    if interval_seconds <= 0:
-                        continue
-
-                    state_val = state.state
-
-                    if domain == "light" and _is_on_state(state_val):
-                        lights_on_seconds += interval_seconds
-                        entity_light_seconds += interval_seconds
-
-                    if domain in appliance_domains and _is_on_state(state_val):
-                        appliances_running_seconds += interval_seconds
-                        entity_appliance_seconds += interval_seconds
-
-                    if domain in presence_domains:
-                        home_event_changes.append((ts, entity_id, state_val))
-
-                if entity_light_seconds or entity_appliance_seconds:
-                    per_entity_hours[entity_id] = {
-                        "light_on_hours": _hours(entity_light_seconds),
-                        "appliance_running_hours": _hours(entity_appliance_seconds),
-                    }
-
-            someone_home_seconds = 0.0
-            no_one_home_seconds = 0.0
-
-            if home_event_changes:
-                home_event_changes.sort(key=lambda item: item[0])
-                home_state_by_entity: dict[str, str] = {}
-                cursor_time = period_start
-
-                for timestamp, entity_id, state_value in home_event_changes:
-                    if timestamp < period_start:
-                        home_state_by_entity[entity_id] = state_value
-                        continue
-                    if timestamp > period_end:
-                        break
-
-                    interval_seconds = (timestamp - cursor_time).total_seconds()
-                    if interval_seconds > 0:
-                        if any(_is_home_state(s) for s in home_state_by_entity.values()):
-                            someone_home_seconds += interval_seconds
-                        else:
-                            no_one_home_seconds += interval_seconds
-
-                    home_state_by_entity[entity_id] = state_value
-                    cursor_time = timestamp
-
-                final_interval_seconds = (period_end - cursor_time).total_seconds()
-                if final_interval_seconds > 0:
-                    if any(_is_home_state(state) for state in home_state_by_entity.values()):
-                        someone_home_seconds += final_interval_seconds
-                    else:
-                        no_one_home_seconds += final_interval_seconds
-
-            period_hours = _hours((period_end - period_start).total_seconds())
-            lights_on_hours = _hours(lights_on_seconds)
-            appliances_running_hours = _hours(appliances_running_seconds)
-            someone_home_hours = _hours(someone_home_seconds)
-            no_one_home_hours = _hours(no_one_home_seconds)
+            for window_start, window_end in windows:
+                history_by_entity = await async_load_history(
+                    hass, include_entities, window_start, window_end
+                )
+                parts.append(
+                    await hass.async_add_executor_job(
+                        activity_seconds, history_by_entity, window_start, window_end
+                    )
+                )
+            result = format_activity(merge_activity(parts), area_by_entity)
+            metrics = result["metrics"]
 
             summary = (
                 f"From {period_start.isoformat()} to {period_end.isoformat()}, "
-                f"lights were on for {lights_on_hours}h, appliances ran for {appliances_running_hours}h, "
-                f"someone was home for {someone_home_hours}h, and no one was home for {no_one_home_hours}h."
+                f"lights were on for {metrics['lights_on_hours']}h, appliances ran for {metrics['appliances_running_hours']}h, "
+                f"someone was home for {metrics['someone_home_hours']}h, and no one was home for {metrics['no_one_home_hours']}h."
             )
 
             return {
@@ -481,22 +418,79 @@ async def async_setup_services(hass: HomeAssistant) -> None:
                 "period": {
                     "start": period_start.isoformat(),
                     "end": period_end.isoformat(),
-                    "hours": period_hours,
+                    "hours": _hours((period_end - period_start).total_seconds()),
                 },
                 "summary": summary,
-                "metrics": {
-                    "lights_on_hours": lights_on_hours,
-                    "appliances_running_hours": appliances_running_hours,
-                    "someone_home_hours": someone_home_hours,
-                    "no_one_home_hours": no_one_home_hours,
-                },
-                "per_entity_hours": per_entity_hours,
-                "events_analyzed": total_state_records,
+                **result,
             }
         except Exception as error:
             _LOGGER.error("Failed to summarize timeline period: %s", error, exc_info=True)
             return {"success": False, "error": str(error)}
 
+    async def get_timeline_rollups(call: ServiceCall) -> ServiceResponse:
+        """Return precomputed timeline event counts per hour or day."""
+        try:
+            start_time = _parse_service_datetime(call.data.get("start_time"))
+            end_time = _parse_service_datetime(call.data.get("end_time"))
+        except vol.Invalid as error:
+            return {"success": False, "error": str(error)}
+
+        period_end = end_time or dt_util.utcnow()
+        period_start = start_time or (
+            period_end - timedelta(hours=call.data["hours_back"])
+        )
+        if period_start >= period_end:
+            return {
+                "success": False,
+                "error": "start_time must be before end_time",
+            }
+
+        manager = await get_timeline_manager(hass)
+        rollups = manager.rollups.query(
+            period_start,
+            period_end,
+            interval=call.data["interval"],
+            group_by=call.data["group_by"],
+            area_id=call.data.get("area_id"),
+            entity_id=call.data.get("entity_id"),
+            event_types=call.data.get("event_types"),
+        )
+        return {
+            "success": True,
+            "period": {
+                "start": period_start.isoformat(),
+                "end": period_end.isoformat(),
+            },
+            "interval": call.data["interval"],
+            "rollups": rollups,
+            "total": sum(row["count"] for row in rollups),
+        }
+
+    async def search_timeline(call: ServiceCall) -> ServiceResponse:
+        """Search timeline events by words in their description and names."""
+        try:
+            start_time = _parse_service_datetime(call.data.get("start_time"))
+            end_time = _parse_service_datetime(call.data.get("end_time"))
+            manager = await get_timeline_manager(hass)
+            events, next_cursor = await manager.async_search_timeline(
+                call.data["query"],
+                camera_entity_id=call.data.get("camera_entity_id"),
+                area_id=call.data.get("area_id"),
+                start_date=start_time,
+                end_date=end_time,
+                event_types=call.data.get("event_types"),
+                limit=call.data["limit"],
+                cursor=call.data.get("cursor"),
+            )
+        except (vol.Invalid, ValueError) as error:
+            return {"success": False, "error": str(error)}
+
+        return {
+            "success": True,
+            "events": [event.to_dict() for event in events],
+            "next_cursor": next_cursor,
+        }
+
     # Register services
     hass.services.async_register(
         DOMAIN,
@@ -504,6 +498,13 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         create_timeline_event,
         CREATE_TIMELINE_EVENT_SCHEMA,
     )
+    hass.services.async_register(
+        DOMAIN,
+        "record_video_clip",
+        record_video_clip,
+        RECORD_VIDEO_CLIP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     hass.services.async_register(
         DOMAIN,
         "summarize_timeline_period",
@@ -511,6 +512,20 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         SUMMARIZE_TIMELINE_PERIOD_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
+    hass.services.async_register(
+        DOMAIN,
+        "get_timeline_rollups",
+        get_timeline_rollups,
+        GET_TIMELINE_ROLLUPS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "search_timeline",
+        search_timeline,
+        SEARCH_TIMELINE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     _LOGGER.info("Timeline services registered")
 
@@ -0,0 +1,381 @@
+"""SQLite timeline repository for large multi-camera deployments."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import json
+import logging
+import os
+import sqlite3
+from typing import Any, Iterable, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .timeline_index import SEARCH_FIELDS, search_terms
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMELINE_DB_FILE = "oasira_timeline.db"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS timeline_events (
+        event_id TEXT PRIMARY KEY,
+        ts REAL NOT NULL,
+        camera_entity_id TEXT,
+        area_id TEXT,
+        event_type TEXT,
+        media_path TEXT,
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_timeline_ts ON timeline_events (ts, event_id)",
+    "CREATE INDEX IF NOT EXISTS ix_timeline_camera_ts "
+    "ON timeline_events (camera_entity_id, ts, event_id)",
+    "CREATE INDEX IF NOT EXISTS ix_timeline_area_ts "
+    "ON timeline_events (area_id, ts, event_id)",
+    "CREATE INDEX IF NOT EXISTS ix_timeline_type_ts "
+    "ON timeline_events (event_type, ts, event_id)",
+    "CREATE INDEX IF NOT EXISTS ix_timeline_media "
+    "ON timeline_events (media_path) WHERE media_path IS NOT NULL",
+    # Inverted index: search term -> event ids
+    """
+    CREATE TABLE IF NOT EXISTS timeline_terms (
+        term TEXT NOT NULL,
+        event_id TEXT NOT NULL,
+        PRIMARY KEY (term, event_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_timeline_terms_event "
+    "ON timeline_terms (event_id)",
+)
+
+_UPSERT = (
+    "INSERT OR REPLACE INTO timeline_events "
+    "(event_id, ts, camera_entity_id, area_id, event_type, media_path, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+_DELETE_TERMS = "DELETE FROM timeline_terms WHERE event_id = ?"
+_INSERT_TERM = "INSERT OR IGNORE INTO timeline_terms (term, event_id) VALUES (?, ?)"
+
+
+def _term_rows(event_data: dict[str, Any]) -> list[tuple[str, str]]:
+    terms: set[str] = set()
+    for field in SEARCH_FIELDS:
+        terms |= search_terms(event_data.get(field))
+    return [(term, event_data["event_id"]) for term in terms]
+
+
+def _filters(
+    camera_entity_id: Optional[str],
+    area_id: Optional[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    event_types: Optional[Iterable[str]],
+    cursor: Optional[tuple[float, str]],
+) -> tuple[list[str], list[Any]]:
+    """Return WHERE clauses and parameters for the common event filters."""
+    clauses: list[str] = []
+    params: list[Any] = []
+    if camera_entity_id is not None:
+        clauses.append("camera_entity_id = ?")
+        params.append(camera_entity_id)
+    if area_id is not None:
+        clauses.append("area_id = ?")
+        params.append(area_id)
+    if start_date is not None:
+        clauses.append("ts >= ?")
+        params.append(start_date.timestamp())
+    if end_date is not None:
+        clauses.append("ts <= ?")
+        params.append(end_date.timestamp())
+    if event_types:
+        types = list(event_types)
+        clauses.append(f"event_type IN ({', '.join('?' * len(types))})")
+        params.extend(types)
+    if cursor is not None:
+        clauses.append("(ts < ? OR (ts = ? AND event_id < ?))")
+        params.extend((cursor[0], cursor[0], cursor[1]))
+    return clauses, params
+
+
+def _row(event_data: dict[str, Any], timestamp: datetime) -> tuple:
+    return (
+        event_data["event_id"],
+        timestamp.timestamp(),
+        event_data.get("camera_entity_id"),
+        event_data.get("area_id"),
+        event_data.get("event_type"),
+        event_data.get("media_path"),
+        json.dumps(event_data),
+    )
+
+
+def _backfill_terms(conn: sqlite3.Connection) -> None:
+    """Index events written before the terms table existed."""
+    if conn.execute("SELECT 1 FROM timeline_terms LIMIT 1").fetchone():
+        return
+    for (data,) in conn.execute("SELECT data FROM timeline_events"):
+        conn.executemany(_INSERT_TERM, _term_rows(json.loads(data)))
+
+
+class TimelineSQLiteStore:
+    """Timeline events in a dedicated SQLite database.
+
+    Uses WAL mode with composite (column, ts, event_id) indexes, so camera,
+    area and type range queries and keyset pagination never scan the whole
+    table. Every statement runs on an executor thread; a lock keeps the
+    single connection to one statement at a time.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Optional[str] = None) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._path = path or hass.config.path(TIMELINE_DB_FILE)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def _async_run(self, func, *args) -> Any:
+        async with self._lock:
+            return await self.hass.async_add_executor_job(func, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                _backfill_terms(conn)
+            self._conn = conn
+        return self._conn
+
+    def exists(self) -> bool:
+        """Return True if the database file has been created."""
+        return os.path.isfile(self._path)
+
+    async def async_newest(self) -> Optional[datetime]:
+        """Return the timestamp of the newest event, if any."""
+
+        def _newest() -> Optional[float]:
+            (newest,) = self._connection().execute(
+                "SELECT MAX(ts) FROM timeline_events"
+            ).fetchone()
+            return newest
+
+        newest = await self._async_run(_newest)
+        return None if newest is None else dt_util.utc_from_timestamp(newest)
+
+    async def async_load(self, cutoff: datetime) -> list[dict[str, Any]]:
+        """Return serialized events newer than cutoff, oldest first."""
+
+        def _load() -> list[dict[str, Any]]:
+            rows = self._connection().execute(
+                "SELECT data FROM timeline_events WHERE ts > ? ORDER BY ts, event_id",
+                (cutoff.timestamp(),),
+            )
+            return [json.loads(data) for (data,) in rows]
+
+        return await self._async_run(_load)
+
+    async def async_get(self, event_id: str) -> Optional[dict[str, Any]]:
+        """Return a serialized event, or None if there is none with that id."""
+
+        def _get() -> Optional[dict[str, Any]]:
+            row = self._connection().execute(
+                "SELECT data FROM timeline_events WHERE event_id = ?", (event_id,)
+            ).fetchone()
+            return None if row is None else json.loads(row[0])
+
+        return await self._async_run(_get)
+
+    async def async_put(self, event_data: dict[str, Any], timestamp: datetime) -> None:
+        """Insert or replace an event."""
+        await self.async_put_many([(event_data, timestamp)])
+
+    async def async_put_many(
+        self, events: Iterable[tuple[dict[str, Any], datetime]]
+    ) -> None:
+        """Insert or replace several events in one transaction."""
+        events = list(events)
+        rows = [_row(event_data, timestamp) for event_data, timestamp in events]
+        if not rows:
+            return
+        term_rows = [
+            term_row
+            for event_data, _timestamp in events
+            for term_row in _term_rows(event_data)
+        ]
+
+        def _put() -> None:
+            conn = self._connection()
+            with conn:
+                conn.executemany(_DELETE_TERMS, [(row[0],) for row in rows])
+                conn.executemany(_UPSERT, rows)
+                conn.executemany(_INSERT_TERM, term_rows)
+
+        await self._async_run(_put)
+
+    async def async_delete(self, event_id: str, timestamp: datetime) -> None:
+        """Delete an event."""
+
+        def _delete() -> None:
+            conn = self._connection()
+            with conn:
+                conn.execute(_DELETE_TERMS, (event_id,))
+                conn.execute(
+                    "DELETE FROM timeline_events WHERE event_id = ?", (event_id,)
+                )
+
+        await self._async_run(_delete)
+
+    async def async_delete_many(self, events: list[tuple[str, datetime]]) -> None:
+        """Delete several events in one transaction."""
+        if not events:
+            return
+
+        ids = [(event_id,) for event_id, _timestamp in events]
+
+        def _delete() -> None:
+            conn = self._connection()
+            with conn:
+                conn.executemany(_DELETE_TERMS, ids)
+                conn.executemany(
+                    "DELETE FROM timeline_events WHERE event_id = ?", ids
+                )
+
+        await self._async_run(_delete)
+
+    async def async_delete_by_media(
+        self, media_paths: Iterable[str]
+    ) -> list[dict[str, Any]]:
+        """Delete events whose attached media is in media_paths.
+
+        Returns the deleted events, serialized.
+        """
+        paths = [(path,) for path in media_paths]
+        if not paths:
+            return []
+
+        def _delete() -> list[dict[str, Any]]:
+            conn = self._connection()
+            with conn:
+                deleted = [
+                    json.loads(data)
+                    for path in paths
+                    for (data,) in conn.execute(
+                        "SELECT data FROM timeline_events WHERE media_path = ?", path
+                    )
+                ]
+                conn.executemany(
+                    "DELETE FROM timeline_terms WHERE event_id IN "
+                    "(SELECT event_id FROM timeline_events WHERE media_path = ?)",
+                    paths,
+                )
+                conn.executemany(
+                    "DELETE FROM timeline_events WHERE media_path = ?",
+                    paths,
+                )
+            return deleted
+
+        return await self._async_run(_delete)
+
+    async def async_drop_before(self, cutoff: datetime) -> int:
+        """Delete events at or before cutoff; return how many."""
+
+        def _drop() -> int:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "DELETE FROM timeline_terms WHERE event_id IN "
+                    "(SELECT event_id FROM timeline_events WHERE ts <= ?)",
+                    (cutoff.timestamp(),),
+                )
+                cursor = conn.execute(
+                    "DELETE FROM timeline_events WHERE ts <= ?", (cutoff.timestamp(),)
+                )
+            return cursor.rowcount
+
+        return await self._async_run(_drop)
+
+    async def async_query_page(
+        self,
+        camera_entity_id: Optional[str] = None,
+        area_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[Iterable[str]] = None,
+        limit: int = 100,
+        cursor: Optional[tuple[float, str]] = None,
+    ) -> list[dict[str, Any]]:
+        """Return one page of serialized events, newest first.
+
+        Args:
+            cursor: (timestamp, event_id) of the last event of the previous
+                page; the page starts strictly after it
+        """
+        clauses, params = _filters(
+            camera_entity_id, area_id, start_date, end_date, event_types, cursor
+        )
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT data FROM timeline_events {where} "
+            "ORDER BY ts DESC, event_id DESC LIMIT ?"
+        )
+        params.append(limit)
+
+        def _query() -> list[dict[str, Any]]:
+            rows = self._connection().execute(sql, params)
+            return [json.loads(data) for (data,) in rows]
+
+        return await self._async_run(_query)
+
+    async def async_search(
+        self,
+        terms: Iterable[str],
+        camera_entity_id: Optional[str] = None,
+        area_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        event_types: Optional[Iterable[str]] = None,
+        limit: int = 100,
+        cursor: Optional[tuple[float, str]] = None,
+    ) -> list[dict[str, Any]]:
+        """Return serialized events containing every term, newest first."""
+        terms = sorted(set(terms))
+        if not terms:
+            return []
+        clauses, params = _filters(
+            camera_entity_id, area_id, start_date, end_date, event_types, cursor
+        )
+        postings = " INTERSECT ".join(
+            "SELECT event_id FROM timeline_terms WHERE term = ?" for _ in terms
+        )
+        clauses.insert(0, f"event_id IN ({postings})")
+        params[:0] = terms
+        sql = (
+            f"SELECT data FROM timeline_events WHERE {' AND '.join(clauses)} "
+            "ORDER BY ts DESC, event_id DESC LIMIT ?"
+        )
+        params.append(limit)
+
+        def _search() -> list[dict[str, Any]]:
+            rows = self._connection().execute(sql, params)
+            return [json.loads(data) for (data,) in rows]
+
+        return await self._async_run(_search)
+
+    async def async_close(self) -> None:
+        """Close the database connection."""
+
+        def _close() -> None:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        await self._async_run(_close)
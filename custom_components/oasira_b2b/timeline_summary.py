@@ -0,0 +1,414 @@
+"""Sweep-line duration metrics for summarize_timeline_period."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from itertools import accumulate
+import math
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .history_loader import StateHistory
+
+LIGHT_DOMAIN = "light"
+APPLIANCE_DOMAINS = {
+    "switch",
+    "fan",
+    "climate",
+    "humidifier",
+    "dehumidifier",
+    "vacuum",
+    "water_heater",
+}
+PRESENCE_DOMAINS = {"person", "device_tracker"}
+SUMMARY_DOMAINS = {LIGHT_DOMAIN} | APPLIANCE_DOMAINS | PRESENCE_DOMAINS
+
+HOUR = 3600
+
+# Hourly series that are not entity ids
+SOMEONE_HOME = "_someone_home"
+NO_ONE_HOME = "_no_one_home"
+RECORDS = "_records"
+
+
+def _is_on_state(state: str) -> bool:
+    """Return True when a state should be treated as active/on."""
+    lowered = state.lower()
+    return lowered not in {"off", "idle", "standby", "unavailable", "unknown", "none", "not_home"}
+
+
+def _is_home_state(state: str) -> bool:
+    """Return True when occupancy state indicates someone is home."""
+    return state.lower() in {"home", "on", "present"}
+
+
+def _hours(seconds: float) -> float:
+    """Convert seconds to rounded hours."""
+    return round(float(seconds) / 3600, 2)
+
+
+def _active_spans(
+    changes: Iterable[tuple[float, str]],
+    start: float,
+    end: float,
+    is_active: Callable[[str], bool],
+) -> tuple[list[float], list[float]]:
+    """Return the spans an entity was active, in seconds from start.
+
+    Consecutive active states merge into one span; spans are clipped to
+    the period. Offsets keep the prefix sums in _Spans precise.
+    """
+    starts: list[float] = []
+    ends: list[float] = []
+    opened: Optional[float] = None
+    end -= start
+    for changed, state in changes:
+        ts = max(changed - start, 0.0)
+        if ts >= end:
+            break
+        if is_active(state):
+            if opened is None:
+                opened = ts
+        elif opened is not None:
+            if ts > opened:
+                starts.append(opened)
+                ends.append(ts)
+            opened = None
+    if opened is not None:
+        starts.append(opened)
+        ends.append(end)
+    return starts, ends
+
+
+class _Spans:
+    """Possibly overlapping spans, queried for active time before t.
+
+    Active time before t is the sum of max(0, t - start) minus the sum of
+    max(0, t - end); with sorted starts, sorted ends and their prefix sums
+    each term is one binary search, so any number of bin edges is answered
+    in O((spans + edges) log spans).
+    """
+
+    def __init__(self, starts: Sequence[float], ends: Sequence[float]) -> None:
+        if np is not None:
+            self._starts = np.sort(np.asarray(starts, dtype=float))
+            self._ends = np.sort(np.asarray(ends, dtype=float))
+            self._start_sums = np.concatenate(([0.0], np.cumsum(self._starts)))
+            self._end_sums = np.concatenate(([0.0], np.cumsum(self._ends)))
+        else:
+            self._starts = sorted(starts)
+            self._ends = sorted(ends)
+            self._start_sums = list(accumulate(self._starts, initial=0.0))
+            self._end_sums = list(accumulate(self._ends, initial=0.0))
+
+    @property
+    def total(self) -> float:
+        """Return the summed length of all spans."""
+        return float(self._end_sums[-1] - self._start_sums[-1])
+
+    def per_bin(self, edges: Sequence[float]) -> list[float]:
+        """Return the active time inside each [edges[i], edges[i + 1])."""
+        if np is not None:
+            times = np.asarray(edges, dtype=float)
+            started = np.searchsorted(self._starts, times, side="right")
+            ended = np.searchsorted(self._ends, times, side="right")
+            before = (started * times - self._start_sums[started]) - (
+                ended * times - self._end_sums[ended]
+            )
+            return np.diff(before).tolist()
+
+        before = []
+        for t in edges:
+            started = bisect_right(self._starts, t)
+            ended = bisect_right(self._ends, t)
+            before.append(
+                (started * t - self._start_sums[started])
+                - (ended * t - self._end_sums[ended])
+            )
+        return [b - a for a, b in zip(before, before[1:])]
+
+
+def _union(starts: Sequence[float], ends: Sequence[float]) -> _Spans:
+    """Merge overlapping spans with a running count of open spans."""
+    if not starts:
+        return _Spans([], [])
+    if np is not None:
+        times = np.concatenate((starts, ends))
+        deltas = np.concatenate((np.ones(len(starts)), -np.ones(len(ends))))
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        active = np.cumsum(deltas[order]) > 0
+        was_active = np.concatenate(([False], active[:-1]))
+        return _Spans(times[active & ~was_active], times[~active & was_active])
+
+    merged_starts: list[float] = []
+    merged_ends: list[float] = []
+    count = 0
+    for ts, delta in sorted(
+        [(t, 1) for t in starts] + [(t, -1) for t in ends]
+    ):
+        if delta > 0 and count == 0:
+            merged_starts.append(ts)
+        count += delta
+        if count == 0:
+            merged_ends.append(ts)
+    return _Spans(merged_starts, merged_ends)
+
+
+def _hour_edges(start: float, end: float) -> list[float]:
+    """Return the period start, every hour boundary inside it and its end."""
+    edges = [start]
+    boundary = (math.floor(start / HOUR) + 1) * HOUR
+    while boundary < end:
+        edges.append(float(boundary))
+        boundary += HOUR
+    edges.append(end)
+    return edges
+
+
+def _metric_for(entity_id: str) -> Optional[str]:
+    """Return the per-entity metric an entity contributes to, if any."""
+    domain = entity_id.split(".", 1)[0]
+    if domain == LIGHT_DOMAIN:
+        return "light_on_hours"
+    if domain in APPLIANCE_DOMAINS:
+        return "appliance_running_hours"
+    return None
+
+
+def empty_activity() -> dict[str, Any]:
+    """Return activity seconds for a period without any data."""
+    return {
+        "lights": 0.0,
+        "appliances": 0.0,
+        "someone_home": 0.0,
+        "no_one_home": 0.0,
+        "per_entity": {},
+        "per_hour": [],
+        "records": 0,
+    }
+
+
+def activity_seconds(
+    history_by_entity: dict[str, StateHistory],
+    period_start: datetime,
+    period_end: datetime,
+) -> dict[str, Any]:
+    """Compute light, appliance and presence seconds for a period.
+
+    Each entity's history is walked once to turn it into active spans.
+    Totals and hourly breakdowns then come from sorted span boundaries,
+    and presence from one sweep over all people with a running count of
+    who is home, instead of re-checking every person at every change.
+    The result is unrounded so periods can be merged with merge_activity.
+    """
+    start = period_start.timestamp()
+    end = period_end.timestamp()
+
+    light_starts: list[float] = []
+    light_ends: list[float] = []
+    appliance_starts: list[float] = []
+    appliance_ends: list[float] = []
+    home_starts: list[float] = []
+    home_ends: list[float] = []
+    has_presence = False
+    per_entity: dict[str, float] = {}
+    total_state_records = 0
+
+    for entity_id, history in (history_by_entity or {}).items():
+        if not history:
+            continue
+        total_state_records += len(history)
+
+        if entity_id.split(".", 1)[0] in PRESENCE_DOMAINS:
+            has_presence = True
+            starts, ends = _active_spans(history, start, end, _is_home_state)
+            home_starts.extend(starts)
+            home_ends.extend(ends)
+            continue
+
+        metric = _metric_for(entity_id)
+        if metric is None:
+            continue
+        starts, ends = _active_spans(history, start, end, _is_on_state)
+        if metric == "light_on_hours":
+            light_starts.extend(starts)
+            light_ends.extend(ends)
+        else:
+            appliance_starts.extend(starts)
+            appliance_ends.extend(ends)
+        seconds = sum(ends) - sum(starts)
+        if seconds:
+            per_entity[entity_id] = seconds
+
+    lights = _Spans(light_starts, light_ends)
+    appliances = _Spans(appliance_starts, appliance_ends)
+    someone_home = _union(home_starts, home_ends)
+    someone_home_seconds = someone_home.total
+    # Without any presence data nobody is known to be home or away
+    no_one_home_seconds = (end - start - someone_home_seconds) if has_presence else 0.0
+
+    edges = [edge - start for edge in _hour_edges(start, end)]
+    per_hour = [
+        [start + hour_start, light_seconds, appliance_seconds, home_seconds]
+        for hour_start, light_seconds, appliance_seconds, home_seconds in zip(
+            edges,
+            lights.per_bin(edges),
+            appliances.per_bin(edges),
+            someone_home.per_bin(edges),
+        )
+    ]
+
+    return {
+        "lights": lights.total,
+        "appliances": appliances.total,
+        "someone_home": someone_home_seconds,
+        "no_one_home": no_one_home_seconds,
+        "per_entity": per_entity,
+        "per_hour": per_hour,
+        "records": total_state_records,
+    }
+
+
+def hourly_activity(
+    history_by_entity: dict[str, StateHistory],
+    period_start: datetime,
+    period_end: datetime,
+) -> dict[str, list[int]]:
+    """Return whole seconds of activity per hour for an hour-aligned period.
+
+    Lights and appliances get one series per entity that was active at all;
+    SOMEONE_HOME, NO_ONE_HOME and RECORDS hold presence and the number of
+    state rows read, so rollups of these series add up to activity_seconds.
+    """
+    start = period_start.timestamp()
+    end = period_end.timestamp()
+    hours = round((end - start) / HOUR)
+    edges = [float(hour * HOUR) for hour in range(hours + 1)]
+
+    series: dict[str, list[int]] = {}
+    records = [0] * hours
+    home_starts: list[float] = []
+    home_ends: list[float] = []
+    has_presence = False
+
+    for entity_id, history in (history_by_entity or {}).items():
+        if not history:
+            continue
+        for changed in history.timestamps:
+            # Skip the state carried in from before the period, so adjacent
+            # periods do not count it again
+            offset = changed - start
+            if 0 < offset < end - start:
+                records[int(offset // HOUR)] += 1
+
+        if entity_id.split(".", 1)[0] in PRESENCE_DOMAINS:
+            has_presence = True
+            starts, ends = _active_spans(history, start, end, _is_home_state)
+            home_starts.extend(starts)
+            home_ends.extend(ends)
+            continue
+
+        if _metric_for(entity_id) is None:
+            continue
+        starts, ends = _active_spans(history, start, end, _is_on_state)
+        if starts:
+            series[entity_id] = [
+                round(seconds) for seconds in _Spans(starts, ends).per_bin(edges)
+            ]
+
+    someone_home = [
+        round(seconds) for seconds in _union(home_starts, home_ends).per_bin(edges)
+    ]
+    series[SOMEONE_HOME] = someone_home
+    series[NO_ONE_HOME] = (
+        [HOUR - seconds for seconds in someone_home] if has_presence else [0] * hours
+    )
+    series[RECORDS] = records
+    return series
+
+
+def merge_activity(parts: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Add up activity seconds of adjacent periods."""
+    merged = empty_activity()
+    for part in parts:
+        for key in ("lights", "appliances", "someone_home", "no_one_home", "records"):
+            merged[key] += part[key]
+        for entity_id, seconds in part["per_entity"].items():
+            merged["per_entity"][entity_id] = (
+                merged["per_entity"].get(entity_id, 0.0) + seconds
+            )
+        merged["per_hour"].extend(part["per_hour"])
+    merged["per_hour"].sort(key=lambda row: row[0])
+    return merged
+
+
+def format_activity(
+    activity: dict[str, Any], area_by_entity: Optional[dict[str, str]] = None
+) -> dict[str, Any]:
+    """Turn activity seconds into the rounded hours the services return."""
+    area_by_entity = area_by_entity or {}
+    per_entity_hours: dict[str, dict[str, float]] = {}
+    per_area_seconds: dict[str, dict[str, float]] = {}
+    for entity_id, seconds in activity["per_entity"].items():
+        metric = _metric_for(entity_id)
+        if metric is None or not seconds:
+            continue
+        per_entity_hours[entity_id] = {
+            "light_on_hours": 0.0,
+            "appliance_running_hours": 0.0,
+            metric: _hours(seconds),
+        }
+        area_id = area_by_entity.get(entity_id)
+        if area_id:
+            area = per_area_seconds.setdefault(
+                area_id, {"light_on_hours": 0.0, "appliance_running_hours": 0.0}
+            )
+            area[metric] += seconds
+
+    return {
+        "metrics": {
+            "lights_on_hours": _hours(activity["lights"]),
+            "appliances_running_hours": _hours(activity["appliances"]),
+            "someone_home_hours": _hours(activity["someone_home"]),
+            "no_one_home_hours": _hours(activity["no_one_home"]),
+        },
+        "per_entity_hours": per_entity_hours,
+        "per_area_hours": {
+            area_id: {metric: _hours(seconds) for metric, seconds in metrics.items()}
+            for area_id, metrics in per_area_seconds.items()
+        },
+        "per_hour": [
+            {
+                "start": dt_util.utc_from_timestamp(hour_start).isoformat(),
+                "lights_on_hours": _hours(light_seconds),
+                "appliances_running_hours": _hours(appliance_seconds),
+                "someone_home_hours": _hours(home_seconds),
+            }
+            for hour_start, light_seconds, appliance_seconds, home_seconds in activity[
+                "per_hour"
+            ]
+        ],
+        "events_analyzed": activity["records"],
+    }
+
+
+def summarize_activity(
+    history_by_entity: dict[str, StateHistory],
+    period_start: datetime,
+    period_end: datetime,
+    area_by_entity: Optional[dict[str, str]] = None,
+) -> dict[str, Any]:
+    """Compute rounded light, appliance and presence hours for a period."""
+    return format_activity(
+        activity_seconds(history_by_entity, period_start, period_end), area_by_entity
+    )
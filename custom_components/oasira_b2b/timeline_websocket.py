@@ -0,0 +1,186 @@
+"""WebSocket API for querying and following the activity timeline."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, List, Optional
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN
+from .timeline_event import (
+    SIGNAL_TIMELINE_UPDATED,
+    TIMELINE_CHANGE_ADDED,
+    TIMELINE_CHANGE_REMOVED,
+    TimelineEvent,
+    get_timeline_manager,
+)
+from .timeline_service import _parse_service_datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 500
+
+_FILTER_SCHEMA = {
+    vol.Optional("camera_entity_id"): str,
+    vol.Optional("area_id"): str,
+    vol.Optional("event_types"): [str],
+}
+
+
+def _event_payload(event: TimelineEvent) -> dict[str, Any]:
+    return {
+        **event.to_dict(),
+        "is_reviewed": event.is_reviewed,
+        "is_favorite": event.is_favorite,
+    }
+
+
+def _matches(event: TimelineEvent, msg: dict[str, Any]) -> bool:
+    """Return True if event passes the filters of a subscribe message."""
+    if "camera_entity_id" in msg and event.camera_entity_id != msg["camera_entity_id"]:
+        return False
+    if "area_id" in msg and event.area_id != msg["area_id"]:
+        return False
+    event_types = msg.get("event_types")
+    return not event_types or event.event_type in event_types
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/timeline/list",
+        **_FILTER_SCHEMA,
+        vol.Optional("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Optional("limit", default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PAGE_SIZE)
+        ),
+        vol.Optional("cursor"): str,
+    }
+)
+@websocket_api.async_response
+async def ws_list_timeline(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return one page of timeline events, newest first."""
+    try:
+        start_date = _parse_service_datetime(msg.get("start_time"))
+        end_date = _parse_service_datetime(msg.get("end_time"))
+    except vol.Invalid as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+
+    manager = await get_timeline_manager(hass)
+    try:
+        events, next_cursor = await manager.async_get_timeline_page(
+            camera_entity_id=msg.get("camera_entity_id"),
+            area_id=msg.get("area_id"),
+            start_date=start_date,
+            end_date=end_date,
+            event_types=msg.get("event_types"),
+            limit=msg["limit"],
+            cursor=msg.get("cursor"),
+        )
+    except ValueError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(err))
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "events": [_event_payload(event) for event in events],
+            "next_cursor": next_cursor,
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/timeline/subscribe",
+        **_FILTER_SCHEMA,
+        vol.Optional("limit", default=50): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=MAX_PAGE_SIZE)
+        ),
+    }
+)
+@websocket_api.async_response
+async def ws_subscribe_timeline(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Send the latest events, then push changes as they happen.
+
+    The first event message carries up to limit recent events and the cursor
+    to page further back with timeline/list. Each later message carries one
+    change: added or updated events in full, removed events by id. Changes
+    made while the first page loads are held back and sent after it,
+    without the events the page already holds.
+    """
+    manager = await get_timeline_manager(hass)
+    held: Optional[list[tuple[str, List[TimelineEvent]]]] = (
+        [] if msg["limit"] else None
+    )
+
+    def _send_change(
+        change: str, events: List[TimelineEvent], sent_ids: frozenset[str]
+    ) -> None:
+        matching = [event for event in events if _matches(event, msg)]
+        if change == TIMELINE_CHANGE_ADDED:
+            matching = [event for event in matching if event.event_id not in sent_ids]
+        if not matching:
+            return
+        if change == TIMELINE_CHANGE_REMOVED:
+            delta: dict[str, Any] = {
+                change: [event.event_id for event in matching]
+            }
+        else:
+            delta = {change: [_event_payload(event) for event in matching]}
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    @callback
+    def _forward(change: str, events: List[TimelineEvent]) -> None:
+        if held is not None:
+            held.append((change, events))
+            return
+        _send_change(change, events, frozenset())
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_TIMELINE_UPDATED, _forward
+    )
+    connection.send_result(msg["id"])
+
+    if held is None:
+        return
+
+    sent_ids: frozenset[str] = frozenset()
+    try:
+        events, next_cursor = await manager.async_get_timeline_page(
+            camera_entity_id=msg.get("camera_entity_id"),
+            area_id=msg.get("area_id"),
+            event_types=msg.get("event_types"),
+            limit=msg["limit"],
+        )
+        sent_ids = frozenset(event.event_id for event in events)
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "events": [_event_payload(event) for event in events],
+                    "next_cursor": next_cursor,
+                },
+            )
+        )
+    finally:
+        changes, held = held, None
+        for change, events in changes:
+            _send_change(change, events, sent_ids)
+
+
+@callback
+def async_register_timeline_websocket(hass: HomeAssistant) -> None:
+    """Register the timeline WebSocket commands."""
+    websocket_api.async_register_command(hass, ws_list_timeline)
+    websocket_api.async_register_command(hass, ws_subscribe_timeline)
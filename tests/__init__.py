@@ -0,0 +1 @@
+"""Tests for the Oasira B2B integration."""
@@ -0,0 +1,167 @@
+"""Tests for the push notification scheduler."""
+
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.oasira_b2b import notification_scheduler
+from custom_components.oasira_b2b.notification_scheduler import (
+    PRIORITY_ALARM,
+    PRIORITY_INFO,
+    PRIORITY_MEDICAL,
+    PRIORITY_MOTION,
+    NotificationScheduler,
+    resolve_priority,
+)
+
+RECIPIENT = "a@example.com"
+MOTION = {"priority": "motion", "image": "/media/snapshots/front_door.jpg"}
+
+
+class _Clock:
+    """Monotonic clock the tests advance by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Replace the scheduler's monotonic clock."""
+    fake = _Clock()
+    with patch.object(
+        notification_scheduler, "time", SimpleNamespace(monotonic=fake)
+    ):
+        yield fake
+
+
+@pytest.fixture
+def flushes():
+    """Record digest flushes instead of scheduling them on the event loop."""
+    scheduled: list[tuple[float, Any]] = []
+
+    def _call_later(hass: Any, delay: float, action: Any) -> MagicMock:
+        scheduled.append((delay, action))
+        return MagicMock()
+
+    with patch.object(notification_scheduler, "async_call_later", _call_later):
+        yield scheduled
+
+
+@pytest.fixture
+def sent():
+    """Collect (title, message, data) of every push sent."""
+    return []
+
+
+@pytest.fixture
+def sender(sent):
+    """Return a sender appending to sent."""
+
+    async def _send(title: str, message: str, data: dict[str, Any]) -> None:
+        sent.append((title, message, data))
+
+    return _send
+
+
+def test_resolve_priority() -> None:
+    """Priorities are read by name or number, defaulting to alarm."""
+    assert resolve_priority(None) == PRIORITY_ALARM
+    assert resolve_priority({}) == PRIORITY_ALARM
+    assert resolve_priority({"priority": "high"}) == PRIORITY_ALARM
+    assert resolve_priority({"priority": "Medical"}) == PRIORITY_MEDICAL
+    assert resolve_priority(MOTION) == PRIORITY_MOTION
+    assert resolve_priority({"priority": "low"}) == PRIORITY_INFO
+    assert resolve_priority({"priority": PRIORITY_MOTION}) == PRIORITY_MOTION
+    assert resolve_priority({"priority": 9}) == PRIORITY_ALARM
+    assert resolve_priority({"priority": "bogus"}, PRIORITY_INFO) == PRIORITY_INFO
+
+
+async def test_unprioritized_push_not_deferred_at_rate_limit(
+    clock, flushes, sent, sender
+) -> None:
+    """A push without a priority is sent at once even past the rate limit."""
+    info = {"priority": "info"}
+    scheduler = NotificationScheduler(MagicMock(), rate_limit=1)
+    await scheduler.async_submit(RECIPIENT, sender, "Info", "one", info)
+    await scheduler.async_submit(RECIPIENT, sender, "Info", "two", info)
+    assert [message for _, message, _ in sent] == ["one"]
+
+    await scheduler.async_submit(RECIPIENT, sender, "Alarm", "Door opened", None)
+    await scheduler.async_submit(RECIPIENT, sender, "Alarm", "Door opened", {})
+    assert [message for _, message, _ in sent] == ["one", "Door opened", "Door opened"]
+    assert scheduler.suppressed == 0
+
+
+async def test_duplicates_dropped_within_dedupe_window(
+    clock, flushes, sent, sender
+) -> None:
+    """Repeats are dropped inside the dedupe window, except for alarms."""
+    scheduler = NotificationScheduler(MagicMock(), dedupe_window=30)
+    assert await scheduler.async_submit(RECIPIENT, sender, "Motion", "Yard", MOTION)
+    clock.now += 29
+    assert not await scheduler.async_submit(
+        RECIPIENT, sender, "Motion", "Yard", MOTION
+    )
+    assert scheduler.suppressed == 1
+
+    clock.now += 30
+    assert await scheduler.async_submit(RECIPIENT, sender, "Motion", "Yard", MOTION)
+
+    await scheduler.async_submit(RECIPIENT, sender, "Alarm", "Smoke", None)
+    await scheduler.async_submit(RECIPIENT, sender, "Alarm", "Smoke", None)
+    assert len(sent) == 4
+    assert scheduler.suppressed == 1
+
+
+async def test_rate_window_defers_until_period_ends(
+    clock, flushes, sent, sender
+) -> None:
+    """Pushes past the rate limit wait until the rate period has passed."""
+    scheduler = NotificationScheduler(
+        MagicMock(), digest_window=15, rate_limit=2, rate_period=60
+    )
+    for room in ("Hall", "Yard", "Garage"):
+        await scheduler.async_submit(RECIPIENT, sender, "Motion", room, MOTION)
+        clock.now += 1
+    assert [message for _, message, _ in sent] == ["Hall", "Yard"]
+    assert len(flushes) == 1
+    delay, flush = flushes[0]
+    assert delay == pytest.approx(58)
+
+    clock.now += delay
+    await flush(None)
+    assert [message for _, message, _ in sent] == ["Hall", "Yard", "Garage"]
+    assert scheduler.digested == 0
+
+
+async def test_motion_burst_coalesced(clock, flushes, sent, sender) -> None:
+    """A burst of motion pushes is delivered as one digest."""
+    scheduler = NotificationScheduler(
+        MagicMock(), digest_window=15, rate_limit=1, rate_period=60
+    )
+    cameras = ("Front door", "Driveway", "Porch", "Garage", "Yard")
+    for camera in cameras:
+        await scheduler.async_submit(
+            RECIPIENT, sender, "Motion detected", f"Motion at {camera}", MOTION
+        )
+    assert len(sent) == 1
+    assert len(flushes) == 1
+
+    delay, flush = flushes[0]
+    clock.now += delay
+    await flush(None)
+    assert len(sent) == 2
+    title, message, data = sent[1]
+    assert title == "4 new notifications"
+    assert message.splitlines() == [
+        f"Motion detected: Motion at {camera}" for camera in cameras[1:]
+    ]
+    assert data["digest_count"] == 4
+    assert data["image"] == MOTION["image"]
+    assert scheduler.digested == 4